@@ -2,7 +2,7 @@
 
 
 import argparse; # Script arguments
-import ast; # Interpret structure strings literally.
+import ast; # Cached tuples.
 import bokeh.io; # Interactive graphs in Jupyter Notebook.
 import bokeh.layouts; # Output HTML column layout.
 import bokeh.models; # Graph y-range, Hover Tool.
@@ -10,11 +10,21 @@ import bokeh.palettes; # Graph color palettes.
 import bokeh.plotting; # Graph plot handling.
 import collections; # Ordered dictionary.
 import datetime; # Datetime handling.
+import dateutil.tz; # Time zones.
+import functools; # Partial functions.
+import glob; # Cached results files.
+import hashlib; # Cached results keys.
 import io; # File writing.
+import json; # Quantile sketch files.
 import math; # Math equations.
 import modules.shared as shared; # Custom, shared functionality.
+import multiprocessing; # Process pool.
+import numpy; # Array handling.
 import os; # File, directory handling.
 import pandas; # DataFrame handling.
+import random; # Quantile sketch compactions.
+import shutil; # Cached results eviction.
+import signal; # On-demand stream reports.
 import sys; # Script name, termination.
 import time; # Time processing.
 import unicodedata; # Unicode strings.
@@ -32,6 +42,15 @@ DATETIME_DELTA_FEATURE_CODES_DICT = collections.OrderedDict([('total_num_years_a
                                                              ('total_num_minutes_active', 'M'),
                                                              ('total_num_seconds_active', 'S')]);
 
+# Dict of NumPy datetime units (to which local datetimes get floored) for datetime delta codes.
+DATETIME_DELTA_CODE_UNITS_DICT = {'Y':'Y', 'm':'M', 'd':'D', 'H':'h', 'M':'m', 'S':'s'};
+
+# Dict of strftime formats (to which local datetimes get truncated within data stores) for datetime delta codes.
+DATETIME_DELTA_CODE_FORMATS_DICT = {'Y':'%Y', 'm':'%Y-%m', 'd':'%Y-%m-%d', 'H':'%Y-%m-%d %H', 'M':'%Y-%m-%d %H:%M', 'S':'%Y-%m-%d %H:%M:%S'};
+
+# Datetime delta codes that activity cube can serve (those no finer than the UTC hours it is bucketed by).
+ACTIVITY_CUBE_DATETIME_DELTA_CODES = ['Y', 'm', 'd', 'H'];
+
 # Dict of project attribute titles.
 PROJECT_ATTRIBUTE_TITLES_DICT = collections.OrderedDict([('num_commits' , 'Number of Commits'),
                                                          ('num_lines_changed', 'Number of Lines Changed'),
@@ -52,17 +71,61 @@ FEATURE_TITLES_DICT = collections.OrderedDict([('total_num_commits'       , 'Tot
                                                ('total_num_minutes_active', 'Total Number of Minutes Active'),
                                                ('total_num_seconds_active', 'Total Number of Seconds Active')]);
 
+# Data store attributes needed regardless of requested outputs (for project/commit identities, filters, and time spans).
+BASE_DATA_STORE_ATTRIBUTES = ['repo_remote_hostname', 'repo_owner', 'repo_name',
+                              'path_in_repo',
+                              'labels',
+                              'commit_hash',
+                              'author_unix_timestamp', 'committer_unix_timestamp'];
+
+# Data store attributes needed for plots (hover text included).
+PLOT_DATA_STORE_ATTRIBUTES = ['subject'] + [attribute for attribute in PROJECT_ATTRIBUTE_TITLES_DICT if (attribute != 'num_commits')];
+
 args = argparse.ArgumentParser(); # Script arguments object.
 
 data_store_source_dict = dict(); # Data store source dict.
 
+data_store = None; # Data store object.
+
+filters_dict = dict(); # Commit record filters (pushed down into data store query).
+
+timezone = None; # Time zone in which local datetimes (time-based features) are considered.
+
 db_info_str = ''; # String of info regarding database name and collection name.
 
+commit_records_plot_df = None; # DataFrame of commit records for plots (global, so that pool workers share it rather than get sent it).
+
+project_feature_vectors_df = None; # DataFrame of project feature vectors (global, so that pool workers share it rather than get sent it).
+
+activity_cube_df = None; # DataFrame of activity cube rows (if answering from activity cube).
+
+is_stream_report_requested = False; # Flag to specify whether report on commit records streamed so far was requested (via signal).
+
 width_class_dict = dict(); # Dict of feature observations classification width configurations.
 num_classes_dict = dict(); # Dict of feature observations classification count configurations.
 
 PLOT_TEXT_FONT_SIZE = '12pt'; # Font size for text in output graphs.
 
+CACHE_DIRNAME = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'), shared.TOOLSET_NAME+'-'+script_name); # Directory of cached results (user-owned, rather than in working directory).
+
+CACHED_RESULTS_NAMES = ['commit_records_plot_df', 'project_feature_vectors_df']; # Names of cached results (DataFrames, each cached in a columnar file of its own, if there is one).
+
+DEFAULT_CACHE_SIZE = 1024; # Default bound on size of cached results (in MB).
+
+cache_dirname = ''; # Directory of cached results for data store contents and script arguments.
+
+cached_results_dict = None; # Cached results (if any were found).
+
+SKETCH_CAPACITY_FACTOR = 4.0; # Capacity of quantile sketch's top compactor per reciprocal of rank error bound (so that error bound holds with high probability).
+
+SKETCH_CAPACITY_RATIO = 2.0 / 3.0; # Ratio by which quantile sketch compactor capacities shrink per level down.
+
+SKETCH_MIN_CAPACITY = 2; # Smallest capacity of quantile sketch compactors.
+
+input_feature_sketches_dicts = list(); # Dicts of feature quantile sketches (keyed by feature) read from sketch input files.
+
+feature_sketches_dict = None; # Dict of feature quantile sketches (global, so that pool workers share it rather than get sent it), if frequency distributions get approximated.
+
 
 # Initialize script arguments object.
 def init_args(argparser):
@@ -74,10 +137,25 @@ def init_args(argparser):
     argparser.add_argument('--width-class', help="list of key-value pairs of configurations for feature observations class width", type=str);
     argparser.add_argument('--num-classes', help="list of key-value pairs of configurations for feature observations classes count", type=str);
     argparser.add_argument('--labels', help="list of labels to consider when processing commit records", type=str);
+    argparser.add_argument('--all-labels', help="consider only commit records having all (rather than any) of the labels", action='store_true');
     argparser.add_argument('--since', help="consider only commits applied after provided timestamp", type=str);
     argparser.add_argument('--until', help="consider only commits applied before provided timestamp", type=str);
+    argparser.add_argument('--timezone', help="time zone (e.g., 'America/New_York') in which time-based features are considered (defaults to local time zone)", type=str);
     argparser.add_argument('--spreadsheet', help="output (spreadsheet) file for tabulated quantitative analytics", type=str);
     argparser.add_argument('--html', help="output (HTML) file for data visualizations", type=str);
+    argparser.add_argument('--out-of-core', help="process commit records in chunks, keeping only per-project accumulators in memory (no per-commit plots)", action='store_true');
+    argparser.add_argument('--pushdown', help="compute project feature vectors within data store (via SQL query or MongoDB aggregation pipeline), loading only one row per project (no per-commit plots)", action='store_true');
+    argparser.add_argument('--cube', help="answer project features (no finer than hours) and cumulative growth (by the hour) from activity cube maintained alongside commit records, if it can (no commit-patterns plot)", action='store_true');
+    argparser.add_argument('--stream', help="consume commit records from newline-delimited JSON stream (scraper stream file, tailed until scraper ends it, named pipe, or '-' for standard input) instead of data store, keeping only per-project accumulators in memory (send SIGUSR1 for report on commit records streamed so far; no per-commit plots)", type=str);
+    argparser.add_argument('--chunk-size', help="number of commit records per chunk in out-of-core mode", type=int);
+    argparser.add_argument('--compact', help="hold commit records in compact in-memory representation", action='store_true');
+    argparser.add_argument('--snapshot', help="load commit records from columnar snapshot of data store (taken anew whenever data store changes)", action='store_true');
+    argparser.add_argument('--cache', help="reuse (or else cache) project feature vectors and per-commit plot data of previous runs having same data store contents and arguments", action='store_true');
+    argparser.add_argument('--cache-size', help="bound on size (in MB) of cached results, beyond which least recently used ones get evicted", type=int);
+    argparser.add_argument('--sketch-error', help="approximate feature frequency distributions (CDF, histogram, spreadsheet) via mergeable quantile sketches having provided rank error bound (as fraction of projects, e.g., 0.01)", type=float);
+    argparser.add_argument('--sketch-output', help="output (JSON) file for feature quantile sketches, for merging with those of other shards", type=str);
+    argparser.add_argument('--sketch-inputs', help="list of (JSON) files of feature quantile sketches (e.g., of other shards) to merge in (data store source becomes optional)", type=str);
+    argparser.add_argument('-j', '--jobs', help="number of worker processes for per-feature analytics and per-attribute growth data", type=int);
     
     return argparser.parse_args();
 
@@ -115,24 +193,167 @@ def get_project_features(features_str):
     return project_features;
 
 
+# Get list of data store attributes needed for processing features and producing outputs (so that only those get loaded).
+def get_needed_data_store_attributes(features):
+
+    attributes = list(BASE_DATA_STORE_ATTRIBUTES) if (args.out_of_core or args.pushdown or args.cube or args.stream) else BASE_DATA_STORE_ATTRIBUTES + PLOT_DATA_STORE_ATTRIBUTES; # (Per-commit plots get produced unless out-of-core, pushed down, answered from activity cube, or streamed; copy, so that module-level list never grows.)
+    for feature in features:
+        if (feature.startswith('total_num_lines_')): # Feature sums data store attribute...
+            attributes.append(feature[len('total_'):]);
+
+    return shared.get_data_store_attributes(attributes);
+
+
+# Get data store DataFrame from columnar snapshot of data store (taking snapshot first, if there is no up-to-date one).
+def get_snapshot_data_store_df(attributes):
+
+    snapshot_filename = data_store.get_snapshot_filename();
+    fingerprint = data_store.get_fingerprint(); # (Taken before loading, so that changes made meanwhile stale the snapshot.)
+
+    df = shared.read_data_store_df_snapshot(snapshot_filename, fingerprint, attributes);
+    if (df is not None):
+        return df;
+
+    snapshot_attributes = shared.get_data_store_attributes(BASE_DATA_STORE_ATTRIBUTES + PLOT_DATA_STORE_ATTRIBUTES); # (Whatever any analysis may need.)
+    df = data_store.read_df(attributes=snapshot_attributes); # (Unfiltered, so that snapshot serves any filters.)
+    if (not shared.is_data_store_df(df, snapshot_attributes)):
+        return df;
+
+    df = eliminate_data_store_df_duplicate_rows(df);
+    try:
+        shared.write_data_store_df_snapshot(df, snapshot_filename, fingerprint);
+    except (IOError, OSError):
+        print(shared.get_warning_str("Could not write snapshot \'" + snapshot_filename + "\'", action='proceeding without it'));
+
+    return df[attributes];
+
+
 # Eliminate data store DataFrame duplicate rows.
+# Rows are compared by compact key: commit record identity columns, plus hash of the remaining columns.
 def eliminate_data_store_df_duplicate_rows(data_store_df):
 
-    df = data_store_df.copy(); # Use copy to avoid modifying original.
-    df['labels'] = df['labels'].astype('str'); # Interpret cell values as strings (input DataFrame cell values will be tuples). (Required in order for drop_duplicates() to work correctly.)
-    df = df.drop_duplicates(); # Eliminate duplicate DataFrame rows.
+    key_attributes = [attribute for attribute in shared.COMMIT_RECORD_KEY_ATTRIBUTES if (attribute in data_store_df.columns)];
+    other_attributes = [attribute for attribute in data_store_df.columns if (attribute not in key_attributes)];
+
+    keys_df = data_store_df[key_attributes].assign(row_hash=shared.get_data_store_df_row_hashes(data_store_df, other_attributes));
+    is_duplicate = keys_df.duplicated().values;
+    if (not is_duplicate.any()): # (Original need not be copied.)
+        return data_store_df;
+
+    df = data_store_df[~is_duplicate]; # Eliminate duplicate DataFrame rows.
     df = df.reset_index(drop=True); # Reset DataFrame row indices.
-    df['labels'] = df['labels'].apply(lambda cell_val: ast.literal_eval(cell_val)); # Convert cell values (strings) back to tuples.
 
     return df;
 
 
+# Get directory of cached results, keyed by data store contents (fingerprint) along with arguments that results depend on.
+# (Classification configurations are left out, as frequency distributions get computed anew from cached results.)
+def get_cache_dirname():
+
+    per_commit_plots = not (args.out_of_core or args.pushdown); # (Whether or not per-commit plot data gets cached.)
+    key_str = repr([data_store.get_fingerprint(),
+                    sorted(filters_dict.items()), # (User-given since/until, labels.)
+                    args.paths_as_projects,
+                    args.features,
+                    args.timezone,
+                    per_commit_plots,
+                    args.cube]); # (Whether or not plot data is by the hour.)
+
+    return os.path.join(CACHE_DIRNAME, hashlib.sha1(key_str).hexdigest());
+
+
+# Write DataFrame to columnar (Arrow) cache file, with tuple cells written as strings, and column dtypes noted so that reading restores them.
+def write_cached_df(df, filename):
+
+    dtypes_dict = dict([(column, str(dtype)) for (column, dtype) in df.dtypes.iteritems()]); # Column dtypes (keyed by column).
+    tuple_columns = [column for column in df.columns if ((dtypes_dict[column] == 'object') and df[column].map(lambda cell_val: isinstance(cell_val, tuple)).any())];
+    df = df.assign(**dict([(column, df[column].map(str)) for column in tuple_columns])); # (Arrow has no tuples.)
+
+    table = shared.pyarrow.Table.from_pandas(df, preserve_index=True);
+    metadata = dict(table.schema.metadata);
+    metadata['dtypes'] = json.dumps(dtypes_dict);
+    metadata['tuple_columns'] = json.dumps(tuple_columns);
+    table = table.replace_schema_metadata(metadata);
+
+    writer = shared.pyarrow.RecordBatchFileWriter(filename, table.schema);
+    writer.write_table(table);
+    writer.close();
+
+    return;
+
+
+# Get DataFrame from columnar (Arrow) cache file, with tuple cells and column dtypes restored.
+def read_cached_df(filename):
+
+    reader = shared.pyarrow.ipc.open_file(shared.pyarrow.memory_map(filename, 'r'));
+    metadata = reader.schema.metadata;
+    df = reader.read_all().to_pandas();
+    for column in json.loads(metadata['tuple_columns']):
+        df[column] = df[column].map(ast.literal_eval); # (Literals only, never code.)
+
+    return df.astype(json.loads(metadata['dtypes']));
+
+
+# Get dict of cached results from directory (None, if there are none, or they cannot be read), marking them as recently used.
+def read_cached_results_dict(dirname):
+
+    if (not os.path.isdir(dirname)): # (Nothing cached.)
+        return None;
+
+    try:
+        results_dict = dict();
+        for name in CACHED_RESULTS_NAMES:
+            filename = os.path.join(dirname, name+'.arrow');
+            results_dict[name] = read_cached_df(filename) if os.path.isfile(filename) else None; # (Results not computed have no file.)
+        os.utime(dirname, None); # (For least-recently-used eviction.)
+    except (EnvironmentError, ValueError, SyntaxError, KeyError, shared.pyarrow.ArrowException) as e:
+        print(shared.get_warning_str("Could not read cached results \'" + dirname + "\' (" + shared.get_error_str(e) + ")", action='ignoring them'));
+        return None;
+
+    return results_dict;
+
+
+# Write dict of results to cache directory, then evict least recently used cached results until they fit within cache size bound.
+def write_cached_results_dict(results_dict, dirname):
+
+    tmp_dirname = dirname+'.tmp';
+    try:
+        if (not os.path.isdir(CACHE_DIRNAME)):
+            os.makedirs(CACHE_DIRNAME, 0o700); # (Accessible to user only.)
+        if (os.path.isdir(tmp_dirname)): # (Left over by interrupted run.)
+            shutil.rmtree(tmp_dirname);
+        os.mkdir(tmp_dirname);
+        for name in CACHED_RESULTS_NAMES:
+            if (results_dict[name] is not None):
+                write_cached_df(results_dict[name], os.path.join(tmp_dirname, name+'.arrow'));
+        os.rename(tmp_dirname, dirname); # (So that no partial cached results are ever read.)
+    except (EnvironmentError, ValueError, shared.pyarrow.ArrowException) as e:
+        print(shared.get_warning_str("Could not write cached results \'" + dirname + "\' (" + shared.get_error_str(e) + ")", action='proceeding without them'));
+        return;
+
+    cache_entries = [(os.path.getmtime(entry_dirname), sum([os.path.getsize(os.path.join(entry_dirname, filename)) for filename in os.listdir(entry_dirname)]), entry_dirname) for entry_dirname in glob.glob(os.path.join(CACHE_DIRNAME, '*')) if (not entry_dirname.endswith('.tmp'))]; # (Size of each cached results directory.)
+    cache_size = sum([size for (_, size, _) in cache_entries]);
+    for (_, size, entry_dirname) in sorted(cache_entries): # (Least recently used first.)
+        if (cache_size <= args.cache_size * 1024 * 1024):
+            break;
+        shutil.rmtree(entry_dirname);
+        cache_size = cache_size - size;
+
+    return;
+
+
 # Check script arguments.
 def check_args(args):
 
     global data_store_source_dict;
+    global data_store;
+    global filters_dict;
+    global timezone;
     global data_store_df;
     global db_info_str;
+    global cache_dirname;
+    global cached_results_dict;
+    global activity_cube_df;
 
     # Features.
     if (args.show_features):
@@ -148,18 +369,6 @@ def check_args(args):
     if (not args.features):
         print("(Warning: No valid project features to process.)");
 
-    if (args.source):
-        data_store_source_dict = shared.parse_data_store_source(args.source);
-        (df, db_info_str) = shared.get_df_from_data_store_source(data_store_source_dict);
-        if (df.empty):
-            sys.exit('Bad data store source \'' + args.source + '\'.');
-        else:
-            data_store_df = df.copy(); # Use copy to avoid modifying original.
-            data_store_df = data_store_df[shared.data_store_attributes];
-            data_store_df = eliminate_data_store_df_duplicate_rows(data_store_df);
-    else:
-        sys.exit("Must specify a data store source.");
-    
     args.width_class = get_class_configurations_dict(args.width_class);
     
     args.num_classes = get_class_configurations_dict(args.num_classes);
@@ -175,6 +384,131 @@ def check_args(args):
     until_timestamp_str = shared.parse_timestamp_str(args.until, 'until');
     args.until = until_timestamp_str if until_timestamp_str else shared.get_utcnow_timestamp_str();
 
+    # Commit record filters, pushed down into data store query (so that only qualifying commit records get loaded).
+    # (Default time range bounds are not pushed down, as they would hardly narrow the query.)
+    filters_dict = shared.get_filters_dict(since=shared.utc_timestamp_str_to_unix_timestamp(args.since) if since_timestamp_str else None,
+                                           until=shared.utc_timestamp_str_to_unix_timestamp(args.until) if until_timestamp_str else None,
+                                           labels=args.labels,
+                                           all_labels=args.all_labels);
+
+    # Time zone.
+    if (args.timezone):
+        timezone = dateutil.tz.gettz(args.timezone);
+        if (timezone is None):
+            sys.exit("Unrecognized time zone \'" + args.timezone + "\'.");
+    else: # Host local time zone (per TZ environment variable, or system configuration).
+        timezone = dateutil.tz.gettz();
+        if (timezone is None):
+            timezone = dateutil.tz.tzlocal();
+
+    attributes = get_needed_data_store_attributes(args.features); # (Only their columns get loaded.)
+
+    if (    args.out_of_core
+            and args.snapshot   ):
+        sys.exit("Out-of-core mode cannot be combined with snapshots.");
+    if (    args.pushdown
+            and (args.out_of_core or args.snapshot)   ):
+        sys.exit("Pushdown cannot be combined with out-of-core mode or snapshots.");
+    if (    args.cube
+            and (args.out_of_core or args.pushdown or args.snapshot)   ):
+        sys.exit("Activity cube cannot be combined with out-of-core mode, pushdown, or snapshots.");
+    if (    args.snapshot
+            and (shared.pyarrow is None)   ):
+        sys.exit("Snapshots require the pyarrow module.");
+    if (    args.cache
+            and (shared.pyarrow is None)   ):
+        sys.exit("Cache requires the pyarrow module.");
+
+    # Number of worker processes.
+    if (args.jobs is None):
+        args.jobs = 1;
+    elif (args.jobs <= 0):
+        sys.exit("Number of jobs must be positive.");
+
+    # Chunk size (out-of-core mode).
+    if (args.chunk_size is None):
+        args.chunk_size = shared.DEFAULT_CHUNKSIZE;
+    elif (args.chunk_size <= 0):
+        sys.exit("Chunk size must be positive.");
+
+    # Cache size.
+    if (args.cache_size is None):
+        args.cache_size = DEFAULT_CACHE_SIZE;
+    elif (args.cache_size <= 0):
+        sys.exit("Cache size must be positive.");
+
+    # Quantile sketches (approximate frequency distributions).
+    args.sketch_inputs = shared.get_unique_items_from_str(args.sketch_inputs, ';');
+    if (args.sketch_error is None):
+        if (args.sketch_output or args.sketch_inputs):
+            sys.exit("Sketch output and inputs require sketch error.");
+    elif (not (0 < args.sketch_error < 1)):
+        sys.exit("Sketch error must be between 0 and 1.");
+    for sketch_input in args.sketch_inputs:
+        input_feature_sketches_dict = read_feature_sketches_dict(sketch_input);
+        if (input_feature_sketches_dict is None):
+            sys.exit("Bad sketch input \'" + sketch_input + "\'.");
+        missing_features = [feature for feature in args.features if (feature not in input_feature_sketches_dict)];
+        if (missing_features):
+            sys.exit("Sketch input \'" + sketch_input + "\' lacks sketches for features: " + ", ".join(missing_features) + ".");
+        input_feature_sketches_dicts.append(input_feature_sketches_dict);
+
+    if (args.stream): # Commit records get streamed in later on...
+        if (    args.source
+                or args.out_of_core or args.pushdown or args.cube or args.snapshot or args.cache   ):
+            sys.exit("Record stream cannot be combined with data store source, out-of-core mode, pushdown, activity cube, snapshots, or cache.");
+        if (    (args.stream != '-')
+                and (not os.path.exists(args.stream))   ):
+            sys.exit("No such record stream '" + args.stream + "'.");
+    elif (args.source):
+        data_store_source_dict = shared.parse_data_store_source(args.source);
+        data_store = shared.get_data_store(data_store_source_dict);
+        if (args.cube): # Activity cube (if it can answer) spares commit records from being loaded...
+            if (    (not data_store)
+                    or (not data_store.has_data_store_schema())   ):
+                sys.exit('Bad data store source \'' + args.source + '\'.');
+            db_info_str = data_store.get_db_info_str();
+            activity_cube_df = get_activity_cube_df();
+            if (activity_cube_df is None): # Commit records get loaded after all...
+                args.cube = False;
+                attributes = get_needed_data_store_attributes(args.features);
+        if (args.cache): # Results cached by previous run (if any) spare commit records from being loaded...
+            if (    (not data_store)
+                    or (not data_store.has_data_store_schema())   ):
+                sys.exit('Bad data store source \'' + args.source + '\'.');
+            db_info_str = data_store.get_db_info_str();
+            cache_dirname = get_cache_dirname();
+            cached_results_dict = read_cached_results_dict(cache_dirname);
+        if (    (cached_results_dict is not None)
+                or args.cube   ):
+            pass;
+        elif (args.out_of_core or args.pushdown): # Commit records get streamed (or aggregated within data store) later on...
+            if (    (not data_store)
+                    or (not data_store.has_data_store_schema())   ):
+                sys.exit('Bad data store source \'' + args.source + '\'.');
+            db_info_str = data_store.get_db_info_str();
+        else:
+            if (data_store):
+                db_info_str = data_store.get_db_info_str();
+                if (args.snapshot): # (Snapshot holds commit records already deduplicated.)
+                    df = get_snapshot_data_store_df(attributes);
+                else:
+                    df = data_store.read_df(filters_dict, attributes);
+            else:
+                df = pandas.DataFrame();
+            if (not shared.is_data_store_df(df, attributes)): # (Having no commit records that satisfy filters is fine.)
+                sys.exit('Bad data store source \'' + args.source + '\'.');
+            elif (args.snapshot):
+                data_store_df = df;
+            else:
+                data_store_df = eliminate_data_store_df_duplicate_rows(df); # (Data store DataFrame has been validated as it was loaded.)
+            if (args.compact):
+                data_store_df = shared.get_compact_data_store_df(data_store_df);
+    elif (args.sketch_inputs): # Only sketches get merged...
+        pass;
+    else:
+        sys.exit("Must specify a data store source (or record stream, or sketch inputs).");
+
     file_datetimenow_str = datetime.datetime.now().strftime('%Y%m%d-%H%M%S%f')[:-3]; # For default output filenames.
 
     # Output spreadsheet.
@@ -198,6 +532,13 @@ def check_args(args):
             sys.exit("Not proceeding.");
     else: # Default output HTML.
         args.html = './'+shared.TOOLSET_NAME+'-'+script_name+'_data-visualizations_' + file_datetimenow_str + '.html';
+
+    # Output quantile sketches.
+    if (args.sketch_output):
+        if (shared.is_writable_file(args.sketch_output)):
+            args.sketch_output = os.path.abspath(args.sketch_output);
+        else:
+            sys.exit("Not proceeding.");
     
     return args;
 
@@ -205,63 +546,115 @@ def check_args(args):
 # Write script argument configurations to stdout.
 def echo_args(args):
     
-    data_store_uri = data_store_source_dict['uri'];
     str_labels = ", ".join(["\'" + l + "\'" for l in args.labels]) if (args.labels) else "\'\'";
     
-    print("Data store: \'" + data_store_uri + "\' ("+db_info_str+")");
-    print("Labels: " + str_labels);
+    if (args.stream):
+        print("Record stream: \'" + args.stream + "\' (chunk size: " + str(args.chunk_size) + "; report on demand: kill -USR1 " + str(os.getpid()) + ")");
+    elif (args.source):
+        print("Data store: \'" + data_store_source_dict['uri'] + "\' ("+db_info_str+")");
+    print("Labels: " + str_labels + (" (all required)" if args.all_labels else ""));
     print("Since: " + args.since);
     print("Until: " + args.until);
+    print("Time zone: " + (args.timezone if args.timezone else "local"));
+    if (args.out_of_core):
+        print("Out-of-core: True (chunk size: " + str(args.chunk_size) + ")");
+    if (args.pushdown):
+        print("Pushdown: True");
+    if (args.cube):
+        print("Activity cube: True (" + str(activity_cube_df.shape[0]) + " rows)");
+    if (args.snapshot):
+        print("Snapshot: \'" + data_store.get_snapshot_filename() + "\'");
+    if (args.compact):
+        print("Compact: True");
+    if (args.cache):
+        print("Cache: \'" + cache_dirname + "\' (" + ("found" if (cached_results_dict is not None) else "not found") + "; size bound: " + str(args.cache_size) + " MB)");
+    if (args.sketch_error is not None):
+        print("Sketch error: " + str(args.sketch_error));
+    for sketch_input in args.sketch_inputs:
+        print("Sketch input: \'" + sketch_input + "\'");
+    if (args.sketch_output):
+        print("Sketch output: \'" + args.sketch_output + "\'");
+    if (args.jobs > 1):
+        print("Jobs: " + str(args.jobs));
+
+
+# Get mask of commit records whose author and committer timestamps both fall within time range.
+def get_time_range_mask(commit_records_df):
+
+    since = shared.utc_timestamp_str_to_unix_timestamp(args.since);
+    until = shared.utc_timestamp_str_to_unix_timestamp(args.until);
+
+    author_unix_timestamps = commit_records_df['author_unix_timestamp'].values;
+    committer_unix_timestamps = commit_records_df['committer_unix_timestamp'].values;
+
+    return (   (author_unix_timestamps >= since)
+               & (author_unix_timestamps <= until)
+               & (committer_unix_timestamps >= since)
+               & (committer_unix_timestamps <= until)   );
 
 
 # Identify and prune unneeded commit records from DataFrame.
 def filter_commit_records(commit_records_df):
 
-    since = shared.utc_timestamp_str_to_unix_timestamp(args.since);
-    until = shared.utc_timestamp_str_to_unix_timestamp(args.until);
+    keep_mask = get_time_range_mask(commit_records_df);
 
-    drop_indices = list(); # Keep track of which DataFrame rows (by indices) are not necessary in df.
-    init_num_records = commit_records_df.shape[0];
-    for i in range(0, init_num_records): # For each project commit record (row) in data store DataFrame...
-        
-        commit_record = commit_records_df.iloc[i];
-        
-        author_unix_timestamp = float(commit_record['author_unix_timestamp']);
-        committer_unix_timestamp = float(commit_record['committer_unix_timestamp']);
-        if (    author_unix_timestamp < since 
-                or author_unix_timestamp > until
-                or committer_unix_timestamp < since
-                or committer_unix_timestamp > until   ):
-            drop_indices.append(i);
-        elif (args.labels):
-            commit_record_labels_tuple = commit_record['labels'];
-            include_commit_record = False;
-            for label in args.labels: # For EACH user-supplied label...
-                if (label in commit_record_labels_tuple): # If commit record has label... 
-                    include_commit_record = True; # Indicate to include this commit record in resulting DataFrame.
-            if (include_commit_record):
-                pass; # Fine, commit record has at least one desired label.
-            else:
-                drop_indices.append(i);
-    
-    commit_records_df = commit_records_df.drop(drop_indices); # Drop DataFrame rows (given indices specifed).
+    if (args.labels): # Keep only commit records having at least one (or all) of user-supplied labels.
+        keep_mask = keep_mask & shared.LabelIndex(commit_records_df['labels']).get_mask(args.labels, args.all_labels);
+
+    commit_records_df = commit_records_df[keep_mask];
     commit_records_df = commit_records_df.reset_index(drop=True); # Reset DataFrame row indices.
 
     return commit_records_df;
 
 
-# Get DataFrame of project IDs based on some combination of commit record columns.
-def get_project_ids_df(commit_records_df):
+# Get list of commit record columns identifying projects.
+def get_project_id_attributes():
 
-    if (args.paths_as_projects):
-        project_ids_df = commit_records_df[['repo_remote_hostname', 'repo_owner', 'repo_name', 'path_in_repo']];
+    if (args.paths_as_projects): # Treat each repo path as an individual project...
+        return ['repo_remote_hostname', 'repo_owner', 'repo_name', 'path_in_repo'];
     else:
-        project_ids_df = commit_records_df[['repo_remote_hostname', 'repo_owner', 'repo_name']];
-    
-    project_ids_df = project_ids_df.drop_duplicates(); # Eliminate duplicate DataFrame rows.
-    project_ids_df = project_ids_df.reset_index(drop=True); # Reset DataFrame row indices.
-    
-    return project_ids_df;
+        return ['repo_remote_hostname', 'repo_owner', 'repo_name'];
+
+
+# Get DataFrame of commit records for plots (sorted by committer datetime), in single grouped pass over commit records.
+# Added columns: committer datetimes (and strings, for hover tooltips), project indices (in order of appearance), and cumulative growth series of each project attribute.
+def get_commit_records_plot_df(commit_records_df):
+
+    project_attributes = PROJECT_ATTRIBUTE_TITLES_DICT.keys();
+
+    committer_datetimes = get_local_datetimes(commit_records_df['committer_unix_timestamp'].values);
+    timezone_name = args.timezone if args.timezone else time.tzname[1];
+    committer_local_timestamp_strs = numpy.asarray(pandas.DatetimeIndex(committer_datetimes).strftime('%Y-%m-%d %H:%M:%S ' + timezone_name));
+
+    df = commit_records_df.assign(committer_datetime=committer_datetimes,
+                                  committer_local_timestamp_str=committer_local_timestamp_strs,
+                                  project_index=commit_records_df.groupby(get_project_id_attributes(), sort=False, observed=True).ngroup().values, # (Groups in order of appearance.)
+                                  record_index=numpy.arange(commit_records_df.shape[0]),
+                                  num_commits=commit_records_df['num_commits'].values if ('num_commits' in commit_records_df.columns) else 1); # (Each commit record counts once towards number of commits, unless it stands for several.)
+    df = df.sort_values('committer_unix_timestamp', kind='mergesort'); # (Smallest values at top; ties keep order of appearance.)
+
+    cumulative_df = df.groupby('project_index', sort=False)[project_attributes].cumsum();
+    for attribute in project_attributes:
+        df['cumulative_'+attribute] = cumulative_df[attribute].values;
+
+    return df;
+
+
+# Get DataFrame of commit records for plots from activity cube rows: one per project path and hour having commits (at start of hour), standing for all of them.
+def get_activity_cube_commit_records_df(activity_cube_df):
+
+    df = activity_cube_df[(activity_cube_df['num_commits'] > 0)];
+    df = df.assign(committer_unix_timestamp=df['unix_hour'].values * shared.SECONDS_PER_HOUR);
+    df = df.drop(columns=['unix_hour', 'num_repo_commits', 'num_authored_commits']);
+    df = df.reset_index(drop=True); # Reset DataFrame row indices.
+
+    return df;
+
+
+# Get list of commit records plot DataFrame columns that only serve to derive plot data.
+def get_commit_records_plot_df_helper_columns():
+
+    return ['project_index', 'record_index', 'num_commits'] + ['cumulative_'+attribute for attribute in PROJECT_ATTRIBUTE_TITLES_DICT];
 
 
 # Process plot for project attribute patterns.
@@ -287,30 +680,9 @@ def process_project_attributebased_plot(plot, project_attribute_records_df, xsou
 
 
 # Get plot for project commit patterns.
-def get_commit_patterns_plot(project_ids_df, commit_records_df):
+def get_commit_patterns_plot(commit_records_plot_df):
    
-    copy_commit_records_df = commit_records_df.copy(); # Use copy to avoid modifying original.
-    
-    num_projects = project_ids_df.shape[0];
-    
-    num_commit_records = copy_commit_records_df.shape[0];
-    committer_datetimes = list();
-    committer_local_timestamp_strs = list();
-    for i in range(0, num_commit_records): # Need data for committer datetimes (as timestamps) and committer datetime strings (hover tooltips)...
-
-        commit_record = commit_records_df.iloc[i];
-
-        committer_unix_timestamp = float(commit_record['committer_unix_timestamp']);
-        
-        committer_datetime = datetime.datetime.fromtimestamp(committer_unix_timestamp);
-        committer_datetimes.append(committer_datetime);
-        
-        committer_local_timestamp_str = datetime.datetime.fromtimestamp(committer_unix_timestamp).strftime('%Y-%m-%d %H:%M:%S '+time.tzname[1]);
-        committer_local_timestamp_strs.append(committer_local_timestamp_str);
-    
-    # Add new columns to DataFrame.
-    copy_commit_records_df['committer_datetime'] = committer_datetimes;
-    copy_commit_records_df['committer_local_timestamp_str'] = committer_local_timestamp_strs;
+    num_projects = commit_records_plot_df['project_index'].max() + 1;
     
     hover = bokeh.models.HoverTool(tooltips=[('repo_remote_hostname', '@repo_remote_hostname'),
                                              ('repo_owner', '@repo_owner'),
@@ -338,55 +710,43 @@ def get_commit_patterns_plot(project_ids_df, commit_records_df):
     plot.yaxis.major_label_text_font_size = '0pt';
     plot.yaxis.axis_label_text_font_size = PLOT_TEXT_FONT_SIZE;
 
-    for i in range(0, num_projects): # For each project...
+    for (project_index, project_commit_records_df) in commit_records_plot_df.groupby('project_index'): # For each project (in order of appearance)...
 
-        if (args.paths_as_projects): # Treat each repo path as an individual project...
-            project_commit_records_df = copy_commit_records_df[(copy_commit_records_df['repo_remote_hostname'] == project_ids_df.iloc[i]['repo_remote_hostname']) &
-                                                               (copy_commit_records_df['repo_owner']           == project_ids_df.iloc[i]['repo_owner']) &
-                                                               (copy_commit_records_df['repo_name']            == project_ids_df.iloc[i]['repo_name']) &
-                                                               (copy_commit_records_df['path_in_repo']         == project_ids_df.iloc[i]['path_in_repo']) ];
-        else:
-            project_commit_records_df = copy_commit_records_df[(copy_commit_records_df['repo_remote_hostname'] == project_ids_df.iloc[i]['repo_remote_hostname']) &
-                                                               (copy_commit_records_df['repo_owner']           == project_ids_df.iloc[i]['repo_owner']) &
-                                                               (copy_commit_records_df['repo_name']            == project_ids_df.iloc[i]['repo_name']) ];
-        
-        num_commits = project_commit_records_df.shape[0];
-        ycoords = [(i+1) for j in range(0, num_commits)]; # To ensure same y-coodinates for all project commit points.
-        project_commit_records_df = project_commit_records_df.assign(ycoordinates=ycoords); # Add new column for plot y-coordinates data.
+        project_commit_records_df = project_commit_records_df.drop(columns=get_commit_records_plot_df_helper_columns());
+        project_commit_records_df = project_commit_records_df.assign(ycoordinates=project_index+1); # Add new column for plot y-coordinates data (same for all project commit points).
         
         plot = process_project_attributebased_plot(plot, project_commit_records_df, 'committer_datetime', 'ycoordinates');
 
     return plot;
 
 
-# Get plot for project attribute cumulative growth.
-def get_project_attribute_cumulative_growth_plot(project_ids_df, commit_records_df, attribute):
-   
-    copy_commit_records_df = commit_records_df.copy(); # Use copy to avoid modifying original.
+# Get list of project commit records DataFrames (in order of appearance) for plot of project attribute cumulative growth.
+def get_project_attribute_cumulative_growth_dfs(attribute):
+
+    df = commit_records_plot_df; # (Shared global.)
     if (attribute != 'num_commits'):
-        copy_commit_records_df = copy_commit_records_df[(copy_commit_records_df[attribute] > 0)]; # Select only records where attribute value > 0.
-        project_ids_df = get_project_ids_df(copy_commit_records_df); # Because some projects may have had no records where attribute value > 0.
-    
-    num_projects = project_ids_df.shape[0];
-    
-    num_commit_records = copy_commit_records_df.shape[0];
-    committer_datetimes = list();
-    committer_local_timestamp_strs = list();
-    for i in range(0, num_commit_records): # Need data for committer datetimes (as timestamps) and committer datetime strings (hover tooltips)...
+        df = df[(df[attribute] > 0)]; # Select only records where attribute value > 0.
 
-        commit_record = commit_records_df.iloc[i];
+    # Projects in order of appearance (some projects may have had no records where attribute value > 0).
+    project_indices = df.groupby('project_index')['record_index'].min().sort_values().index;
 
-        committer_unix_timestamp = float(commit_record['committer_unix_timestamp']);
-        
-        committer_datetime = datetime.datetime.fromtimestamp(committer_unix_timestamp);
-        committer_datetimes.append(committer_datetime);
-        
-        committer_local_timestamp_str = datetime.datetime.fromtimestamp(committer_unix_timestamp).strftime('%Y-%m-%d %H:%M:%S '+time.tzname[1]);
-        committer_local_timestamp_strs.append(committer_local_timestamp_str);
-    
-    # Add new columns to DataFrame.
-    copy_commit_records_df['committer_datetime'] = committer_datetimes;
-    copy_commit_records_df['committer_local_timestamp_str'] = committer_local_timestamp_strs;
+    project_commit_records_dfs_dict = dict(list(df.groupby('project_index', sort=False)));
+    project_commit_records_dfs = list();
+    for project_index in project_indices: # For each project...
+
+        project_commit_records_df = project_commit_records_dfs_dict[project_index]; # (Sorted by committer datetime.)
+        ycoords = project_commit_records_df['cumulative_'+attribute].values; # (Records where attribute value is 0 add nothing to cumulative growth.)
+        project_commit_records_df = project_commit_records_df.drop(columns=get_commit_records_plot_df_helper_columns());
+        project_commit_records_df = project_commit_records_df.assign(ycoordinates=ycoords); # Add new column for plot y-coordinates data.
+        project_commit_records_dfs.append(project_commit_records_df);
+
+    return project_commit_records_dfs;
+
+
+# Get plot for project attribute cumulative growth.
+def get_project_attribute_cumulative_growth_plot(attribute, project_commit_records_dfs):
+   
+    num_projects = len(project_commit_records_dfs);
 
     MODEL_TOOLTIPS = [('repo_remote_hostname', '@repo_remote_hostname'),
                       ('repo_owner', '@repo_owner'),
@@ -415,30 +775,7 @@ def get_project_attribute_cumulative_growth_plot(project_ids_df, commit_records_
 
     for i in range(0, num_projects): # For each project...
 
-        if (args.paths_as_projects): # Treat each repo path as an individual project...
-            project_commit_records_df = copy_commit_records_df[(copy_commit_records_df['repo_remote_hostname'] == project_ids_df.iloc[i]['repo_remote_hostname']) &
-                                                               (copy_commit_records_df['repo_owner']           == project_ids_df.iloc[i]['repo_owner']) &
-                                                               (copy_commit_records_df['repo_name']            == project_ids_df.iloc[i]['repo_name']) &
-                                                               (copy_commit_records_df['path_in_repo']         == project_ids_df.iloc[i]['path_in_repo']) ];
-        else:
-            project_commit_records_df = copy_commit_records_df[(copy_commit_records_df['repo_remote_hostname'] == project_ids_df.iloc[i]['repo_remote_hostname']) &
-                                                               (copy_commit_records_df['repo_owner']           == project_ids_df.iloc[i]['repo_owner']) &
-                                                               (copy_commit_records_df['repo_name']            == project_ids_df.iloc[i]['repo_name']) ];
-        
-        project_commit_records_df = project_commit_records_df.sort_values('committer_datetime', ascending=True); # (Smallest values at top.)
-        
-        num_commits = project_commit_records_df.shape[0];
-        cumulative_value = 0;
-        ycoords = list();
-        if (attribute == 'num_commits'):
-            for j in range(0, num_commits):
-                cumulative_value = cumulative_value + 1;
-                ycoords.append(cumulative_value);
-        else:
-            for j in range(0, num_commits):
-                cumulative_value = cumulative_value + project_commit_records_df.iloc[j][attribute];
-                ycoords.append(cumulative_value);
-        project_commit_records_df = project_commit_records_df.assign(ycoordinates=ycoords); # Add new column for plot y-coordinates data.
+        project_commit_records_df = project_commit_records_dfs[i];
         
         palette_index = i % (len(bokeh.palettes.Dark2_5));
         
@@ -447,116 +784,419 @@ def get_project_attribute_cumulative_growth_plot(project_ids_df, commit_records_
     return plot;
 
 
-# Get datetime delta strftime-like string.
-def get_datetime_delta_str(datetime_obj, code):
+# Get array of local (naive) datetimes for array of UNIX timestamps.
+def get_local_datetimes(unix_timestamps):
 
-    if (code == 'Y'):
-        return datetime_obj.strftime('%Y');
-    elif (code == 'm'):
-        return datetime_obj.strftime('%Y-%m');
-    elif (code == 'd'):
-        return datetime_obj.strftime('%Y-%m-%d');
-    elif (code == 'H'):
-        return datetime_obj.strftime('%Y-%m-%d %H:00:00');
-    elif (code == 'M'):
-        return datetime_obj.strftime('%Y-%m-%d %H:%M:00');
-    elif (code == 'S'):
-        return datetime_obj.strftime('%Y-%m-%d %H:%M:%S');
+    utc_datetimes = pandas.to_datetime(numpy.asarray(unix_timestamps, dtype='int64'), unit='s', utc=True);
 
+    return utc_datetimes.tz_convert(timezone).tz_localize(None).values;
 
-# Given list of UNIX timestamps, get number of unique datetime-delta-based timestamps.
-def get_num_datetime_delta_local_timestamps(unix_timestamps, datetime_delta_code):
 
-    datetime_delta_local_timestamps = list();
-    
-    for unix_timestamp in unix_timestamps:
+# Get dict of integer datetime delta keys (local datetimes floored to datetime delta, e.g. to hour) per datetime delta code, for array of UNIX timestamps.
+# Local datetimes get computed just once (in vectorized fashion), regardless of the number of datetime delta codes.
+def get_datetime_delta_keys_dict(unix_timestamps, datetime_delta_codes):
 
-        local_timestamp = time.localtime(unix_timestamp);
-        datetime_obj = datetime.datetime.fromtimestamp(time.mktime(local_timestamp));
-        datetime_delta_str = get_datetime_delta_str(datetime_obj, datetime_delta_code);
-        datetime_delta_local_timestamps.append(datetime_delta_str);
+    local_datetimes = get_local_datetimes(unix_timestamps);
 
-    datetime_delta_local_timestamps = shared.setlist(datetime_delta_local_timestamps); # Eliminate duplicates.
+    datetime_delta_keys_dict = dict();
+    for datetime_delta_code in datetime_delta_codes:
+        unit = DATETIME_DELTA_CODE_UNITS_DICT[datetime_delta_code];
+        datetime_delta_keys_dict[datetime_delta_code] = local_datetimes.astype('datetime64['+unit+']').view('int64'); # (Units since epoch.)
 
-    num_datetime_delta_local_timestamps = len(datetime_delta_local_timestamps);
+    return datetime_delta_keys_dict;
 
-    return num_datetime_delta_local_timestamps;
 
+# Accumulator of project data needed for project feature vectors (so that project commit records need not be held in memory).
+class ProjectAccumulator(object):
+
+    def __init__(self, project_id, features):
+
+        self.project_id = project_id;
+        self.features = features;
+        self.paths_in_repo = list();
+        self.commit_hashes = set();
+        self.num_lines_dict = dict([(attribute, 0) for attribute in PROJECT_ATTRIBUTE_TITLES_DICT if (attribute != 'num_commits')]);
+        self.datetime_delta_keys_dict = dict([(feature, set()) for feature in features if (feature in DATETIME_DELTA_FEATURE_CODES_DICT)]);
+
+    # Fold DataFrame of (further) project commit records into accumulator.
+    def add_df(self, project_commit_records_df):
+
+        for path_in_repo in project_commit_records_df['path_in_repo'].unique(): # (In order of appearance.)
+            path_in_repo = str(path_in_repo); # (Cast to string to keep value from registering as unicode.)
+            if (path_in_repo not in self.paths_in_repo):
+                self.paths_in_repo.append(path_in_repo);
+
+        self.commit_hashes.update(project_commit_records_df['commit_hash'].values);
+
+        for attribute in self.num_lines_dict:
+            if (attribute in project_commit_records_df.columns):
+                self.num_lines_dict[attribute] = self.num_lines_dict[attribute] + project_commit_records_df[attribute].sum();
+
+        for feature in self.datetime_delta_keys_dict: # (Keys precomputed for author and committer timestamps alike.)
+            datetime_delta_code = DATETIME_DELTA_FEATURE_CODES_DICT[feature];
+            for timestamp_attribute in ['author_unix_timestamp', 'committer_unix_timestamp']:
+                self.datetime_delta_keys_dict[feature].update(project_commit_records_df[get_datetime_delta_key_attribute(timestamp_attribute, datetime_delta_code)].unique());
+
+        return;
+
+    # Get project feature vector (as list of values for project labels followed by features).
+    def get_feature_vector(self):
+
+        feature_vector = [self.project_id[0], self.project_id[1], self.project_id[2], tuple(self.paths_in_repo)];
+        for feature in self.features:
+            if (feature == 'total_num_commits'):
+                feature_vector.append(len(self.commit_hashes));
+            elif (feature in self.datetime_delta_keys_dict):
+                feature_vector.append(len(self.datetime_delta_keys_dict[feature]));
+            else:
+                feature_vector.append(self.num_lines_dict[feature[len('total_'):]]);
+
+        return feature_vector;
+
+
+# Get name of (temporary) DataFrame column holding datetime delta keys for timestamp attribute.
+def get_datetime_delta_key_attribute(timestamp_attribute, datetime_delta_code):
+
+    return timestamp_attribute + '_' + DATETIME_DELTA_CODE_UNITS_DICT[datetime_delta_code] + '_key';
+
+
+# Fold DataFrame of commit records into project accumulators (keyed by project ID, in order of appearance), in single grouped pass.
+def accumulate_commit_records(project_accumulators_dict, commit_records_df, features):
+
+    # Datetime delta keys for all commit records (in one vectorized pass, rather than per project).
+    datetime_delta_codes = [DATETIME_DELTA_FEATURE_CODES_DICT[feature] for feature in features if (feature in DATETIME_DELTA_FEATURE_CODES_DICT)];
+    if (datetime_delta_codes):
+        key_columns_dict = dict();
+        for timestamp_attribute in ['author_unix_timestamp', 'committer_unix_timestamp']:
+            datetime_delta_keys_dict = get_datetime_delta_keys_dict(commit_records_df[timestamp_attribute].values, datetime_delta_codes);
+            for datetime_delta_code in datetime_delta_codes:
+                key_columns_dict[get_datetime_delta_key_attribute(timestamp_attribute, datetime_delta_code)] = datetime_delta_keys_dict[datetime_delta_code];
+        commit_records_df = commit_records_df.assign(**key_columns_dict);
+
+    for (project_id, project_commit_records_df) in commit_records_df.groupby(get_project_id_attributes(), sort=False, observed=True): # (Groups in order of appearance.)
+        if (project_id not in project_accumulators_dict):
+            project_accumulators_dict[project_id] = ProjectAccumulator(project_id, features);
+        project_accumulators_dict[project_id].add_df(project_commit_records_df);
+
+    return;
+
+
+# Fold chunk of commit records into project accumulators, eliminating duplicate rows (within chunk, and against previous chunks, whose row hashes get tracked) and unneeded commit records first.
+def accumulate_commit_records_chunk(project_accumulators_dict, df, features, row_hashes):
+
+    # Eliminate duplicate rows (within chunk, and against previous chunks).
+    df = df.reset_index(drop=True); # Reset DataFrame row indices.
+    hashes = pandas.Series(shared.get_data_store_df_row_hashes(df));
+    df = df[(~hashes.duplicated()) & (~hashes.isin(row_hashes))];
+    row_hashes.update(hashes.values);
+
+    df = filter_commit_records(df);
+
+    accumulate_commit_records(project_accumulators_dict, df, features);
+
+    return;
+
+
+# Get dict of project accumulators (keyed by project ID, in order of appearance), folding in data store commit records chunk by chunk.
+# Memory stays bounded by number of projects (plus their distinct commit hashes and time buckets) rather than number of commit records.
+def get_project_accumulators_dict(features):
+
+    project_accumulators_dict = collections.OrderedDict();
+    row_hashes = set(); # Hashes of commit records seen, for eliminating duplicate rows across chunks.
+
+    t1 = datetime.datetime.now();
+    num_records = 0;
+    dfs = data_store.read_df_chunks(args.chunk_size, filters_dict=filters_dict, attributes=get_needed_data_store_attributes(features));
+    while True:
+
+        try:
+            df = next(dfs);
+        except StopIteration:
+            break;
+        except ValueError:
+            sys.exit('Bad data store source \'' + args.source + '\'.');
+
+        num_records = num_records + df.shape[0];
+
+        accumulate_commit_records_chunk(project_accumulators_dict, df, features, row_hashes);
+
+        sys.stdout.write("\r");
+        sys.stdout.write("Accumulating commit records: " + str(num_records) + " (" + str(len(project_accumulators_dict)) + " projects)");
+        sys.stdout.flush();
+
+    t2 = datetime.datetime.now();
+    t = t2 - t1;
+    sys.stdout.write("\r");
+    sys.stdout.write("Accumulating commit records: " + str(num_records) + " (" + str(len(project_accumulators_dict)) + " projects), done in " + str(t));
+    print('');
+
+    return project_accumulators_dict;
+
+
+# Request report on commit records streamed so far (signal handler, as report cannot be written while chunk is being folded in).
+def request_stream_report(signum, frame):
+
+    global is_stream_report_requested;
+
+    is_stream_report_requested = True;
+
+    return;
+
+
+# Write report (spreadsheet and data visualizations for features) on commit records streamed so far, from project accumulators.
+def write_stream_report(project_accumulators_dict):
+
+    global project_feature_vectors_df;
+
+    print('');
+    if (not project_accumulators_dict):
+        print("No relevant commits records to report on yet.");
+        return;
+
+    xlsx_sheets = list();
+    plots = list();
+    if (args.features):
+        project_feature_vectors_df = get_accumulated_project_feature_vectors_df(args.features, project_accumulators_dict);
+        process_feature_analytics(args.features, xlsx_sheets, plots);
+        project_feature_vectors_df = None; # (So that final project feature vectors get generated anew.)
+    write_outputs(args.features, xlsx_sheets, plots);
+
+    return;
+
+
+# Merge chunk of streamed commit records into those streamed before it, the way data store upserts do (by key, keeping first occurrence, with labels unioned).
+# Gets DataFrame of merged commit records that satisfy filters for the first time, so that each gets folded into project accumulators only once (labels only ever get added, so commit records never stop satisfying filters).
+# Streamed commit records get tracked by key: as None once settled (folded in, or outside time range), or else as first occurrence, in case further labels let it satisfy filters.
+def merge_streamed_commit_records(df, streamed_records_dict):
+
+    df = shared.merge_data_store_df_duplicate_keys(df.reset_index(drop=True)); # (Within chunk.)
+
+    keys = list();
+    records = list();
+    for (key, record) in zip(df[shared.COMMIT_RECORD_KEY_ATTRIBUTES].itertuples(index=False), df.to_dict('records')):
+        if (key in streamed_records_dict): # Streamed before...
+            streamed_record = streamed_records_dict[key];
+            if (streamed_record is None):
+                continue;
+            labels = tuple(shared.setlist(streamed_record['labels'] + record['labels']));
+            if (labels == streamed_record['labels']): # (Still does not satisfy filters.)
+                continue;
+            record = dict(streamed_record, labels=labels);
+        keys.append(key);
+        records.append(record);
+
+    df = pandas.DataFrame(records, columns=df.columns);
+    for attribute in df.columns:
+        df[attribute] = df[attribute].astype(shared.DATA_STORE_ATTRIBUTE_DTYPES[attribute]);
+
+    time_range_mask = get_time_range_mask(df);
+    keep_mask = time_range_mask;
+    if (args.labels):
+        keep_mask = keep_mask & shared.LabelIndex(df['labels']).get_mask(args.labels, args.all_labels);
+
+    for (key, record, is_kept, is_in_time_range) in zip(keys, records, keep_mask, time_range_mask):
+        streamed_records_dict[key] = record if (is_in_time_range and (not is_kept)) else None;
+
+    df = df[keep_mask];
+    df = df.reset_index(drop=True); # Reset DataFrame row indices.
+
+    return df;
+
+
+# Get dict of project accumulators (keyed by project ID, in order of appearance), folding in commit records chunk by chunk as they get streamed in.
+# Reports on commit records streamed so far get written whenever requested (via SIGUSR1), be it between chunks or while waiting on stream.
+def get_streamed_project_accumulators_dict(features):
+
+    global is_stream_report_requested;
+
+    project_accumulators_dict = collections.OrderedDict();
+    streamed_records_dict = dict(); # Commit records streamed so far (by key), for merging duplicate commit records across chunks.
+
+    signal.signal(signal.SIGUSR1, request_stream_report);
+    signal.siginterrupt(signal.SIGUSR1, False); # (Restart interrupted system calls, other than those waiting on stream.)
+
+    fd = sys.stdin.fileno() if (args.stream == '-') else os.open(args.stream, os.O_RDONLY); # (Named pipe blocks until writer opens it.)
+
+    t1 = datetime.datetime.now();
+    num_records = 0;
+    dfs = shared.read_record_stream_df_chunks(fd, args.chunk_size, attributes=get_needed_data_store_attributes(features));
+    while True:
+
+        try:
+            df = next(dfs);
+        except StopIteration:
+            break;
+        except ValueError:
+            sys.exit('Bad record stream \'' + args.stream + '\'.');
+
+        if (df is not None): # (None while waiting on stream.)
+            num_records = num_records + df.shape[0];
+            accumulate_commit_records(project_accumulators_dict, merge_streamed_commit_records(df, streamed_records_dict), features);
+
+        if (is_stream_report_requested):
+            is_stream_report_requested = False;
+            write_stream_report(project_accumulators_dict);
+
+        sys.stdout.write("\r");
+        sys.stdout.write("Streaming commit records: " + str(num_records) + " (" + str(len(project_accumulators_dict)) + " projects)");
+        sys.stdout.flush();
+
+    signal.signal(signal.SIGUSR1, signal.SIG_IGN); # (Final report is on its way.)
+    if (args.stream != '-'):
+        os.close(fd);
+
+    t2 = datetime.datetime.now();
+    t = t2 - t1;
+    sys.stdout.write("\r");
+    sys.stdout.write("Streaming commit records: " + str(num_records) + " (" + str(len(project_accumulators_dict)) + " projects), done in " + str(t));
+    print('');
+
+    return project_accumulators_dict;
+
+
+# Get DataFrame of project feature vectors from project accumulators.
+def get_accumulated_project_feature_vectors_df(features, project_accumulators_dict):
 
-# Get DataFrame of project feature vectors.
-def get_project_feature_vectors_df(features, project_ids_df, commit_records_df):
-    
     project_labels = ['repo_remote_hostname',
                       'repo_owner',
                       'repo_name',
                       'paths_in_repo'];
 
-    num_projects = project_ids_df.shape[0];
-    
-    num_features = len(features);
-    
-    row_labels = [r for r in range(0, num_projects)];
-    column_labels = project_labels + features;
-    df = pandas.DataFrame(index=row_labels, columns=column_labels);
-    
-    for i in range(0, num_projects): # For each project...
-        
-        project_id = project_ids_df.iloc[i]; # Get project ID i.
-
-        # Retrieve project commit records.
-        if (args.paths_as_projects): # Treat each repo path as an individual project...
-            project_commit_records_df = commit_records_df[(commit_records_df['repo_remote_hostname'] == project_ids_df.iloc[i]['repo_remote_hostname']) &
-                                                          (commit_records_df['repo_owner']           == project_ids_df.iloc[i]['repo_owner']) &
-                                                          (commit_records_df['repo_name']            == project_ids_df.iloc[i]['repo_name']) &
-                                                          (commit_records_df['path_in_repo']         == project_ids_df.iloc[i]['path_in_repo']) ];
-        else:
-            project_commit_records_df = commit_records_df[(commit_records_df['repo_remote_hostname'] == project_ids_df.iloc[i]['repo_remote_hostname']) &
-                                                          (commit_records_df['repo_owner']           == project_ids_df.iloc[i]['repo_owner']) &
-                                                          (commit_records_df['repo_name']            == project_ids_df.iloc[i]['repo_name']) ];
-
-        num_project_commit_records = project_commit_records_df.shape[0];
-
-        paths_in_repo = list();
-        commit_hashes = list();
-        unix_timestamps = list();
-        num_lines_changed = 0;
-        num_lines_inserted = 0;
-        num_lines_deleted = 0;
-        num_lines_modified = 0;
-
-        for j in range(0, num_project_commit_records): # For each project commit record...
-
-            commit_record = project_commit_records_df.iloc[j]; # Get commit record j.
-            
-            paths_in_repo.append(str(commit_record['path_in_repo'])); # (Cast to string to keep value from registering as unicode.)
-
-            commit_hashes.append(commit_record['commit_hash']);
-             
-            unix_timestamps = unix_timestamps + [commit_record['author_unix_timestamp'], commit_record['committer_unix_timestamp']];
-                
-            num_lines_changed = num_lines_changed + commit_record['num_lines_changed'];
-            num_lines_inserted = num_lines_inserted + commit_record['num_lines_inserted'];
-            num_lines_deleted = num_lines_deleted + commit_record['num_lines_deleted'];
-            num_lines_modified = num_lines_modified + commit_record['num_lines_modified'];
-
-        df.iloc[i]['repo_remote_hostname']     = project_id['repo_remote_hostname'];
-        df.iloc[i]['repo_owner']               = project_id['repo_owner'];
-        df.iloc[i]['repo_name']                = project_id['repo_name'];
-        df.iloc[i]['paths_in_repo']            = tuple(shared.setlist(paths_in_repo));
-        df.iloc[i]['total_num_commits']        = len(shared.setlist(commit_hashes));
-        df.iloc[i]['total_num_lines_changed']  = num_lines_changed;
-        df.iloc[i]['total_num_lines_inserted'] = num_lines_inserted;
-        df.iloc[i]['total_num_lines_deleted']  = num_lines_deleted;
-        df.iloc[i]['total_num_lines_modified'] = num_lines_modified;
-        
-        for k in range(0, num_features): # For each datetime delta code (or feature, essentially)...
+    feature_vectors = [project_accumulator.get_feature_vector() for project_accumulator in project_accumulators_dict.values()];
+
+    df = pandas.DataFrame(feature_vectors, columns=project_labels+features, dtype='object');
+
+    return df;
+
+
+# Get DataFrame of project feature vectors (in single grouped pass over commit records, rather than one pass per project).
+def get_project_feature_vectors_df(features, commit_records_df):
+
+    project_accumulators_dict = collections.OrderedDict();
+    accumulate_commit_records(project_accumulators_dict, commit_records_df, features);
+
+    return get_accumulated_project_feature_vectors_df(features, project_accumulators_dict);
+
+
+# Get DataFrame of project feature vectors computed within data store (so that commit records never get loaded).
+def get_pushed_down_project_feature_vectors_df(features):
+
+    project_labels = ['repo_remote_hostname',
+                      'repo_owner',
+                      'repo_name',
+                      'paths_in_repo'];
+
+    # Commit record filters, including default time range bounds (as commit records do not get filtered afterwards).
+    pushdown_filters_dict = shared.get_filters_dict(since=shared.utc_timestamp_str_to_unix_timestamp(args.since),
+                                                    until=shared.utc_timestamp_str_to_unix_timestamp(args.until),
+                                                    labels=args.labels,
+                                                    all_labels=args.all_labels);
+
+    sum_attributes = [feature[len('total_'):] for feature in features if (feature.startswith('total_num_lines_'))];
+    datetime_formats_dict = collections.OrderedDict([(feature, DATETIME_DELTA_CODE_FORMATS_DICT[DATETIME_DELTA_FEATURE_CODES_DICT[feature]]) for feature in features if (feature in DATETIME_DELTA_FEATURE_CODES_DICT)]);
+
+    aggregates_df = data_store.read_project_aggregates_df(get_project_id_attributes(), sum_attributes, datetime_formats_dict,
+                                                          filters_dict=pushdown_filters_dict,
+                                                          attributes=get_needed_data_store_attributes(features), # (Over which commit records get deduplicated.)
+                                                          timezone_name=args.timezone);
+    if (aggregates_df is None):
+        sys.exit("Could not compute project feature vectors within data store \'" + args.source + "\' (try providing time zone).");
+
+    feature_vectors = list();
+    for aggregates in aggregates_df.to_dict('records'):
+        feature_vector = [aggregates[project_label] for project_label in project_labels];
+        for feature in features:
+            if (feature == 'total_num_commits'):
+                feature_vector.append(aggregates['num_commit_hashes']);
+            elif (feature in datetime_formats_dict):
+                feature_vector.append(aggregates[feature]);
+            else:
+                feature_vector.append(aggregates[feature[len('total_'):]]);
+        feature_vectors.append(feature_vector);
+
+    df = pandas.DataFrame(feature_vectors, columns=project_labels+features, dtype='object');
+
+    return df;
+
+
+# Get list of features that activity cube can serve (in order).
+def get_activity_cube_features(features):
+
+    return [feature for feature in features if (    (feature not in DATETIME_DELTA_FEATURE_CODES_DICT)
+                                                    or (DATETIME_DELTA_FEATURE_CODES_DICT[feature] in ACTIVITY_CUBE_DATETIME_DELTA_CODES)   )];
+
+
+# Get DataFrame of activity cube rows, if activity cube can answer for commit records satisfying filters (None otherwise, with warning as to why).
+# It can if it is up to date with commit records, no labels filter applies, its hours fall within time range, and they map onto whole local hours.
+def get_activity_cube_df():
+
+    action = 'loading commit records instead';
+
+    if (args.labels): # (Activity cube holds no labels.)
+        print(shared.get_warning_str("Activity cube cannot filter commit records by labels", action));
+        return None;
+
+    df = data_store.read_activity_cube_df();
+    if (df is None):
+        print(shared.get_warning_str("No activity cube up to date with commit records in data store", action));
+        return None;
+
+    if (not df.empty):
+
+        hour_start_unix_timestamps = df['unix_hour'].values * shared.SECONDS_PER_HOUR;
+        if (    (hour_start_unix_timestamps.min() < shared.utc_timestamp_str_to_unix_timestamp(args.since))
+                or (hour_start_unix_timestamps.max() + shared.SECONDS_PER_HOUR > shared.utc_timestamp_str_to_unix_timestamp(args.until))   ): # (Commit records would have to be filtered by time range.)
+            print(shared.get_warning_str("Activity cube hours extend beyond time range", action));
+            return None;
+
+        local_hour_starts = get_local_datetimes(hour_start_unix_timestamps);
+        local_hour_ends = get_local_datetimes(hour_start_unix_timestamps + (shared.SECONDS_PER_HOUR - 1));
+        if (    (local_hour_starts.astype('datetime64[h]') != local_hour_starts).any()
+                or (local_hour_ends.astype('datetime64[h]') != local_hour_starts).any()   ): # (Time zone offset is not whole hours throughout.)
+            print(shared.get_warning_str("Activity cube hours do not map onto local hours in time zone", action));
+            return None;
+
+    return df;
+
+
+# Get DataFrame of project feature vectors from activity cube rows, taking features that it cannot serve from project accumulators.
+def get_activity_cube_project_feature_vectors_df(features, project_accumulators_dict):
+
+    project_labels = ['repo_remote_hostname',
+                      'repo_owner',
+                      'repo_name',
+                      'paths_in_repo'];
+
+    activity_cube_features = get_activity_cube_features(features);
+    accumulated_features = [feature for feature in features if (feature not in activity_cube_features)];
 
-            feature = features[k]; # Get feature k...
-            if (feature in DATETIME_DELTA_FEATURE_CODES_DICT):
+    # Datetime delta keys for all hours (in one vectorized pass, rather than per project). Local hours are whole, so their start stands for them.
+    df = activity_cube_df; # (Shared global.)
+    datetime_delta_codes = [DATETIME_DELTA_FEATURE_CODES_DICT[feature] for feature in activity_cube_features if (feature in DATETIME_DELTA_FEATURE_CODES_DICT)];
+    if (datetime_delta_codes):
+        datetime_delta_keys_dict = get_datetime_delta_keys_dict(df['unix_hour'].values * shared.SECONDS_PER_HOUR, datetime_delta_codes);
+        df = df.assign(**dict([(get_datetime_delta_key_attribute('unix_hour', datetime_delta_code), datetime_delta_keys_dict[datetime_delta_code]) for datetime_delta_code in datetime_delta_codes]));
 
-                datetime_delta_code = DATETIME_DELTA_FEATURE_CODES_DICT[feature]; # Get datetime delta code.
-                num_datetime_delta_local_timestamps = get_num_datetime_delta_local_timestamps(unix_timestamps, datetime_delta_code); # Get number of unique datetime-delta-based timestamps from all commit records.
-                df.iloc[i][feature] = num_datetime_delta_local_timestamps;
+    num_commits_attribute = 'num_commits' if args.paths_as_projects else 'num_repo_commits'; # (Commits recurring across repo paths count once towards repo.)
+
+    feature_vectors = list();
+    for (project_id, project_activity_cube_df) in df.groupby(get_project_id_attributes(), sort=False): # (Groups in order of appearance.)
+        paths_in_repo = tuple([str(path_in_repo) for path_in_repo in project_activity_cube_df['path_in_repo'].unique()]); # (Cast to string to keep value from registering as unicode.)
+        feature_vector = [project_id[0], project_id[1], project_id[2], paths_in_repo];
+        if (accumulated_features):
+            accumulated_feature_vector = project_accumulators_dict[project_id].get_feature_vector();
+        for feature in features:
+            if (feature in accumulated_features):
+                feature_vector.append(accumulated_feature_vector[len(project_labels) + accumulated_features.index(feature)]);
+            elif (feature == 'total_num_commits'):
+                feature_vector.append(project_activity_cube_df[num_commits_attribute].sum());
+            elif (feature in DATETIME_DELTA_FEATURE_CODES_DICT):
+                feature_vector.append(project_activity_cube_df[get_datetime_delta_key_attribute('unix_hour', DATETIME_DELTA_FEATURE_CODES_DICT[feature])].nunique());
+            else:
+                feature_vector.append(project_activity_cube_df[feature[len('total_'):]].sum());
+        feature_vectors.append(feature_vector);
+
+    df = pandas.DataFrame(feature_vectors, columns=project_labels+features, dtype='object');
 
     return df;
 
@@ -606,83 +1246,213 @@ def get_checked_class_configurations_dict(class_configurations_dict, features, c
     return checked_class_configurations_dict;
 
 
-# Get feature observations classifications DataFrame, each class being a single unit wide.
-def get_singleunitwide_classes_df(feature, project_feature_vectors_df):
+# Quantile sketch (KLL) of feature observations: small summary from which numbers of observations up to any value (and so frequency distributions) can be estimated to within error bound (as fraction of observations), with high probability.
+# Sketches of disjoint sets of observations merge into sketch of their union, having same error bound.
+# Inspired by: https://arxiv.org/abs/1603.05346
+class QuantileSketch(object):
 
-    observations = project_feature_vectors_df[feature].tolist(); # Get feature values.
-    num_classes = len(observations);
-    width_class = 1;
-    
-    row_labels = [r for r in range(0, num_classes)];
-    COLUMN_LABELS = ['>=', '<'];
-    df = pandas.DataFrame(index=row_labels, columns=COLUMN_LABELS);
-    df.fillna(0.0);
-    
-    # For each class, define start and end values.
-    for i in range(0, num_classes):
+    def __init__(self, error, seed=0):
 
-        observation = project_feature_vectors_df.iloc[i][feature]; # Get feature value for project i.
-        start = observation;
-        end = start + width_class;
-        df.iloc[i]['>='] = start;
-        df.iloc[i]['<'] = end;
+        self.error = error;
+        self.k = int(math.ceil(SKETCH_CAPACITY_FACTOR / error)); # Capacity of top compactor.
+        self.num_observations = 0;
+        self.min_observation = None;
+        self.max_observation = None;
+        self.compactors = [numpy.empty(0)]; # Observations retained per level (each standing for 2^level observations).
+        self.random = random.Random(seed); # (Seeded, so that outputs are reproducible.)
 
-    df = df.drop_duplicates(); # Eliminate duplicate DataFrame rows.
+    # Get capacity of compactor at level (geometrically smaller, the further down from top).
+    def get_capacity(self, level):
+
+        depth = len(self.compactors) - level - 1;
+
+        return max(SKETCH_MIN_CAPACITY, int(math.ceil(self.k * (SKETCH_CAPACITY_RATIO ** depth))));
+
+    # Compact compactors over capacity (bottom up): each gets sorted, and every other observation (from random offset) moves up a level, standing for twice as many.
+    def compress(self):
+
+        level = 0;
+        while (level < len(self.compactors)): # (Top level may get added along the way.)
+            observations = self.compactors[level];
+            if (len(observations) > self.get_capacity(level)):
+                if (level + 1 == len(self.compactors)):
+                    self.compactors.append(numpy.empty(0));
+                observations = numpy.sort(observations);
+                num_compacted = len(observations) - (len(observations) % 2); # (Odd one out stays.)
+                offset = self.random.randint(0, 1);
+                self.compactors[level+1] = numpy.concatenate([self.compactors[level+1], observations[offset:num_compacted:2]]);
+                self.compactors[level] = observations[num_compacted:];
+            level = level + 1;
+
+        return;
+
+    # Fold array of (further) observations into sketch.
+    def add(self, observations):
+
+        if (not len(observations)):
+            return;
+
+        observations = numpy.asarray(observations, dtype='float64');
+        self.update_extremes(observations.min(), observations.max());
+        self.num_observations = self.num_observations + len(observations);
+        self.compactors[0] = numpy.concatenate([self.compactors[0], observations]);
+        self.compress();
+
+        return;
+
+    # Merge sketch of other (disjoint) observations into sketch (error bound being that of the looser of both).
+    def merge(self, sketch):
+
+        if (not sketch.num_observations):
+            return;
+
+        self.error = max(self.error, sketch.error);
+        self.k = min(self.k, sketch.k);
+        self.update_extremes(sketch.min_observation, sketch.max_observation);
+        self.num_observations = self.num_observations + sketch.num_observations;
+        while (len(self.compactors) < len(sketch.compactors)):
+            self.compactors.append(numpy.empty(0));
+        for level in range(0, len(sketch.compactors)):
+            self.compactors[level] = numpy.concatenate([self.compactors[level], sketch.compactors[level]]);
+        self.compress();
+
+        return;
+
+    # Update smallest and greatest observations (kept exact).
+    def update_extremes(self, min_observation, max_observation):
+
+        self.min_observation = min_observation if (self.min_observation is None) else min(self.min_observation, min_observation);
+        self.max_observation = max_observation if (self.max_observation is None) else max(self.max_observation, max_observation);
+
+        return;
+
+    # Get sorted array of distinct retained observations (extremes being exact), along with array of estimated numbers of observations up to (and including) each.
+    def get_cumulative_counts(self):
+
+        observations = numpy.concatenate(self.compactors);
+        weights = numpy.concatenate([numpy.full(len(self.compactors[level]), 2.0 ** level) for level in range(0, len(self.compactors))]);
+
+        (distinct_observations, inverse_indices) = numpy.unique(observations, return_inverse=True);
+        cumulative_counts = numpy.cumsum(numpy.bincount(inverse_indices, weights=weights));
+
+        distinct_observations[-1] = self.max_observation; # (Retained extremes stand in for actual ones.)
+        if (len(distinct_observations) > 1):
+            distinct_observations[0] = self.min_observation;
+
+        return (distinct_observations, cumulative_counts);
+
+    # Get dict representation of sketch (for JSON files).
+    def get_dict(self):
+
+        return {'error': self.error,
+                'k': self.k,
+                'num_observations': self.num_observations,
+                'min_observation': self.min_observation,
+                'max_observation': self.max_observation,
+                'compactors': [observations.tolist() for observations in self.compactors]};
+
+
+# Get quantile sketch from its dict representation (raising ValueError upon malformed one).
+def get_quantile_sketch(sketch_dict):
+
+    try:
+        sketch = QuantileSketch(float(sketch_dict['error']));
+        sketch.k = int(sketch_dict['k']);
+        sketch.num_observations = int(sketch_dict['num_observations']);
+        sketch.min_observation = sketch_dict['min_observation'];
+        sketch.max_observation = sketch_dict['max_observation'];
+        sketch.compactors = [numpy.array(observations, dtype='float64') for observations in sketch_dict['compactors']];
+    except (KeyError, TypeError):
+        raise ValueError("Malformed quantile sketch.");
+    if (not sketch.compactors):
+        raise ValueError("Malformed quantile sketch.");
+
+    return sketch;
+
+
+# Get dict of feature quantile sketches (keyed by feature) from JSON file (None, if file is malformed).
+def read_feature_sketches_dict(filename):
+
+    try:
+        with open(filename, 'r') as f:
+            feature_sketch_dicts_dict = json.load(f);
+        return dict([(str(feature), get_quantile_sketch(feature_sketch_dicts_dict[feature])) for feature in feature_sketch_dicts_dict]);
+    except (IOError, ValueError, AttributeError, TypeError):
+        return None;
+
+
+# Write dict of feature quantile sketches (keyed by feature) to JSON file.
+def write_feature_sketches_dict(feature_sketches_dict, filename):
+
+    with open(filename, 'w') as f:
+        json.dump(dict([(feature, feature_sketches_dict[feature].get_dict()) for feature in feature_sketches_dict]), f);
+
+    return;
+
+
+# Get dict of feature quantile sketches (keyed by feature) of project feature vectors (if any), with those read from sketch input files merged in.
+def get_feature_sketches_dict(features):
+
+    feature_sketches_dict = collections.OrderedDict();
+    for feature in features:
+        sketch = QuantileSketch(args.sketch_error);
+        if (project_feature_vectors_df is not None):
+            sketch.add(project_feature_vectors_df[feature].values.astype('float64'));
+        for input_feature_sketches_dict in input_feature_sketches_dicts:
+            sketch.merge(input_feature_sketches_dict[feature]);
+        feature_sketches_dict[feature] = sketch;
+
+    return feature_sketches_dict;
+
+
+# Get project feature vectors DataFrame sorted by feature observations (shared by feature CDF and histogram).
+def get_sorted_project_feature_vectors_df(feature, project_feature_vectors_df):
+
+    df = project_feature_vectors_df.sort_values(by=[feature]); # Sort DataFrame rows by feature observations.
     df = df.reset_index(drop=True); # Reset DataFrame row indices.
 
     return df;
 
 
+# Get feature observations classifications DataFrame, each class being a single unit wide.
+def get_singleunitwide_classes_df(feature, observations):
+
+    width_class = 1;
+    starts = numpy.unique(observations); # (One class per unique observation, sorted.)
+
+    df = pandas.DataFrame(collections.OrderedDict([('>=', starts),
+                                                   ('<' , starts + width_class)]));
+
+    return df;
+
+
 # Find smallest, non-negative value of k such that 2^(k) > n.
 def get_k_smallest_pow2k_greater_than_n(n):
 
-    k = 0;
-    while (True):
-
-        current_pow2k_value = math.pow(2, k);
-        if (current_pow2k_value > n):
-            return k;
-        else:
-            k = k + 1;
+    return int(n).bit_length();
 
 
-# Get number of classes based on 2^k rule.
-def get_num_classes(observations):
+# Get number of classes based on 2^k rule (observations being representative ones, if their number is provided).
+def get_num_classes(observations, num_observations=None):
 
-    num_observations = len(observations);
-    min_observation = min(observations);
-    max_observation = max(observations);
+    num_observations = len(observations) if (num_observations is None) else num_observations;
+    unique_observations = numpy.unique(observations); # Sorted array of unique observations only (no duplicate values).
+    min_observation = unique_observations[0];
+    max_observation = unique_observations[-1];
     range_observations = max_observation - min_observation;
     k = get_k_smallest_pow2k_greater_than_n(num_observations);
     
-    observations.sort();
-    observations = shared.setlist(observations); # List of unique observations only (no duplicate values).
-    while (True):
+    while (k > 1):
 
-        if (k == 1):
-            return k;
-        
         num_classes = k;
         width_class = int(range_observations / num_classes) + 1;
-        #width_class = int(round((range_observations/num_classes)));
         num_classes = num_classes + 1;
 
-        include_classes = [False] * num_classes; # List where each index signifies whether or not to include class i.
-        for i in range(0, num_classes): # For each class...
-
-            start = min_observation + (i * width_class);
-            end = start + width_class;
-
-            for o in observations: # For each unique observation...
-                if (    o >= start
-                        and o < end): # If observation o is in class i...
-                    include_classes[i] = True; # Mark class i as includable.
-                    break;
-
-        if (False in include_classes): # If any class shall not be included...
-            k = k - 1; # Try smaller value of k.
-        else:
+        class_indices = ((unique_observations - min_observation) // width_class).astype('int64'); # Class of each unique observation.
+        if (numpy.bincount(class_indices, minlength=num_classes)[:num_classes].all()): # If every class holds some observation...
             return k;
+        else:
+            k = k - 1; # Try smaller value of k.
 
     return k;
 
@@ -698,13 +1468,12 @@ def rangify(x, begin, end):
         return x;
 
 
-# Get feature observations classifications DataFrame, each class based on user-provided specifications.
-def get_userdefined_classes_df(feature, project_feature_vectors_df):
+# Get feature observations classifications DataFrame, each class based on user-provided specifications (observations being representative ones, if their number is provided).
+def get_userdefined_classes_df(feature, observations, num_observations=None):
     
-    observations = project_feature_vectors_df[feature].tolist(); # Get feature values.
-    num_observations = len(observations);
-    min_observation = min(observations);
-    max_observation = max(observations);
+    num_observations = len(observations) if (num_observations is None) else num_observations;
+    min_observation = observations.min();
+    max_observation = observations.max();
     range_observations = max_observation - min_observation; # Calc width of range of observations.
 
     min_num_classes = 1;
@@ -723,24 +1492,16 @@ def get_userdefined_classes_df(feature, project_feature_vectors_df):
         num_classes = int(range_observations / width_class);
         num_classes = num_classes + 1; # Do this for safety.
     else:
-        num_classes = get_num_classes(observations);
+        num_classes = get_num_classes(observations, num_observations);
         width_class = int(range_observations / num_classes);
         width_class = rangify(width_class, min_width_class, max_width_class);
         num_classes = num_classes + 1; # Do this for safety.
 
-    row_labels = [r for r in range(0, num_classes)];
-    COLUMN_LABELS = ['>=', '<'];
-    df = pandas.DataFrame(index=row_labels, columns=COLUMN_LABELS);
-    df.fillna(0.0);
-    
     # For each class, define start (inclusive) and end (non-inclusive) values.
-    for i in range(0, num_classes):
-
-        start = min_observation + (i * width_class);
-        end = start + width_class;
-        df.iloc[i]['>='] = start;
-        df.iloc[i]['<'] = end;
+    starts = min_observation + (numpy.arange(num_classes) * width_class);
 
+    df = pandas.DataFrame(collections.OrderedDict([('>=', starts),
+                                                   ('<' , starts + width_class)]));
     df = df.drop_duplicates(); # Eliminate duplicate DataFrame rows.
     df = df.reset_index(drop=True); # Reset DataFrame row indices.
 
@@ -748,125 +1509,74 @@ def get_userdefined_classes_df(feature, project_feature_vectors_df):
 
 
 # Get particular feature observations classifications DataFrame (depending).
-def get_classes_df(feature, project_feature_vectors_df, use_singleunitwide_classes=True):
+def get_classes_df(feature, observations, use_singleunitwide_classes=True, num_observations=None):
 
     if (use_singleunitwide_classes):
-        df = get_singleunitwide_classes_df(feature, project_feature_vectors_df);
+        df = get_singleunitwide_classes_df(feature, observations);
     else:
-        df = get_userdefined_classes_df(feature, project_feature_vectors_df);
+        df = get_userdefined_classes_df(feature, observations, num_observations);
 
     return df;
 
 
-# Get preliminary feature observations frequency distribution DataFrame.
-def get_frequency_distribution_df(feature, project_feature_vectors_df, classes_df):
+# Get preliminary feature observations frequency distribution DataFrame (from sorted array of feature observations, or of distinct ones along with numbers of observations up to each).
+# Each class's observations form a contiguous slice of the sorted array, bounded via binary search.
+def get_frequency_distribution_df(feature, observations, classes_df, cumulative_counts=None):
    
     classes_df = classes_df.sort_values(by=['>=']); # Sort DataFrame rows by class begin-value.
     classes_df = classes_df.reset_index(drop=True); # Reset DataFrame row indices.
+
+    if (cumulative_counts is None): # Each observation counts once...
+        cumulative_counts = numpy.arange(1, len(observations) + 1);
+    cumulative_counts = numpy.concatenate([[0], cumulative_counts]); # (Number of observations before each index.)
     
-    num_projects = project_feature_vectors_df.shape[0];
-    
-    num_classes = classes_df.shape[0];
-    
-    row_labels = [r for r in range(0, num_classes)];
-    COLUMN_LABELS = [feature,
-                     '>=',
-                     '<',
-                     'frequency',
-                     'cumulative_frequency',
-                     'percentage',
-                     'cumulative_percentage'];
-    df = pandas.DataFrame(index=row_labels, columns=COLUMN_LABELS);
-    df = df.fillna(0.0);
-    
-    drop_indices = list(); # Keep track of which DataFrame rows (by indices) are not necessary in df.
-    for i in range(0, num_classes): # For each interval...
-        
-        feature_class = classes_df.iloc[i];
-        df.iloc[i]['>='] = feature_class['>='];
-        df.iloc[i]['<']  = feature_class['<'];
-        
-        relevant_project_feature_vectors = project_feature_vectors_df[(project_feature_vectors_df[feature] >= feature_class['>=']) &
-                                                                      (project_feature_vectors_df[feature] <  feature_class['<'])];
-        
-        if (relevant_project_feature_vectors.empty):
-            drop_indices.append(i);
-        else:
-            num_relevant_projects = relevant_project_feature_vectors.shape[0];
-            for j in range(0, num_relevant_projects): # For each relevant project...
-            
-                relevant_project_feature_vector = relevant_project_feature_vectors.iloc[j]; # Get relevant project feature vector j...
-                observation = relevant_project_feature_vector[feature];
-            
-                df.iloc[i][feature] = observation;
-                
-                frequency = df.iloc[i]['frequency'];
-                df.iloc[i]['frequency'] = frequency + 1;
-                
-                frequencies = [df.iloc[k]['frequency'] for k in range(0, i+1)]; # Get frequency totals (up to and including this one) as a list.
-                df.iloc[i]['cumulative_frequency'] = sum(frequencies);
-                
-                frequency = df.iloc[i]['frequency'];
-                df.iloc[i]['percentage'] = (float(frequency) / float(num_projects)) * 100.0;
-                
-                cumulative_frequency = df.iloc[i]['cumulative_frequency'];
-                df.iloc[i]['cumulative_percentage'] = (float(cumulative_frequency) / float(num_projects)) * 100.0;
-
-    df = df.drop(drop_indices); # Drop DataFrame rows at specified indices.
+    num_projects = cumulative_counts[-1];
+
+    starts = classes_df['>='].values.astype('float64');
+    ends = classes_df['<'].values.astype('float64');
+    begin_indices = numpy.searchsorted(observations, starts, side='left');
+    end_indices = numpy.searchsorted(observations, ends, side='left');
+
+    frequencies = (cumulative_counts[end_indices] - cumulative_counts[begin_indices]).astype('float64');
+    cumulative_frequencies = numpy.cumsum(frequencies); # (Classes without observations add nothing.)
+
+    df = pandas.DataFrame(collections.OrderedDict([(feature                , observations[end_indices - 1]), # (Greatest observation in class.)
+                                                   ('>='                   , starts),
+                                                   ('<'                    , ends),
+                                                   ('frequency'            , frequencies),
+                                                   ('cumulative_frequency' , cumulative_frequencies),
+                                                   ('percentage'           , (frequencies / float(num_projects)) * 100.0),
+                                                   ('cumulative_percentage', (cumulative_frequencies / float(num_projects)) * 100.0)]));
+
+    df = df[frequencies > 0]; # Drop classes without observations.
     df = df.reset_index(drop=True); # Reset DataFrame row indices.
 
     return df;
 
 
 # Get feature frequency distribution DataFrame containing a record (row) or each project.
-def get_feature_frequency_distribution_df(feature, project_feature_vectors_df, use_singleunitwide_classes):
-    
-    project_feature_vectors_df = project_feature_vectors_df.sort_values(by=[feature]); # Ensure DataFrame rows are sorted by feature observations.
-    project_feature_vectors_df = project_feature_vectors_df.reset_index(drop=True); # Reset DataFrame row indices.
+def get_feature_frequency_distribution_df(feature, sorted_project_feature_vectors_df, use_singleunitwide_classes):
     
-    num_projects = project_feature_vectors_df.shape[0];
-    row_labels = [r for r in range(0, num_projects)];
-    COLUMN_LABELS = ['repo_remote_hostname',
-                     'repo_owner',
-                     'repo_name',
-                     'paths_in_repo',
-                     feature,
-                     '>=',
-                     '<',
-                     'frequency',
-                     'cumulative_frequency',
-                     'percentage',
-                     'cumulative_percentage'];
-    df = pandas.DataFrame(index=row_labels, columns=COLUMN_LABELS);
-    df.fillna(0.0);
-    
-    classes_df = get_classes_df(feature, project_feature_vectors_df, use_singleunitwide_classes);
+    project_labels = ['repo_remote_hostname',
+                      'repo_owner',
+                      'repo_name',
+                      'paths_in_repo'];
     
-    frequency_distribution_df = get_frequency_distribution_df(feature, project_feature_vectors_df, classes_df);
+    observations = sorted_project_feature_vectors_df[feature].values.astype('float64'); # (Sorted.)
+
+    classes_df = get_classes_df(feature, observations, use_singleunitwide_classes);
     
-    num_classes = frequency_distribution_df.shape[0];
-    for i in range(0, num_projects): # For each project feature vector...
-        
-        project_summary = project_feature_vectors_df.iloc[i]; # Get project feature vector i.
-        observation = project_summary[feature]; # Get value in project feature.
-        
-        for j in range(0, num_classes): # For each class...
-            
-            feature_class = frequency_distribution_df.iloc[j]; # Get class j.
-            
-            if (    float(observation) >= float(feature_class['>='])
-                    and float(observation) < float(feature_class['<'])   ):
-                df.iloc[i]['repo_remote_hostname']  = project_summary['repo_remote_hostname'];
-                df.iloc[i]['repo_owner']            = project_summary['repo_owner'];
-                df.iloc[i]['repo_name']             = project_summary['repo_name'];
-                df.iloc[i]['paths_in_repo']         = project_summary['paths_in_repo'];
-                df.iloc[i][feature]                 = observation;
-                df.iloc[i]['>=']                    = feature_class['>='];
-                df.iloc[i]['<']                     = feature_class['<'];
-                df.iloc[i]['frequency']             = feature_class['frequency'];
-                df.iloc[i]['cumulative_frequency']  = feature_class['cumulative_frequency'];
-                df.iloc[i]['percentage']            = feature_class['percentage'];
-                df.iloc[i]['cumulative_percentage'] = feature_class['cumulative_percentage'];
+    frequency_distribution_df = get_frequency_distribution_df(feature, observations, classes_df);
+
+    # Assign each project to (last) class whose range holds project feature observation.
+    class_indices = numpy.searchsorted(frequency_distribution_df['>='].values, observations, side='right') - 1;
+    is_classified = (class_indices >= 0) & (observations < frequency_distribution_df['<'].values[class_indices]);
+
+    df = sorted_project_feature_vectors_df[project_labels + [feature]].copy();
+    for column in frequency_distribution_df.columns[1:]: # (Class columns.)
+        df[column] = frequency_distribution_df[column].values[class_indices];
+    if (not is_classified.all()):
+        df.loc[~is_classified] = numpy.nan;
     
     df = df.sort_values(by=[feature]); # Ensure DataFrame rows are sorted by feature observations.
     df = df.reset_index(drop=True); # Reset DataFrame row indices.
@@ -874,6 +1584,48 @@ def get_feature_frequency_distribution_df(feature, project_feature_vectors_df, u
     return df;
 
 
+# Get feature frequency distribution DataFrame containing a record (row) per class (rather than per project), estimated from feature quantile sketch.
+def get_sketched_feature_frequency_distribution_df(feature, sketch, use_singleunitwide_classes):
+
+    (observations, cumulative_counts) = sketch.get_cumulative_counts(); # (Distinct retained observations stand in for all.)
+
+    classes_df = get_classes_df(feature, observations, use_singleunitwide_classes, sketch.num_observations);
+
+    df = get_frequency_distribution_df(feature, observations, classes_df, cumulative_counts);
+
+    return df;
+
+
+# Get number of projects in feature frequency distribution DataFrame (containing a record per project, or per class if approximated).
+def get_num_projects(feature_frequency_distribution_df):
+
+    if ('repo_name' in feature_frequency_distribution_df.columns): # Record per project...
+        return feature_frequency_distribution_df.shape[0];
+    else:
+        return int(round(feature_frequency_distribution_df['frequency'].sum()));
+
+
+# Get list of hover tooltips for feature plot of frequency distribution DataFrame (those for projects, if it contains a record per project, or for classes otherwise).
+def get_feature_plot_tooltips(feature, feature_frequency_distribution_df, class_attribute):
+
+    if ('repo_name' in feature_frequency_distribution_df.columns): # Record per project...
+        return [('repo_remote_hostname', '@repo_remote_hostname'),
+                ('repo_owner', '@repo_owner'),
+                ('repo_name', '@repo_name'),
+                ('paths_in_repo', '@paths_in_repo'),
+                (feature, '@'+feature)];
+    else:
+        return [('>=', '@{>=}'),
+                ('<', '@{<}'),
+                (class_attribute, '@'+class_attribute)];
+
+
+# Get string noting rank error bound for plot titles (if frequency distributions get approximated).
+def get_sketch_error_title_str():
+
+    return (", sketch_error=" + str(args.sketch_error)) if (args.sketch_error is not None) else "";
+
+
 # Process feature cumulative distribution function (CDF) plot.
 def process_feature_cdf_plot(plot, feature_frequency_distribution_df, feature):
         
@@ -899,30 +1651,18 @@ def get_feature_cdf_plot(feature, feature_frequency_distribution_df):
     
     copy_feature_frequency_distribution_df = feature_frequency_distribution_df.copy(); # Use copy to avoid modifying original.
     
-    num_projects = copy_feature_frequency_distribution_df.shape[0];
+    num_projects = get_num_projects(copy_feature_frequency_distribution_df);
     
     num_feature_frequency_distribution = feature_frequency_distribution_df.shape[0];
     
-    num_classes = feature_frequency_distribution_df.shape[0];
-    cumulative_probabilities = list();
-    for i in range(0, num_classes): # Need data for cumulative probability because CDF not in terms of percent...
-
-        feature_frequency_distribution_df_row = feature_frequency_distribution_df.iloc[i];
-
-        cumulative_percentage = float(feature_frequency_distribution_df_row['cumulative_percentage']);
-        cumulative_probability = cumulative_percentage / 100.0;
-        cumulative_probabilities.append(cumulative_probability);
+    cumulative_probabilities = feature_frequency_distribution_df['cumulative_percentage'].values.astype('float64') / 100.0; # Need data for cumulative probability because CDF not in terms of percent...
 
     # Add new column to DataFrame.
     copy_feature_frequency_distribution_df['cumulative_probability'] = cumulative_probabilities;
     
-    hover = bokeh.models.HoverTool(tooltips=[('repo_remote_hostname', '@repo_remote_hostname'),
-                                             ('repo_owner', '@repo_owner'),
-                                             ('repo_name', '@repo_name'),
-                                             ('paths_in_repo', '@paths_in_repo'),
-                                             (feature, '@'+feature)]);
+    hover = bokeh.models.HoverTool(tooltips=get_feature_plot_tooltips(feature, copy_feature_frequency_distribution_df, 'cumulative_probability'));
     
-    plot_title = "Cumulative Distribution Function (N=" + str(num_projects) + ")";
+    plot_title = "Cumulative Distribution Function (N=" + str(num_projects) + get_sketch_error_title_str() + ")";
     
     feature_title = FEATURE_TITLES_DICT[feature];
 
@@ -967,26 +1707,19 @@ def get_feature_histogram_plot(feature, feature_frequency_distribution_df):
     
     copy_feature_frequency_distribution_df = feature_frequency_distribution_df.copy(); # Use copy to avoid modifying original.
     
-    num_projects = copy_feature_frequency_distribution_df.shape[0];
-    bottoms = list();
-    for i in range(0, num_projects): # Need data for bottom sides of histogram bins (y-values)...
-
-        bottoms.append(0);
+    num_projects = get_num_projects(copy_feature_frequency_distribution_df);
+    bottoms = [0] * copy_feature_frequency_distribution_df.shape[0]; # Need data for bottom sides of histogram bins (y-values)...
 
     # Add new column to DataFrame.
     copy_feature_frequency_distribution_df['bottom'] = bottoms;
     
-    hover = bokeh.models.HoverTool(tooltips=[('repo_remote_hostname', '@repo_remote_hostname'),
-                                             ('repo_owner', '@repo_owner'),
-                                             ('repo_name', '@repo_name'),
-                                             ('paths_in_repo', '@paths_in_repo'),
-                                             (feature, '@'+feature)]);
+    hover = bokeh.models.HoverTool(tooltips=get_feature_plot_tooltips(feature, copy_feature_frequency_distribution_df, 'frequency'));
 
     num_classes = len(set(copy_feature_frequency_distribution_df['>='].tolist()));
 
     width_class = int(copy_feature_frequency_distribution_df.iloc[0]['<'] - copy_feature_frequency_distribution_df.iloc[0]['>=']);
 
-    plot_title = "Histogram (N=" + str(num_projects) + ", num_classes=" + str(num_classes) + ", width_class=" + str(width_class) + ")";
+    plot_title = "Histogram (N=" + str(num_projects) + ", num_classes=" + str(num_classes) + ", width_class=" + str(width_class) + get_sketch_error_title_str() + ")";
     
     feature_title = FEATURE_TITLES_DICT[feature];
 
@@ -1007,6 +1740,57 @@ def get_feature_histogram_plot(feature, feature_frequency_distribution_df):
     return plot;
 
 
+# Get feature frequency distribution DataFrames for CDF, histogram, and spreadsheet (in that order).
+def get_feature_frequency_distribution_dfs(feature):
+
+    if (feature_sketches_dict is not None): # Frequency distributions get approximated (a record per class)...
+        sketch = feature_sketches_dict[feature]; # (Shared global.)
+        num_projects = sketch.num_observations;
+        get_df = functools.partial(get_sketched_feature_frequency_distribution_df, feature, sketch);
+    else:
+        num_projects = project_feature_vectors_df.shape[0]; # (Shared global.)
+        sorted_project_feature_vectors_df = get_sorted_project_feature_vectors_df(feature, project_feature_vectors_df); # (Sorted once, for both CDF and histogram.)
+        get_df = functools.partial(get_feature_frequency_distribution_df, feature, sorted_project_feature_vectors_df);
+
+    cdf_feature_frequency_distribution_df = get_df(use_singleunitwide_classes=True);
+
+    if (num_projects > 1):
+        if (    (feature not in width_class_dict)
+                and (feature not in num_classes_dict)   ):
+            histogram_feature_frequency_distribution_df = get_df(use_singleunitwide_classes=False);
+            xlsx_feature_frequency_distribution_df = cdf_feature_frequency_distribution_df;
+        else:
+            if (    (feature in width_class_dict)
+                    and (width_class_dict[feature] == 1)):
+                histogram_feature_frequency_distribution_df = get_df(use_singleunitwide_classes=True);
+            else:
+                histogram_feature_frequency_distribution_df = get_df(use_singleunitwide_classes=False);
+            xlsx_feature_frequency_distribution_df = histogram_feature_frequency_distribution_df;
+    else:
+        histogram_feature_frequency_distribution_df = cdf_feature_frequency_distribution_df;
+        xlsx_feature_frequency_distribution_df = cdf_feature_frequency_distribution_df;
+
+    return (cdf_feature_frequency_distribution_df, histogram_feature_frequency_distribution_df, xlsx_feature_frequency_distribution_df);
+
+
+# Get list of results of applying function to each item, in pool of worker processes (if more than one job), results being in order of items.
+# Function must read its (large) inputs from global variables: workers are forked once these are set, so they share inputs rather than get sent them.
+def map_jobs(function, items):
+
+    num_jobs = min(args.jobs, len(items));
+    if (num_jobs <= 1):
+        return [function(item) for item in items];
+
+    pool = multiprocessing.Pool(num_jobs);
+    try:
+        results = pool.map(function, items, chunksize=1); # (Results are in order of items.)
+    finally:
+        pool.close();
+        pool.join();
+
+    return results;
+
+
 # Construct output filename having provided attributes.
 def construct_output_filename(data_store_location, dirname, desc, ext):
 
@@ -1038,13 +1822,81 @@ def write_dataframes_to_file(dataframes, destination):
     return;
 
 
+# Process analytics for features from project feature vectors, appending feature spreadsheet sheets (project feature vectors first) and plots to lists.
+def process_feature_analytics(features, xlsx_sheets, plots):
+
+    global width_class_dict;
+    global num_classes_dict;
+    global feature_sketches_dict;
+
+    if (project_feature_vectors_df is not None): # (Unless only sketches get merged.)
+        xlsx_sheets.append((project_feature_vectors_df, 'project_feature_vectors', False));
+
+    if (args.sketch_error is not None):
+        feature_sketches_dict = get_feature_sketches_dict(features);
+    
+    width_class_dict = args.width_class;
+    width_class_dict = get_checked_class_configurations_dict(width_class_dict, features, class_configuration_type='width-class');
+    num_classes_dict = args.num_classes;
+    num_classes_dict = get_checked_class_configurations_dict(num_classes_dict, features, class_configuration_type='num-classes');
+
+    sys.stdout.write("\r");
+    sys.stdout.write("Processing analytics for features...");
+    sys.stdout.flush();
+    feature_frequency_distribution_dfs_list = map_jobs(get_feature_frequency_distribution_dfs, features);
+    sys.stdout.write("\r");
+    sys.stdout.write("Processing analytics for features... done.");
+    print('');
+
+    num_features = len(features);
+    for i in range(0, num_features):
+        
+        feature = features[i];
+        (cdf_feature_frequency_distribution_df, histogram_feature_frequency_distribution_df, xlsx_feature_frequency_distribution_df) = feature_frequency_distribution_dfs_list[i];
+
+        feature_cdf_plot = get_feature_cdf_plot(feature, cdf_feature_frequency_distribution_df);
+        plots.append(feature_cdf_plot);
+
+        feature_histogram_plot = get_feature_histogram_plot(feature, histogram_feature_frequency_distribution_df);
+        plots.append(feature_histogram_plot);
+        
+        xlsx_sheets.append((xlsx_feature_frequency_distribution_df, feature, False));
+
+    return;
+
+
+# Write spreadsheet (if there are features) and data visualizations to output files.
+def write_outputs(features, xlsx_sheets, plots):
+
+    xlsx_output_filename = args.spreadsheet;
+    html_output_filename = args.html;
+    
+    print('');
+    
+    # Output qualitative data.
+    if (features):
+        write_dataframes_to_file(xlsx_sheets, xlsx_output_filename);
+        print("Quantitative analytics written to \'"+xlsx_output_filename+"\'.");
+        if (args.sketch_output):
+            write_feature_sketches_dict(feature_sketches_dict, args.sketch_output);
+            print("Feature quantile sketches written to \'"+args.sketch_output+"\'.");
+    
+    # Output visual data.
+    bokeh.plotting.output_file(html_output_filename, title="Projects' Statistics");
+    bokeh.io.save(bokeh.layouts.column(plots));
+    print("Data visualizations written to \'"+html_output_filename+"\'.");
+    print('');
+
+    return;
+
+
 # Driver.
 def main():
     
     global args;
     global data_store_df;
-    global width_class_dict;
-    global num_classes_dict;
+    global commit_records_plot_df;
+    global project_feature_vectors_df;
     
     # Process script configurations ("arguments").
     args = init_args(args);
@@ -1053,123 +1905,118 @@ def main():
     echo_args(args);
     print('');
 
-    commit_records_df = filter_commit_records(data_store_df); # Filter commit records based on time range.
-    commit_records_df.sort_values('committer_unix_timestamp', ascending=False); # (Largest values at top.)
+    if (cached_results_dict is not None):
+        t1 = datetime.datetime.now();
+        commit_records_plot_df = cached_results_dict['commit_records_plot_df'];
+        project_feature_vectors_df = cached_results_dict['project_feature_vectors_df'];
+        has_relevant_commit_records = True; # (Only results for relevant commit records get cached.)
+    elif (args.pushdown):
+        t1 = datetime.datetime.now();
+        sys.stdout.write("\r");
+        sys.stdout.write("Computing project feature vectors within data store...");
+        sys.stdout.flush();
+        project_feature_vectors_df = get_pushed_down_project_feature_vectors_df(args.features);
+        sys.stdout.write("\r");
+        sys.stdout.write("Computing project feature vectors within data store... done in " + str(datetime.datetime.now() - t1));
+        print('');
+        has_relevant_commit_records = (not project_feature_vectors_df.empty);
+    elif (args.cube):
+        t1 = datetime.datetime.now();
+        accumulated_features = [feature for feature in args.features if (feature not in get_activity_cube_features(args.features))]; # (Finer than hours.)
+        project_accumulators_dict = get_project_accumulators_dict(accumulated_features) if accumulated_features else None;
+        has_relevant_commit_records = (not activity_cube_df.empty); # (Activity cube hours fall within time range.)
+    elif (args.out_of_core):
+        t1 = datetime.datetime.now();
+        project_accumulators_dict = get_project_accumulators_dict(args.features);
+        has_relevant_commit_records = bool(project_accumulators_dict);
+    elif (args.stream):
+        t1 = datetime.datetime.now();
+        project_accumulators_dict = get_streamed_project_accumulators_dict(args.features);
+        has_relevant_commit_records = bool(project_accumulators_dict);
+    elif (not args.source): # Only sketches get merged...
+        t1 = datetime.datetime.now();
+        has_relevant_commit_records = any([input_feature_sketches_dict[feature].num_observations for input_feature_sketches_dict in input_feature_sketches_dicts for feature in args.features]);
+    else:
+        commit_records_df = filter_commit_records(data_store_df); # Filter commit records based on time range.
+        commit_records_df.sort_values('committer_unix_timestamp', ascending=False); # (Largest values at top.)
+        t1 = datetime.datetime.now();
+        has_relevant_commit_records = (not commit_records_df.empty);
 
-    t1 = datetime.datetime.now();
-    if (commit_records_df.empty):
+    if (not has_relevant_commit_records):
         print("No relevant commits records to process.");
     else:
         xlsx_sheets = list();
         plots = list();
         
         features = args.features;
-        
-        sys.stdout.write("\r");
-        sys.stdout.write("Identifying projects...");
-        sys.stdout.flush();
-        project_ids_df = get_project_ids_df(commit_records_df);
-        sys.stdout.write("\r");
-        sys.stdout.write("Identifying projects... done.");
-        print('');
-        
-        sys.stdout.write("\r");
-        sys.stdout.write("Processing project commit-patterns data...");
-        sys.stdout.flush();
-        commit_patterns_plot = get_commit_patterns_plot(project_ids_df, commit_records_df);
-        sys.stdout.write("\r");
-        sys.stdout.write("Processing project commit-patterns data... done.");
-        print('');
-        plots.append(commit_patterns_plot);
 
-        project_attributes = PROJECT_ATTRIBUTE_TITLES_DICT.keys();
-        
-        num_project_attributes = len(project_attributes);
-        for i in range(0, num_project_attributes):
-            attribute = project_attributes[i];
-            sys.stdout.write("\r");
-            sys.stdout.write("Processing project data for attribute `" + attribute + "`...");
-            sys.stdout.flush();
-            project_attribute_cumulative_growth_plot = get_project_attribute_cumulative_growth_plot(project_ids_df, commit_records_df, attribute);
-            sys.stdout.write("\r");
-            sys.stdout.write("Processing project data for attribute `" + attribute + "`... done.");
-            print('');
-            plots.append(project_attribute_cumulative_growth_plot);
+        if (    args.source
+                and (not (args.out_of_core or args.pushdown))   ): # (Per-commit plots need all commit records in memory.)
+
+            if (commit_records_plot_df is None): # (Unless cached.)
+                sys.stdout.write("\r");
+                sys.stdout.write("Identifying projects and their cumulative growth...");
+                sys.stdout.flush();
+                commit_records_plot_df = get_commit_records_plot_df(get_activity_cube_commit_records_df(activity_cube_df) if args.cube else commit_records_df); # (Shared by all per-commit plots.)
+                sys.stdout.write("\r");
+                sys.stdout.write("Identifying projects and their cumulative growth... done.");
+                print('');
+
+            if (not args.cube): # (Commit patterns need individual commits.)
+                sys.stdout.write("\r");
+                sys.stdout.write("Processing project commit-patterns data...");
+                sys.stdout.flush();
+                commit_patterns_plot = get_commit_patterns_plot(commit_records_plot_df);
+                sys.stdout.write("\r");
+                sys.stdout.write("Processing project commit-patterns data... done.");
+                print('');
+                plots.append(commit_patterns_plot);
+
+            project_attributes = PROJECT_ATTRIBUTE_TITLES_DICT.keys();
 
-        if (features):
             sys.stdout.write("\r");
-            sys.stdout.write("Generating project feature vectors...");
+            sys.stdout.write("Processing project data for attributes...");
             sys.stdout.flush();
-            project_feature_vectors_df = get_project_feature_vectors_df(features, project_ids_df, commit_records_df);
+            project_attribute_cumulative_growth_dfs_list = map_jobs(get_project_attribute_cumulative_growth_dfs, project_attributes);
             sys.stdout.write("\r");
-            sys.stdout.write("Generating project feature vectors... done.");
+            sys.stdout.write("Processing project data for attributes... done.");
             print('');
 
-            num_projects = project_feature_vectors_df.shape[0];
-            
-            xlsx_sheets.append((project_feature_vectors_df, 'project_feature_vectors', False));
-            
-            width_class_dict = args.width_class;
-            width_class_dict = get_checked_class_configurations_dict(width_class_dict, features, class_configuration_type='width-class');
-            num_classes_dict = args.num_classes;
-            num_classes_dict = get_checked_class_configurations_dict(num_classes_dict, features, class_configuration_type='num-classes');
-
-            num_features = len(features);
-            for i in range(0, num_features):
-                
-                feature = features[i];
+            num_project_attributes = len(project_attributes);
+            for i in range(0, num_project_attributes):
+                attribute = project_attributes[i];
+                project_attribute_cumulative_growth_plot = get_project_attribute_cumulative_growth_plot(attribute, project_attribute_cumulative_growth_dfs_list[i]);
+                plots.append(project_attribute_cumulative_growth_plot);
 
+        if (features):
+            if (    (project_feature_vectors_df is None)
+                    and (args.source or args.stream)   ): # (Unless computed within data store, or cached, or only sketches get merged.)
                 sys.stdout.write("\r");
-                sys.stdout.write("Processing analytics for feature `" + feature + "`...");
+                sys.stdout.write("Generating project feature vectors...");
                 sys.stdout.flush();
-                cdf_feature_frequency_distribution_df = get_feature_frequency_distribution_df(feature, project_feature_vectors_df, use_singleunitwide_classes=True);
-                feature_cdf_plot = get_feature_cdf_plot(feature, cdf_feature_frequency_distribution_df);
-                plots.append(feature_cdf_plot);
-                
-                if (num_projects > 1):
-                    if (    (feature not in width_class_dict)
-                            and (feature not in num_classes_dict)   ):
-                        histogram_feature_frequency_distribution_df = get_feature_frequency_distribution_df(feature, project_feature_vectors_df, use_singleunitwide_classes=False);
-                        xlsx_feature_frequency_distribution_df = cdf_feature_frequency_distribution_df;
-                    else:
-                        if (    (feature in width_class_dict)
-                                and (width_class_dict[feature] == 1)):
-                            histogram_feature_frequency_distribution_df = get_feature_frequency_distribution_df(feature, project_feature_vectors_df, use_singleunitwide_classes=True);
-                        else:
-                            histogram_feature_frequency_distribution_df = get_feature_frequency_distribution_df(feature, project_feature_vectors_df, use_singleunitwide_classes=False);
-                        xlsx_feature_frequency_distribution_df = histogram_feature_frequency_distribution_df;
+                if (args.out_of_core or args.stream):
+                    project_feature_vectors_df = get_accumulated_project_feature_vectors_df(features, project_accumulators_dict);
+                elif (args.cube):
+                    project_feature_vectors_df = get_activity_cube_project_feature_vectors_df(features, project_accumulators_dict);
                 else:
-                    histogram_feature_frequency_distribution_df = cdf_feature_frequency_distribution_df;
-                    xlsx_feature_frequency_distribution_df = cdf_feature_frequency_distribution_df;
-
-                feature_histogram_plot = get_feature_histogram_plot(feature, histogram_feature_frequency_distribution_df);
+                    project_feature_vectors_df = get_project_feature_vectors_df(features, commit_records_df);
                 sys.stdout.write("\r");
-                sys.stdout.write("Processing analytics for feature `" + feature + "`... done.");
+                sys.stdout.write("Generating project feature vectors... done.");
                 print('');
-                plots.append(feature_histogram_plot);
-                
-                xlsx_sheets.append((xlsx_feature_frequency_distribution_df, feature, False));
 
-        xlsx_output_filename = args.spreadsheet;
-        html_output_filename = args.html;
-        
-        print('');
-        
-        # Output qualitative data.
-        if (features):
-            write_dataframes_to_file(xlsx_sheets, xlsx_output_filename);
-            print("Quantitative analytics written to \'"+xlsx_output_filename+"\'.");
-        
-        # Output visual data.
-        bokeh.plotting.output_file(html_output_filename, title="Projects' Statistics");
-        bokeh.io.save(bokeh.layouts.column(plots));
-        print("Data visualizations written to \'"+html_output_filename+"\'.");
-        print('');
+            process_feature_analytics(features, xlsx_sheets, plots);
+
+        if (    args.cache
+                and (cached_results_dict is None)   ):
+            write_cached_results_dict({'commit_records_plot_df': commit_records_plot_df, # (Holds cumulative growth series, too.)
+                                       'project_feature_vectors_df': project_feature_vectors_df}, cache_dirname);
+
+        write_outputs(features, xlsx_sheets, plots);
     
     t2 = datetime.datetime.now();
     t = t2 - t1;
     print("Execution complete: done in " + str(t));
 
 
-main();
-
+if (__name__ == '__main__'): # (So that tests and benchmarks can import its functions.)
+    main();
@@ -0,0 +1,271 @@
+#!/usr/bin/python
+
+
+import argparse; # Script arguments.
+import datetime; # Datetime handling.
+import heapq; # K-way merge of sorted commit records.
+import modules.shared as shared; # Custom, shared functionality.
+import os; # File system handling.
+import pandas; # DataFrame handling.
+import sys; # Script name, termination.
+
+
+### Global Variables ###
+
+script_name = os.path.basename(os.path.splitext(sys.argv[0])[0]); # Name of this Python script (minus '.py').
+
+args = argparse.ArgumentParser(); # Script arguments object.
+
+source_data_store_source_dicts = list(); # Source data store source dicts.
+
+output_data_store_source_dict = dict(); # Destination data store source dict.
+
+source_data_stores = list(); # Source data store objects.
+
+output_data_store = None; # Destination data store object.
+
+
+# Initialize script arguments object.
+def init_args(argparser):
+
+    argparser.add_argument('-s', '--sources', help="list of source data stores of commit records to be migrated (merged, if more than one)", type=str);
+    argparser.add_argument('-a', '--anonymize', help="enforce anonymization on migrated commit records", action='store_true');
+    argparser.add_argument('-o', '--output', help="destination data store for migrated commit records", type=str);
+    argparser.add_argument('--batch-size', help="number of commit records to migrate per batch", type=int);
+
+    return argparser.parse_args();
+
+
+# Check script arguments.
+def check_args(args):
+
+    global source_data_store_source_dicts;
+    global output_data_store_source_dict;
+    global source_data_stores;
+    global output_data_store;
+
+    print("Checking script arguments...");
+
+    # Source data stores.
+    args.sources = shared.get_unique_items_from_str(args.sources, ';');
+    if (not args.sources):
+        sys.exit("Must specify at least one data store source.");
+    for source in args.sources:
+        source_data_store_source_dict = shared.parse_data_store_source(source);
+        source_data_store = shared.get_data_store(source_data_store_source_dict);
+        if (not source_data_store):
+            sys.exit("Could not connect to data store source \'" + source + "\'.");
+        if (not source_data_store.has_data_store_schema()):
+            sys.exit("Bad data store source \'" + source + "\'.");
+        source_data_store_source_dicts.append(source_data_store_source_dict);
+        source_data_stores.append(source_data_store);
+
+    # Destination data store.
+    if (args.output):
+        output_data_store_source_dict = shared.parse_data_store_source(args.output);
+        if (output_data_store_source_dict in source_data_store_source_dicts):
+            sys.exit("Destination data store must differ from source data stores.");
+        uri = output_data_store_source_dict['uri'];
+        if (shared.is_filenameish(uri)):
+            if (not shared.is_writable_file(uri)): # If destination data store is not cleared for writing...
+                sys.exit("Not proceeding.");
+        output_data_store = shared.get_data_store(output_data_store_source_dict, create=True);
+        if (not output_data_store):
+            sys.exit("Could not connect to data store source \'" + args.output + "\'.");
+        if (output_data_store.count()): # Existing commit records (if any) get replaced...
+            if (    (not shared.is_filenameish(uri))
+                    and (not shared.confirm("Collection \'"+output_data_store_source_dict['collection']+"\' already exists! Overwrite? "))    ): # (File overwrite was already confirmed.)
+                sys.exit("Not proceeding.");
+            output_data_store.clear();
+    else:
+        sys.exit("Must specify a destination data store.");
+
+    # Batch size.
+    if (args.batch_size is None):
+        args.batch_size = shared.DEFAULT_CHUNKSIZE;
+    elif (args.batch_size <= 0):
+        sys.exit("Batch size must be positive.");
+
+    return args;
+
+
+# Write script argument configurations to stdout.
+def echo_args(args):
+
+    num_sources = len(source_data_stores);
+    for i in range(0, num_sources):
+        print("Source data store " + str(i+1) + " of " + str(num_sources) + ": \'" + source_data_store_source_dicts[i]['uri'] + "\' ("+source_data_stores[i].get_db_info_str()+")");
+    print("Destination data store: \'" + output_data_store_source_dict['uri'] + "\' ("+output_data_store.get_db_info_str()+")");
+    print("Anonymize: " + str(args.anonymize));
+    print("Batch size: " + str(args.batch_size));
+
+
+# Get throughput string for number of records processed in some time delta.
+def get_throughput_str(num_records, t):
+
+    seconds = t.total_seconds();
+    records_per_second = int(num_records / seconds) if (seconds > 0) else num_records;
+
+    return str(records_per_second) + " records/s";
+
+
+# Write migration progress to stdout.
+def echo_progress(num_records, t1):
+
+    t = datetime.datetime.now() - t1;
+    sys.stdout.write("\r");
+    sys.stdout.write("Migrating commit records: " + str(num_records) + " (" + get_throughput_str(num_records, t) + ")");
+    sys.stdout.flush();
+
+    return;
+
+
+# Write DataFrame of commit records to destination data store (anonymizing them first, if need be).
+def export_df(df):
+
+    if (args.anonymize):
+        df = shared.anonymize_data_store_df(df);
+
+    if (not output_data_store.write_df(df)):
+        sys.exit("Could not write to data store source \'" + args.output + "\'.");
+
+    return;
+
+
+# Iterate over data store commit records as DataFrame chunks (exiting upon any malformed chunk).
+def get_df_chunks(data_store, source, chunksize, sort_by_key=False):
+
+    dfs = data_store.read_df_chunks(chunksize, sort_by_key);
+    while True:
+
+        try:
+            df = next(dfs);
+        except StopIteration:
+            break;
+        except ValueError:
+            sys.exit("Bad data store source \'" + source + "\'.");
+
+        yield df;
+
+
+# Stream commit records from source data store to destination data store (in batches, so that memory stays bounded).
+def migrate_records():
+
+    t1 = datetime.datetime.now();
+    num_records = 0;
+    for df in get_df_chunks(source_data_stores[0], args.sources[0], args.batch_size):
+
+        export_df(df);
+
+        num_records = num_records + df.shape[0];
+        echo_progress(num_records, t1);
+
+    return num_records;
+
+
+# Iterate over data store commit records (as rows), sorted by commit record key.
+def get_sorted_rows(data_store, source_index, chunksize):
+
+    key_indices = [shared.data_store_attributes.index(attribute) for attribute in shared.COMMIT_RECORD_KEY_ATTRIBUTES];
+
+    i = 0; # Number of rows produced.
+    for df in get_df_chunks(data_store, args.sources[source_index], chunksize, sort_by_key=True):
+        for row in shared.get_data_store_df_rows(df):
+            key = tuple([row[j] for j in key_indices]);
+            yield (key, source_index, i, row); # (Source index and row number break ties, so rows themselves never get compared.)
+            i = i + 1;
+
+
+# Get DataFrame from batch of merged rows.
+def get_merged_rows_df(rows):
+
+    df = pandas.DataFrame(rows, columns=shared.data_store_attributes);
+    df['labels'] = [tuple(shared.setlist(labels)) for labels in df['labels']]; # Eliminate duplicate tuple elements in cell values.
+
+    return df;
+
+
+# Stream commit records from source data stores to destination data store, merging those sharing keys (with labels unioned).
+# Sources are read sorted by key and k-way merged, so memory stays bounded by batch size regardless of the number of sources.
+def merge_records():
+
+    labels_index = shared.data_store_attributes.index('labels');
+
+    chunksize = max(1, args.batch_size / len(source_data_stores)); # (Each source holds only its share of a batch in memory.)
+    sorted_rows = heapq.merge(*[get_sorted_rows(source_data_stores[i], i, chunksize) for i in range(0, len(source_data_stores))]);
+
+    t1 = datetime.datetime.now();
+    num_records = 0;
+    rows = list();
+    previous_key = None;
+    for (key, _, _, row) in sorted_rows:
+
+        if (key == previous_key): # Duplicate commit record...
+            rows[-1][labels_index] = rows[-1][labels_index] + row[labels_index];
+            continue;
+
+        if (len(rows) >= args.batch_size): # (Only once previous key has been fully merged.)
+            export_df(get_merged_rows_df(rows));
+            num_records = num_records + len(rows);
+            echo_progress(num_records, t1);
+            rows = list();
+
+        rows.append(row);
+        previous_key = key;
+
+    if (rows):
+        export_df(get_merged_rows_df(rows));
+        num_records = num_records + len(rows);
+        echo_progress(num_records, t1);
+
+    return num_records;
+
+
+# Driver.
+def main():
+
+    global args;
+
+    # Process script configurations ("arguments").
+    args = init_args(args);
+    args = check_args(args);
+    print('');
+    echo_args(args);
+    print('');
+
+    t1 = datetime.datetime.now();
+    if (len(source_data_stores) > 1):
+        num_records = merge_records();
+    else:
+        num_records = migrate_records();
+    t2 = datetime.datetime.now();
+    t = t2 - t1;
+    sys.stdout.write("\r");
+    sys.stdout.write("Migrating commit records: " + str(num_records) + " (" + get_throughput_str(num_records, t) + "), done in " + str(t));
+    print('');
+
+    # Activity cube (which appends do not maintain) gets built once all commit records are in.
+    t3 = datetime.datetime.now();
+    sys.stdout.write("\r");
+    sys.stdout.write("Building activity cube...");
+    sys.stdout.flush();
+    output_data_store.create_activity_cube_if_dne();
+    t4 = datetime.datetime.now();
+    sys.stdout.write("\r");
+    sys.stdout.write("Building activity cube... done in " + str(t4 - t3));
+    print('');
+    print('');
+
+    if (num_records):
+        print("Commit records written to \'"+output_data_store_source_dict['uri']+"\' ("+output_data_store.get_db_info_str()+").");
+    else:
+        print("No commit records written.");
+    print('');
+
+    print("Execution complete: done in " + str(t4 - t1));
+
+    return;
+
+
+if (__name__ == '__main__'): # (So that tests can import its functions.)
+    main();
@@ -2,11 +2,17 @@
 
 
 import ast; # Interpret structure strings literally.
+import bson; # MongoDB document IDs.
 import chardet; # Detect string encoding.
 import collections; # Ordered dictionary.
 import datetime; # Datetime handling.
 import dateutil.parser as dateutil_parser;
+import dateutil.tz; # Time zone handling.
+import errno; # Interrupted system calls.
 import hashlib; # Generate hash from string.
+import itertools; # Slice cursors into chunks.
+import json; # Commit record streams.
+import numpy; # Array handling.
 import os; # File, directory handling.
 import pandas; # DataFrame handling.
 import pymongo; # MongoDB support.
@@ -14,7 +20,15 @@ import subprocess; # Git commands.
 import urlparse; # URI parsing.
 import re; # Regular expressions.
 import requests; # HTTP requests.
+import select; # Wait on commit record streams.
 import sqlite3; # Database processing.
+import stat; # File types.
+import time; # Waiting on commit record streams.
+
+try:
+    import pyarrow.ipc; # Columnar snapshots (optional).
+except ImportError:
+    pyarrow = None;
 
 
 # Name of this Python toolset suite.
@@ -51,14 +65,83 @@ DATA_STORE_ATTRIBUTE_DTYPES = collections.OrderedDict([('repo_remote_hostname',
                                                        ('num_lines_deleted', 'int64'),
                                                        ('num_lines_modified', 'int64')]);
 
+# Data store attributes containing personally identifiable information (PII).
+ANONYMIZABLE_ATTRIBUTES = ['repo_remote_hostname', 'repo_owner', 'repo_name',
+                           'path_in_repo',
+                           'commit_hash',
+                           'author_name', 'author_email',
+                           'committer_name', 'committer_email',
+                           'subject'];
+
+# Anonymizable attributes whose values recur across many commit records (and so are worth remembering once hashed).
+MEMOIZED_ANONYMIZABLE_ATTRIBUTES = ['repo_remote_hostname', 'repo_owner', 'repo_name',
+                                    'path_in_repo',
+                                    'author_name', 'author_email',
+                                    'committer_name', 'committer_email'];
+
+# Data store attributes that identify a commit record.
+COMMIT_RECORD_KEY_ATTRIBUTES = ['repo_remote_hostname', 'repo_owner', 'repo_name',
+                                'path_in_repo',
+                                'commit_hash'];
+
+# Data store attributes of low cardinality (relative to number of commit records), held as categoricals in compact DataFrames.
+COMPACT_CATEGORICAL_ATTRIBUTES = ['repo_remote_hostname', 'repo_owner', 'repo_name',
+                                  'path_in_repo',
+                                  'author_name', 'author_email',
+                                  'committer_name', 'committer_email'];
+
+# Data store attributes that commit record time range filters apply to.
+TIME_RANGE_FILTER_ATTRIBUTES = ['author_unix_timestamp', 'committer_unix_timestamp'];
+
+# Data store attributes that identify a commit within a repo (across paths).
+REPO_COMMIT_ID_ATTRIBUTES = ['repo_remote_hostname', 'repo_owner', 'repo_name',
+                             'commit_hash'];
+
+# Activity cube attributes that identify a row: project path, and UTC hour (since epoch) of commit record timestamps.
+ACTIVITY_CUBE_KEY_ATTRIBUTES = ['repo_remote_hostname', 'repo_owner', 'repo_name',
+                                'path_in_repo',
+                                'unix_hour'];
+
+# Activity cube attributes holding totals per row: commit records (by committer timestamp), those first of their commit within repo,
+# their numbers of lines, and commit records by author timestamp.
+ACTIVITY_CUBE_SUM_ATTRIBUTES = ['num_commits', 'num_repo_commits',
+                                'num_lines_changed', 'num_lines_inserted', 'num_lines_deleted', 'num_lines_modified',
+                                'num_authored_commits'];
+
+SECONDS_PER_HOUR = 3600;
+
+SQLITE_ACTIVITY_CUBE_MIN_VERSION_INFO = (3, 25, 0); # Oldest SQLite library version that activity cube works with (for window functions and upsert clauses).
+
 DEFAULT_MONGODB_URI = 'mongodb://localhost:27017/';
 
+MONGODB_SERVER_TIMEOUT_MS = 1000; # MongoDB server selection timeout in milliseconds.
+
 DEFAULT_DB_NAME = 'data_store';
 
 DEFAULT_DB_COLLECTION_NAME = 'commits';
 
+DEFAULT_CHUNKSIZE = 100000; # Number of commit records per chunk when streaming data stores.
+
+RECORD_STREAM_END_LINE = '{"end_of_stream": true}'; # Line ending newline-delimited JSON commit record stream (so that readers tailing it know when to stop).
+
+RECORD_STREAM_POLL_SECONDS = 1; # Seconds to wait on commit record stream before checking back with reader.
+
 data_store_attributes = DATA_STORE_ATTRIBUTE_DTYPES.keys();
 
+ANONYMIZED_STRS_CACHE_SIZE = 65536; # Bound on number of anonymized strings remembered (beyond which least recently used ones get forgotten).
+
+anonymized_strs_dict = collections.OrderedDict(); # Anonymized strings (keyed by original string, least recently used first), so that recurring values are hashed only once.
+
+data_stores_dict = dict(); # Data store objects (keyed by source), so that each is set up only once.
+
+mongodb_clients_dict = dict(); # Pooled MongoDB clients (keyed by URI).
+
+mongodb_statuses_dict = dict(); # MongoDB connection statuses (keyed by URI).
+
+sqlite_connections_dict = dict(); # SQLite connections (keyed by URI).
+
+sqlite_activity_cube_support = None; # Whether or not SQLite library supports activity cube (None until checked).
+
 
 # Get unique list of items from string given some delimiter.
 def get_unique_items_from_str(input_str, delimiter):
@@ -129,6 +212,12 @@ def get_warning_str(defining_case, action='ignoring'):
     return ("(Warning: " + defining_case + " - " + action + ".)");
     
 
+# Formulate string naming error (type and message).
+def get_error_str(e):
+
+    return type(e).__name__ + ": " + str(e);
+
+
 # Determine working directory for any runtime processing storage.
 def get_wd(directory_str):
     
@@ -250,6 +339,34 @@ def get_anonymized_str(in_str):
     return anonymized_str;
 
 
+# Generate SHA-1 hash string for input string, remembering result for subsequent calls (within bound on number of remembered strings).
+def get_memoized_anonymized_str(in_str):
+
+    anonymized_str = anonymized_strs_dict.pop(in_str, None);
+    if (anonymized_str is None):
+        anonymized_str = get_anonymized_str(in_str);
+        if (len(anonymized_strs_dict) >= ANONYMIZED_STRS_CACHE_SIZE):
+            anonymized_strs_dict.popitem(last=False); # Forget least recently used anonymized string.
+    anonymized_strs_dict[in_str] = anonymized_str; # (Now most recently used.)
+
+    return anonymized_str;
+
+
+# Anonymize PII in data store DataFrame (hashing each distinct value only once).
+def anonymize_data_store_df(df):
+
+    for attribute in ANONYMIZABLE_ATTRIBUTES:
+        
+        values = df[attribute].unique(); # Only distinct values need hashing.
+        if (attribute in MEMOIZED_ANONYMIZABLE_ATTRIBUTES):
+            anonymized_values = [get_memoized_anonymized_str(value) for value in values];
+        else:
+            anonymized_values = [get_anonymized_str(value) for value in values];
+        df[attribute] = df[attribute].map(dict(zip(values, anonymized_values)));
+
+    return df;
+
+
 # Update basepath in URI path.
 def add_path_to_uri(uri, path):
     
@@ -342,6 +459,17 @@ def parse_data_store_source(data_store_source_str):
         return dict();
 
 
+# Determine whether or not URI has characteristics of a filename.
+def is_filenameish(uri):
+
+    path = urlparse.urlparse(uri).path;
+
+    if (path):
+        return True;
+    else:
+        return False;
+
+
 # Determine whether or not filename is an SQLite3 database.
 # Inspired by: https://stackoverflow.com/a/15355790.
 def is_sqlite3(filepath):
@@ -373,29 +501,67 @@ def pandas_dtype_name_to_sqlite_storage_class_name(pandas_dtype_name):
     return '';
 
 
-# Determine whether or not DataFrame has format expected of data store DataFrame.
-def is_data_store_df(df):
+# Get list of data store attributes (all, by default) in data store order.
+def get_data_store_attributes(attributes=None):
+
+    if (attributes is None):
+        return data_store_attributes;
+
+    return [attribute for attribute in data_store_attributes if (attribute in attributes)];
+
+
+# Get empty DataFrame having format expected of data store DataFrame (or of its columns for some attributes).
+def get_empty_data_store_df(attributes=None):
+
+    attributes = get_data_store_attributes(attributes);
+
+    df = pandas.DataFrame(columns=attributes);
+    for attribute in attributes:
+        df[attribute] = pandas.Series(dtype=DATA_STORE_ATTRIBUTE_DTYPES[attribute]);
+
+    return df;
+
+
+# Determine whether or not DataFrame has format expected of data store DataFrame (or of its columns for some attributes).
+def is_data_store_df(df, attributes=None):
+
+    attributes = get_data_store_attributes(attributes);
 
     if (not df.columns.empty):
-        for attribute in data_store_attributes: # Ensure each column name in DataFrame is what is expected in commits data store...
+        for attribute in attributes: # Ensure each column name in DataFrame is what is expected in commits data store...
             if (attribute not in df.columns):
                 return False;
     else:
         return False;
 
-    df_copy = df.copy(); # Use copy to avoid modifying original.
-    df_copy = df_copy[data_store_attributes];
-    
-    if (not df_copy.empty):
+    if (not df.empty):
         
-        data_store_df_skeleton = pandas.DataFrame(columns=data_store_attributes);
-        data_store_dtypes = DATA_STORE_ATTRIBUTE_DTYPES.values();
-        for attribute, dtype_name in zip(data_store_attributes, data_store_dtypes):
-            data_store_df_skeleton[attribute] = pandas.Series(dtype=dtype_name);
-        if (not (df_copy.dtypes.equals(data_store_df_skeleton.dtypes))): # Ensure each column is of the expected dtype.
+        for attribute in attributes: # (Column by column, so that no copy of DataFrame is needed.)
+            column = df[attribute];
+            if (column.dtype.name != DATA_STORE_ATTRIBUTE_DTYPES[attribute]): # Ensure each column is of the expected dtype.
+                return False;
+            if (column.isnull().any()): # If any cells are NULL...
+                return False;
+
+    return True;
+
+
+# Determine whether or not MongoDB document has format expected of data store commit record.
+def is_data_store_document(document, attributes=None):
+
+    PYTHON_TYPES = {'int64' : (int, long),
+                    'float64' : (float,),
+                    'object' : (basestring,)};
+
+    for attribute in get_data_store_attributes(attributes):
+        if (attribute not in document):
             return False;
-        
-        if (df_copy.isnull().values.any()): # If any cells are NULL...
+        value = document[attribute];
+        if (attribute == 'labels'):
+            if (not isinstance(value, list)):
+                return False;
+        elif (    isinstance(value, bool)
+                  or (not isinstance(value, PYTHON_TYPES[DATA_STORE_ATTRIBUTE_DTYPES[attribute]]))   ):
             return False;
 
     return True;
@@ -440,94 +606,1307 @@ def create_sqlite_table_if_dne(table_name, db_connection):
         return False;
 
 
-# Import data from SQLite data store into DataFrame.
-def sqlite_data_store_to_df(uri, table_name):
+# Determine whether or not MongoDB connection is good.
+def is_mongodb(uri):
 
-    try:
-        
-        db_connection = sqlite3.connect(uri);
+    if (uri not in mongodb_statuses_dict): # Only ever probe server once...
+        try:
+            client = get_mongodb_client(uri);
+            client.server_info();
+            mongodb_statuses_dict[uri] = True;
+        except:
+            mongodb_statuses_dict[uri] = False;
 
-        if (create_sqlite_table_if_dne(table_name, db_connection)):
-            
-            table_df = pandas.read_sql_query('SELECT * FROM \"'+table_name+'\";', db_connection);
+    return mongodb_statuses_dict[uri];
 
-            if (is_data_store_df(table_df)):
-                df = table_df.copy(); # Use copy to avoid modifying original.
-                df['labels'] = df['labels'].apply(lambda cell_val: ast.literal_eval(cell_val)); # Interpret cell values (strings) as tuples.
-                return df;
 
-        return pandas.DataFrame();
-    
-    except:
-        
-        return pandas.DataFrame();
+# Get (pooled) MongoDB client for URI, which persists for the process lifetime.
+def get_mongodb_client(uri):
 
+    if (uri not in mongodb_clients_dict):
+        mongodb_clients_dict[uri] = pymongo.MongoClient(uri, serverSelectionTimeoutMS=MONGODB_SERVER_TIMEOUT_MS);
 
-# Determine whether or not MongoDB connection is good.
-def is_mongodb(uri):
+    return mongodb_clients_dict[uri];
 
-    try:
-       
-        SERVER_TIMEOUT = 1; # Server timeout value in seconds.
 
-        client = pymongo.MongoClient(uri, serverSelectionTimeoutMS=SERVER_TIMEOUT);
+# Get (persistent) SQLite connection for URI, which persists for the process lifetime.
+def get_sqlite_connection(uri):
 
-        client.server_info();
+    if (uri not in sqlite_connections_dict):
+        sqlite_connections_dict[uri] = sqlite3.connect(uri);
 
-        client.close();
+    return sqlite_connections_dict[uri];
 
-        return True;
 
-    except:
+# Determine whether or not SQLite library supports activity cube (warning, upon first check, if it does not).
+def has_sqlite_activity_cube_support():
+
+    global sqlite_activity_cube_support;
+
+    if (sqlite_activity_cube_support is None): # Only ever check library version once...
+        sqlite_activity_cube_support = (sqlite3.sqlite_version_info >= SQLITE_ACTIVITY_CUBE_MIN_VERSION_INFO);
+        if (not sqlite_activity_cube_support):
+            print(get_warning_str("SQLite " + sqlite3.sqlite_version + " predates " + '.'.join([str(number) for number in SQLITE_ACTIVITY_CUBE_MIN_VERSION_INFO]) + ", which activity cube needs", action='storing commit records without activity cube'));
+
+    return sqlite_activity_cube_support;
+
+
+# Get list of rows (as lists of native Python values) from data store DataFrame (compact or not).
+def get_data_store_df_rows(df):
+
+    columns = [df[attribute].astype(DATA_STORE_ATTRIBUTE_DTYPES[attribute]).astype('object').values for attribute in data_store_attributes]; # (Object dtype yields native Python values, which database drivers can encode.)
+
+    return [list(row) for row in zip(*columns)];
+
+
+# Get name of narrowest integer dtype that holds all values in array (or None, if not all values are integral).
+def get_narrowest_int_dtype_name(values):
+
+    if (len(values) == 0):
+        return None;
+
+    if (    (values.dtype.kind == 'f')
+            and (not numpy.array_equal(values, numpy.floor(values)))   ):
+        return None;
+
+    (min_value, max_value) = (values.min(), values.max());
+    for dtype_name in ['int8', 'int16', 'int32', 'int64']:
+        iinfo = numpy.iinfo(dtype_name);
+        if (    (min_value >= iinfo.min)
+                and (max_value <= iinfo.max)   ):
+            return dtype_name;
+
+    return None;
+
+
+# Get compact copy of data store DataFrame (columns for any attributes): low-cardinality columns as categoricals,
+# timestamps as integer epoch seconds (if all are whole), and integers in narrowest safe widths.
+# (Data store writes convert columns back to data store dtypes.)
+def get_compact_data_store_df(df):
+
+    columns_dict = collections.OrderedDict();
+    for attribute in df.columns:
+        column = df[attribute];
+        if (attribute in COMPACT_CATEGORICAL_ATTRIBUTES):
+            column = column.astype('category');
+        elif (column.dtype.kind in 'if'):
+            dtype_name = get_narrowest_int_dtype_name(column.values);
+            if (dtype_name is not None):
+                column = column.astype(dtype_name);
+        columns_dict[attribute] = column;
+
+    return pandas.DataFrame(columns_dict, columns=df.columns);
+
+
+# Get array of labels cell values converted to another representation (converting each distinct cell value only once).
+def get_converted_labels(labels, conversion):
+
+    (codes, values) = pandas.factorize(labels); # (Distinct labels are few relative to commit records.)
+
+    converted_values = numpy.empty(len(values), dtype='object');
+    for i in range(0, len(values)):
+        converted_values[i] = conversion(values[i]);
+
+    return converted_values.take(codes);
+
+
+# Get array of hashes (as unsigned 64-bit integers) of DataFrame rows over some attributes (all columns, by default).
+# Labels cell values get hashed as tuples (each distinct one only once), so no string round-trip (nor DataFrame copy) is needed.
+def get_data_store_df_row_hashes(df, attributes=None):
+
+    attributes = df.columns if (attributes is None) else attributes;
+
+    row_hashes = numpy.zeros(df.shape[0], dtype='uint64');
+    for attribute in attributes:
+        if (attribute == 'labels'):
+            (codes, values) = pandas.factorize(df['labels']);
+            column_hashes = numpy.array([hash(tuple(value)) for value in values], dtype='int64').view('uint64').take(codes);
+        else:
+            column_hashes = pandas.util.hash_pandas_object(df[attribute], index=False).values; # (Handles categoricals, too.)
+        row_hashes = (row_hashes * numpy.uint64(1000003)) ^ column_hashes; # Combine column hashes. (Overflow wraps around.)
+
+    return row_hashes;
+
+
+# Get DataFrame having duplicate commit records (by key) merged, with labels of merged records unioned.
+def merge_data_store_df_duplicate_keys(df):
+
+    if (not df.duplicated(subset=COMMIT_RECORD_KEY_ATTRIBUTES).any()):
+        return df;
+
+    key_labels_dict = dict();
+    for (key, labels) in zip(df[COMMIT_RECORD_KEY_ATTRIBUTES].itertuples(index=False), df['labels']):
+        key_labels_dict[key] = key_labels_dict.get(key, tuple()) + tuple(labels);
+
+    df = df.drop_duplicates(subset=COMMIT_RECORD_KEY_ATTRIBUTES); # (Keeps first occurrence of each key.)
+    df = df.reset_index(drop=True); # Reset DataFrame row indices.
+    keys = df[COMMIT_RECORD_KEY_ATTRIBUTES].itertuples(index=False);
+    df['labels'] = [tuple(setlist(key_labels_dict[key])) for key in keys]; # Eliminate duplicate tuple elements in cell values.
+
+    return df;
+
+
+# Get dict of commit record filters (any of which may be None, meaning not to filter by it).
+def get_filters_dict(since=None, until=None, labels=None, all_labels=False):
+
+    return {'since': since, # Unix timestamp that author/committer timestamps may not precede.
+            'until': until, # Unix timestamp that author/committer timestamps may not exceed.
+            'labels': labels, # Labels of which commit records must have at least one (or all, if need be).
+            'all_labels': all_labels}; # Whether or not commit records must have all labels.
+
+
+# Index of labels of commit records (rows), mapping each label to the rows having it.
+# Rows get grouped by their labels tuples (which are few relative to rows), so that any-of and all-of label queries
+# become set operations over those tuples rather than scans over rows.
+class LabelIndex(object):
+
+    def __init__(self, labels_column):
+
+        (self.codes, self.labels_tuples) = pandas.factorize(labels_column); # (Row codes index labels tuples.)
+
+        self.label_codes_dict = dict(); # Sets of codes of labels tuples having label (keyed by label).
+        for code in range(0, len(self.labels_tuples)):
+            for label in self.labels_tuples[code]:
+                self.label_codes_dict.setdefault(label, set()).add(code);
+
+        self.code_rows = None; # Rows (ascending) of each labels tuple (by code), grouped on demand.
+
+    # Get set of codes of labels tuples having any (or all) of labels.
+    def get_codes(self, labels, match_all=False):
+
+        code_sets = [self.label_codes_dict.get(label, set()) for label in labels];
+        if (not code_sets):
+            return set(range(0, len(self.labels_tuples)));
+
+        return set.intersection(*code_sets) if match_all else set.union(*code_sets);
+
+    # Get boolean array indicating which rows have any (or all) of labels.
+    def get_mask(self, labels, match_all=False):
+
+        has_labels = numpy.zeros(len(self.labels_tuples), dtype='bool');
+        has_labels[list(self.get_codes(labels, match_all))] = True;
+
+        return has_labels.take(self.codes);
+
+    # Get array of rows (ascending) having any (or all) of labels.
+    def get_rows(self, labels, match_all=False):
+
+        if (self.code_rows is None):
+            order = numpy.argsort(self.codes, kind='mergesort'); # (Stable, so that rows stay ascending within each labels tuple.)
+            boundaries = numpy.cumsum(numpy.bincount(self.codes, minlength=len(self.labels_tuples)))[:-1];
+            self.code_rows = numpy.split(order, boundaries);
+
+        codes = self.get_codes(labels, match_all);
+        if (not codes):
+            return numpy.array([], dtype='int64');
+
+        rows = numpy.concatenate([self.code_rows[code] for code in codes]);
+        rows.sort();
+
+        return rows;
+
+
+# Get DataFrame having only commit records with at least one (or all) of some labels.
+def filter_data_store_df_labels(df, labels, match_all=False):
+
+    df = df[LabelIndex(df['labels']).get_mask(labels, match_all)];
+    df = df.reset_index(drop=True); # Reset DataFrame row indices.
+
+    return df;
+
+
+# Get string forms that label may take within 'stringified' labels tuples (as stored in SQLite tables).
+def get_sqlite_label_strs(label):
+
+    str_label = label.encode('utf-8') if isinstance(label, unicode) else label;
+    unicode_label = str_label.decode('utf-8', 'replace');
+
+    return setlist([repr(str_label), repr(unicode_label)[1:]]); # (Tuples hold either kind of string, and unicode ones get 'u' prefixes.)
+
+
+# Get name (e.g., 'America/New_York') of local time zone, per TZ environment variable or system configuration (None, if it cannot be determined).
+def get_local_timezone_name():
+
+    timezone_name = os.environ.get('TZ', '').lstrip(':');
+    if (not timezone_name):
+        timezone_name = os.path.realpath('/etc/localtime'); # (Link into time zone database, usually.)
+    if ('/zoneinfo/' in timezone_name):
+        timezone_name = timezone_name.split('/zoneinfo/', 1)[1];
+    elif (timezone_name.startswith('/')):
+        timezone_name = None;
+
+    return timezone_name;
+
+
+# Get array of UTC hours (since epoch) for array of UNIX timestamps (truncated to whole seconds first, as for local datetimes).
+def get_unix_hours(unix_timestamps):
+
+    return numpy.floor_divide(numpy.asarray(unix_timestamps).astype('int64'), SECONDS_PER_HOUR);
+
+
+# Get list of repo commit IDs (tuples of unicode strings, as stored values come back) of commit records in DataFrame.
+def get_repo_commit_ids(df):
+
+    rows = df[REPO_COMMIT_ID_ATTRIBUTES].astype('object').values.tolist();
+
+    return [tuple([(value.decode('utf-8', 'replace') if isinstance(value, str) else value) for value in row]) for row in rows];
+
+
+# Get boolean array indicating which commit records in DataFrame are first of their commit within repo, given set of repo commit IDs already stored.
+def get_repo_first_mask(df, stored_repo_commit_ids):
+
+    repo_commit_ids = set(stored_repo_commit_ids);
+    is_repo_first = numpy.zeros(df.shape[0], dtype='bool');
+    for (i, repo_commit_id) in enumerate(get_repo_commit_ids(df)):
+        if (repo_commit_id not in repo_commit_ids):
+            is_repo_first[i] = True;
+            repo_commit_ids.add(repo_commit_id);
+
+    return is_repo_first;
+
+
+# Get DataFrame of activity cube increments (rows in order of appearance) for DataFrame of commit records new to data store (compact or not).
+# Each commit record counts towards hour of its committer timestamp, and (as authored commit) towards hour of its author timestamp.
+def get_activity_cube_increments_df(df, is_repo_first):
+
+    project_path_attributes = ACTIVITY_CUBE_KEY_ATTRIBUTES[:-1];
+    num_records = df.shape[0];
+    zeros = numpy.zeros(num_records, dtype='int64');
+
+    events_dfs = list();
+    for timestamp_attribute in ['committer_unix_timestamp', 'author_unix_timestamp']: # (Committer-hour events first.)
+        is_committed = (timestamp_attribute == 'committer_unix_timestamp');
+        columns_dict = collections.OrderedDict([(attribute, df[attribute].astype('object').values) for attribute in project_path_attributes]);
+        columns_dict['unix_hour'] = get_unix_hours(df[timestamp_attribute].values);
+        for attribute in ACTIVITY_CUBE_SUM_ATTRIBUTES:
+            if (attribute == 'num_commits'):
+                columns_dict[attribute] = numpy.ones(num_records, dtype='int64') if is_committed else zeros;
+            elif (attribute == 'num_repo_commits'):
+                columns_dict[attribute] = is_repo_first.astype('int64') if is_committed else zeros;
+            elif (attribute == 'num_authored_commits'):
+                columns_dict[attribute] = zeros if is_committed else numpy.ones(num_records, dtype='int64');
+            else: # Numbers of lines...
+                columns_dict[attribute] = df[attribute].values.astype('int64') if is_committed else zeros;
+        events_dfs.append(pandas.DataFrame(columns_dict));
+
+    events_df = pandas.concat(events_dfs); # (Both indexed by commit record.)
+    events_df = events_df.sort_index(kind='mergesort'); # Interleave events, so that rows come in order of appearance.
+
+    return events_df.groupby(ACTIVITY_CUBE_KEY_ATTRIBUTES, sort=False)[ACTIVITY_CUBE_SUM_ATTRIBUTES].sum().reset_index();
+
+
+# Write data store DataFrame to columnar (Arrow) snapshot file, tagged with fingerprint of data store it was taken from.
+def write_data_store_df_snapshot(df, filename, fingerprint):
+
+    (codes, values) = pandas.factorize(df['labels']);
+    df = df.assign(labels=pandas.Categorical.from_codes(codes, categories=[str(tuple(value)) for value in values])); # (Labels strings get dictionary-encoded, so each distinct one is stored once.)
+
+    table = pyarrow.Table.from_pandas(df, preserve_index=False);
+    metadata = dict(table.schema.metadata);
+    metadata['fingerprint'] = fingerprint;
+    table = table.replace_schema_metadata(metadata);
+
+    tmp_filename = filename + '.tmp'; # (Written aside first, so that no reader ever sees partial snapshot.)
+    writer = pyarrow.RecordBatchFileWriter(tmp_filename, table.schema);
+    writer.write_table(table);
+    writer.close();
+    os.rename(tmp_filename, filename);
+
+    return;
+
+
+# Get data store DataFrame (columns for some attributes) from columnar (Arrow) snapshot file, memory-mapped (or None, if there is no snapshot matching fingerprint).
+def read_data_store_df_snapshot(filename, fingerprint, attributes=None):
+
+    attributes = get_data_store_attributes(attributes);
+
+    if (    (pyarrow is None)
+            or (not os.path.isfile(filename))   ):
+        return None;
+
+    reader = pyarrow.ipc.open_file(pyarrow.memory_map(filename, 'r'));
+    if (    (reader.schema.metadata.get('fingerprint') != fingerprint)
+            or (not set(attributes).issubset(reader.schema.names))   ): # Stale or insufficient snapshot...
+        return None;
+
+    table = reader.read_all(); # (Zero-copy, as file is memory-mapped.)
+    table = table.drop([name for name in table.schema.names if (name not in attributes)]);
+    df = table.to_pandas(split_blocks=True)[attributes]; # (Split blocks, so that numeric columns need not be consolidated by copying.)
+    if ('labels' in attributes):
+        df['labels'] = get_converted_labels(df['labels'], ast.literal_eval); # Interpret (distinct) labels strings as tuples.
+    if (not is_data_store_df(df, attributes)):
+        return None;
+
+    return df;
+
+
+# Write data store DataFrame to newline-delimited JSON commit record stream (one document per commit record), flushing so that readers get commit records right away.
+def write_record_stream_df(stream, df):
+
+    for row in get_data_store_df_rows(df):
+        stream.write(json.dumps(collections.OrderedDict(zip(data_store_attributes, row))) + '\n'); # (Labels tuples get written as lists.)
+    stream.flush();
+
+    return;
+
+
+# End newline-delimited JSON commit record stream, then close it.
+def close_record_stream(stream):
+
+    stream.write(RECORD_STREAM_END_LINE + '\n');
+    stream.close();
+
+    return;
+
+
+# Get data store DataFrame (columns for some attributes) from list of commit record stream documents (raising ValueError upon any malformed one).
+def get_record_stream_df(documents, attributes=None):
+
+    attributes = get_data_store_attributes(attributes);
+
+    for document in documents:
+        if (not is_data_store_document(document, attributes)):
+            raise ValueError("Malformed commit records in commit record stream.");
+
+    df = pandas.DataFrame([[document[attribute] for attribute in attributes] for document in documents], columns=attributes);
+    for attribute in attributes:
+        df[attribute] = df[attribute].astype(DATA_STORE_ATTRIBUTE_DTYPES[attribute]);
+    if ('labels' in attributes):
+        df['labels'] = [tuple(labels) for labels in df['labels']]; # Convert cell values (lists) to tuples.
+
+    return df;
+
+
+# Iterate over data store DataFrames (columns for some attributes) of commit records from newline-delimited JSON commit record stream (file descriptor), as they arrive.
+# Regular files get tailed until end-of-stream line; other streams (e.g., pipes) also end once their writers close them.
+# Whenever reader is caught up with stream (or gets interrupted by signal), commit records read so far get produced right away (or None, if there are none), so that caller need not wait on full chunk.
+def read_record_stream_df_chunks(fd, chunksize=DEFAULT_CHUNKSIZE, attributes=None):
+
+    is_tailed = stat.S_ISREG(os.fstat(fd).st_mode);
+
+    documents = list();
+    buffered_str = ''; # Partial line read so far.
+    while True:
+
+        try:
+            if (    (not is_tailed)
+                    and (not select.select([fd], [], [], RECORD_STREAM_POLL_SECONDS)[0])   ): # (Regular files are always readable.)
+                data_str = None;
+            else:
+                data_str = os.read(fd, 1 << 16);
+        except (OSError, select.error) as e:
+            if (e.args[0] != errno.EINTR):
+                raise;
+            data_str = None;
+
+        if (data_str == ''): # End of file...
+            if (not is_tailed): # (Writer closed stream.)
+                if (buffered_str.strip() not in ['', RECORD_STREAM_END_LINE]): # (Last line need not end with newline.)
+                    documents.append(json.loads(buffered_str));
+                break;
+            time.sleep(RECORD_STREAM_POLL_SECONDS); # (Writer may not be done.)
+            data_str = None;
+
+        if (data_str is None): # Caught up with stream...
+            if (documents):
+                yield get_record_stream_df(documents, attributes);
+                documents = list();
+            else:
+                yield None;
+            continue;
+
+        lines = (buffered_str + data_str).split('\n');
+        buffered_str = lines.pop();
+        for line in lines:
+            if (line.strip() == RECORD_STREAM_END_LINE):
+                if (documents):
+                    yield get_record_stream_df(documents, attributes);
+                return;
+            if (line.strip()):
+                documents.append(json.loads(line)); # (Raises ValueError upon malformed line.)
+            if (len(documents) >= chunksize):
+                yield get_record_stream_df(documents, attributes);
+                documents = list();
+
+    if (documents):
+        yield get_record_stream_df(documents, attributes);
+
+
+# Data store of commit records.
+class DataStore(object):
+
+    def __init__(self, data_store_source_dict):
+
+        self.uri = data_store_source_dict['uri'];
+        self.database = data_store_source_dict['database'];
+        self.collection = data_store_source_dict['collection'];
+
+    # Get string of info regarding database name and collection name.
+    def get_db_info_str(self):
+
+        return 'TABLE=\''+self.collection+'\'';
+
+    # Determine whether or not data store has schema expected of commit records (without loading them).
+    def has_data_store_schema(self):
 
         return False;
 
+    # Get fingerprint string of data store contents, which changes whenever they (likely) change.
+    def get_fingerprint(self):
 
-# Import data from MongoDB to DataFrame.
-def mongodb_data_store_to_df(uri, db_name, collection_name):
+        return '';
 
-    try:
+    # Get filename of columnar snapshot of data store.
+    def get_snapshot_filename(self):
 
-        df = pandas.DataFrame();
-    
-        client = pymongo.MongoClient(uri);
+        return '';
 
-        db = client[db_name];
+    # Get data store commit records (satisfying filters, if any) as DataFrame (validated chunk by chunk as they are loaded).
+    def read_df(self, filters_dict=None, attributes=None):
 
-        collection = db[collection_name];
+        try:
 
-        collection_df = pandas.DataFrame(list(collection.find()));
+            if (self.has_data_store_schema()):
 
-        if (is_data_store_df(collection_df)):
-            df = collection_df.copy(); # Use copy to avoid modifying original. 
-            df['labels'] = df['labels'].apply(lambda cell_val: tuple(cell_val)); # Convert cell values (lists) to tuples.
-            client.close();
-            return df;
-            
-        client.close();
-        return pandas.DataFrame();
-    
-    except:
+                dfs = list(self.read_df_chunks(filters_dict=filters_dict, attributes=attributes));
+                if (len(dfs) > 1):
+                    return pandas.concat(dfs, ignore_index=True);
+                elif (dfs):
+                    return dfs[0];
+                else:
+                    return get_empty_data_store_df(attributes);
 
-        return pandas.DataFrame();
+            return pandas.DataFrame();
 
+        except:
 
-# Get DataFrame of data store source.
-def get_df_from_data_store_source(data_store_source_dict):
+            return pandas.DataFrame();
 
-    uri = data_store_source_dict['uri'];
-    collection = data_store_source_dict['collection']; # (Shorter variable name.)
-    if (is_sqlite3(uri)):
-        db_info_str = 'TABLE=\''+collection+'\'';
-        df = sqlite_data_store_to_df(uri, collection);
-    elif (is_mongodb(uri)):
-        database = data_store_source_dict['database']; # (Shorter variable name.)
-        db_info_str = 'DATABASE=\''+database+'\', COLLECTION=\''+collection+'\'';
-        df = mongodb_data_store_to_df(uri, database, collection);
-    else:
-        db_info_str = '';
-        df = pandas.DataFrame();
+    # Iterate over data store commit records (satisfying filters, if any) as DataFrame chunks (raising ValueError upon any malformed chunk).
+    # Filters get pushed down into the data store query, so that only qualifying commit records ever leave the data store.
+    # Likewise, only columns for given attributes (all, by default) get loaded.
+    def read_df_chunks(self, chunksize=DEFAULT_CHUNKSIZE, sort_by_key=False, filters_dict=None, attributes=None):
+
+        return iter([]);
+
+    # Get DataFrame of per-project aggregates of commit records (satisfying filters), computed within data store, so that only one row per project leaves it.
+    # Commit records get deduplicated over given attributes (all, by default) first. Projects (and their paths) come in order of appearance.
+    # Columns: project ID attributes, 'paths_in_repo' (tuples), 'num_commit_hashes' (distinct ones), sum attributes (totals), and
+    # names in datetime formats dict (numbers of distinct strftime-formatted author/committer local datetimes, in given time zone or else local one).
+    # (None means data store cannot compute aggregates.)
+    def read_project_aggregates_df(self, project_id_attributes, sum_attributes, datetime_formats_dict, filters_dict=None, attributes=None, timezone_name=None):
+
+        return None;
+
+    # Ensure activity cube exists, building it from commit records stored so far when it does not (upserts then keep it up to date).
+    # Commit records get deduplicated by key (first stored one counting), as upserts do.
+    def create_activity_cube_if_dne(self):
+
+        return;
+
+    # Get DataFrame of activity cube rows (in order of appearance), which upserts maintain alongside commit records.
+    # Columns: activity cube key attributes and sum attributes. (None means data store has no activity cube up to date with its commit records.)
+    def read_activity_cube_df(self):
+
+        return None;
+
+    # Append commit records in DataFrame to data store.
+    def write_df(self, df):
+
+        return False;
+
+    # Add commit records in DataFrame to data store, merging labels into those already stored (by key).
+    def upsert_df(self, df):
+
+        return False;
+
+    # Get number of commit records in data store.
+    def count(self):
+
+        return 0;
+
+    # Remove all commit records from data store.
+    def clear(self):
+
+        return;
+
+
+# SQLite data store of commit records.
+class SQLiteDataStore(DataStore):
+
+    def __init__(self, data_store_source_dict):
+
+        DataStore.__init__(self, data_store_source_dict);
+        self.db_connection = get_sqlite_connection(self.uri);
+        self.table_exists = False;
+        self.has_key_index = False;
+        self.indexed_attributes = set();
+        self.activity_cube_table = self.collection+'_activity';
+        self.activity_cube_exists = False;
+
+    # Ensure data store table exists.
+    def create_table_if_dne(self):
+
+        if (not self.table_exists):
+            self.table_exists = create_sqlite_table_if_dne(self.collection, self.db_connection);
+
+        return self.table_exists;
+
+    # Ensure commit record key index exists in table. (Only upserts need it, so bulk writes are not slowed down by it.)
+    def create_key_index_if_dne(self):
+
+        if (not self.has_key_index):
+            key_attribute_str = ', '.join(['\"'+attribute+'\"' for attribute in COMMIT_RECORD_KEY_ATTRIBUTES]);
+            self.db_connection.execute('CREATE INDEX IF NOT EXISTS \"'+self.collection+'_key\" ON \"'+self.collection+'\" ('+key_attribute_str+');');
+            self.db_connection.commit();
+            self.has_key_index = True;
+
+        return;
+
+    # Ensure index on attribute exists in table. (Created on demand, as queries filtering by attribute need it.)
+    def create_attribute_index_if_dne(self, attribute):
+
+        if (attribute not in self.indexed_attributes):
+            self.db_connection.execute('CREATE INDEX IF NOT EXISTS \"'+self.collection+'_'+attribute+'\" ON \"'+self.collection+'\" (\"'+attribute+'\");');
+            self.db_connection.commit();
+            self.indexed_attributes.add(attribute);
+
+        return;
+
+    # Get SQL WHERE clause (and its parameters) for commit record filters.
+    def get_where_clause(self, filters_dict):
+
+        conditions = list();
+        params = list();
+
+        for attribute in TIME_RANGE_FILTER_ATTRIBUTES:
+            if (filters_dict['since'] is not None):
+                conditions.append('\"'+attribute+'\" >= ?');
+                params.append(filters_dict['since']);
+            if (filters_dict['until'] is not None):
+                conditions.append('\"'+attribute+'\" <= ?');
+                params.append(filters_dict['until']);
+            if ((filters_dict['since'] is not None) or (filters_dict['until'] is not None)):
+                self.create_attribute_index_if_dne(attribute);
+
+        if (filters_dict['labels']): # (No index can serve substring matches, but they spare the rest from being loaded.)
+            label_conditions = list();
+            for label in filters_dict['labels']:
+                label_strs = get_sqlite_label_strs(label);
+                label_conditions.append('('+' OR '.join(['instr(\"labels\", ?) > 0'] * len(label_strs))+')');
+                params.extend(label_strs);
+            conditions.append('('+(' AND ' if filters_dict['all_labels'] else ' OR ').join(label_conditions)+')');
+
+        where_str = ' WHERE '+' AND '.join(conditions) if conditions else '';
+
+        return (where_str, params);
+
+    # Register SQL function telling whether 'stringified' labels tuple satisfies labels filter exactly (parsing each distinct one only once).
+    def create_labels_filter_function(self, filters_dict):
+
+        labels_filter_dict = dict(); # Whether or not labels tuple satisfies filter (keyed by labels string).
+        def labels_filter(labels_str):
+            if (labels_str not in labels_filter_dict):
+                labels = ast.literal_eval(labels_str);
+                matches = [(label in labels) for label in filters_dict['labels']];
+                labels_filter_dict[labels_str] = all(matches) if filters_dict['all_labels'] else any(matches);
+            return labels_filter_dict[labels_str];
+
+        self.db_connection.create_function('labels_filter', 1, labels_filter);
+
+        return;
+
+    # Register SQL function getting UNIX timestamps of local (wall-clock) datetimes in time zone (local one, if None) for UNIX timestamps, so that queries need not rely on process time zone.
+    def create_local_unix_timestamp_function(self, timezone_name):
+
+        timezone = dateutil.tz.gettz(timezone_name) if timezone_name else (dateutil.tz.gettz() or dateutil.tz.tzlocal());
+        utc_epoch_datetime = datetime.datetime(1970, 1, 1, tzinfo=dateutil.tz.tzutc());
+
+        last_conversion = [None, None]; # Last UNIX timestamp converted, along with local one. (Queries convert each timestamp once per datetime format in a row.)
+        def local_unix_timestamp(unix_timestamp):
+            if (unix_timestamp != last_conversion[0]):
+                seconds = int(unix_timestamp); # (Truncated to whole seconds, as for local datetimes in analyzer.)
+                utc_offset = (utc_epoch_datetime + datetime.timedelta(seconds=seconds)).astimezone(timezone).utcoffset();
+                last_conversion[0] = unix_timestamp;
+                last_conversion[1] = seconds + int(utc_offset.total_seconds());
+            return last_conversion[1];
+
+        self.db_connection.create_function('local_unix_timestamp', 1, local_unix_timestamp);
+
+        return;
+
+    # Determine whether or not activity cube table exists.
+    def has_activity_cube_table(self):
+
+        db_cursor = self.db_connection.execute('SELECT name FROM sqlite_master WHERE type=\"table\" AND name=?;', (self.activity_cube_table,));
+
+        return (db_cursor.fetchone() is not None);
+
+    def create_activity_cube_if_dne(self):
+
+        if (not has_sqlite_activity_cube_support()):
+            return;
+
+        if (    (not self.activity_cube_exists)
+                and (not self.has_activity_cube_table())   ):
+
+            get_attribute_str = lambda attributes: ', '.join(['\"'+attribute+'\"' for attribute in attributes]);
+            get_unix_hour_str = lambda attribute: '((CAST(\"'+attribute+'\" AS INTEGER) - ((CAST(\"'+attribute+'\" AS INTEGER) % '+str(SECONDS_PER_HOUR)+') + '+str(SECONDS_PER_HOUR)+') % '+str(SECONDS_PER_HOUR)+') / '+str(SECONDS_PER_HOUR)+')'; # (Floored, even before epoch.)
+            project_path_attribute_str = get_attribute_str(ACTIVITY_CUBE_KEY_ATTRIBUTES[:-1]);
+            line_attributes = [attribute for attribute in ACTIVITY_CUBE_SUM_ATTRIBUTES if (attribute.startswith('num_lines_'))];
+
+            column_str = ', '.join(['\"'+attribute+'\" '+('TEXT' if (attribute in COMMIT_RECORD_KEY_ATTRIBUTES) else 'INTEGER') for attribute in ACTIVITY_CUBE_KEY_ATTRIBUTES+ACTIVITY_CUBE_SUM_ATTRIBUTES]);
+            self.db_connection.execute('CREATE TABLE \"'+self.activity_cube_table+'\" ('+column_str+');');
+            self.db_connection.execute('CREATE UNIQUE INDEX \"'+self.activity_cube_table+'_key\" ON \"'+self.activity_cube_table+'\" ('+get_attribute_str(ACTIVITY_CUBE_KEY_ATTRIBUTES)+');');
+
+            # Deduplicated commit records (taking values of first stored one).
+            records_str = 'SELECT MIN(rowid) AS \"first_rowid\", '+get_attribute_str(COMMIT_RECORD_KEY_ATTRIBUTES+TIME_RANGE_FILTER_ATTRIBUTES+line_attributes)+' FROM main.\"'+self.collection+'\" GROUP BY '+get_attribute_str(COMMIT_RECORD_KEY_ATTRIBUTES);
+            # Committer-hour and author-hour events of commit records (ordered as they appear).
+            is_repo_first_str = '(\"first_rowid\" = MIN(\"first_rowid\") OVER (PARTITION BY '+get_attribute_str(REPO_COMMIT_ID_ATTRIBUTES)+'))';
+            events_str = ('SELECT '+project_path_attribute_str+', '+get_unix_hour_str('committer_unix_timestamp')+' AS \"unix_hour\", 1 AS \"num_commits\", '+is_repo_first_str+' AS \"num_repo_commits\", '+get_attribute_str(line_attributes)+', 0 AS \"num_authored_commits\", 2*\"first_rowid\" AS \"event_order\" FROM \"records\"'
+                          +' UNION ALL SELECT '+project_path_attribute_str+', '+get_unix_hour_str('author_unix_timestamp')+', 0, 0, '+', '.join(['0'] * len(line_attributes))+', 1, 2*\"first_rowid\"+1 FROM \"records\"');
+            sum_str = ', '.join(['SUM(\"'+attribute+'\")' for attribute in ACTIVITY_CUBE_SUM_ATTRIBUTES]);
+            self.db_connection.execute('INSERT INTO \"'+self.activity_cube_table+'\" ('+get_attribute_str(ACTIVITY_CUBE_KEY_ATTRIBUTES+ACTIVITY_CUBE_SUM_ATTRIBUTES)+') WITH \"records\" AS ('+records_str+') SELECT '+get_attribute_str(ACTIVITY_CUBE_KEY_ATTRIBUTES)+', '+sum_str+' FROM ('+events_str+') GROUP BY '+get_attribute_str(ACTIVITY_CUBE_KEY_ATTRIBUTES)+' ORDER BY MIN(\"event_order\");'); # (Rows get inserted in order of appearance.)
+            self.db_connection.commit();
+
+        self.activity_cube_exists = True;
+
+        return;
+
+    # Get set of repo commit IDs of stored commit records sharing commits with those in DataFrame.
+    def get_stored_repo_commit_ids(self, df):
+
+        lookup_attributes = REPO_COMMIT_ID_ATTRIBUTES + ['committer_unix_timestamp']; # (Commit records of same commit share committer timestamp, whose index serves lookup.)
+        lookup_attribute_str = ', '.join(['\"'+attribute+'\"' for attribute in lookup_attributes]);
+        self.db_connection.execute('CREATE TEMP TABLE IF NOT EXISTS \"activity_commits\" ('+lookup_attribute_str+');');
+        self.db_connection.execute('DELETE FROM \"activity_commits\";');
+        placeholder_str = ', '.join(['?'] * len(lookup_attributes));
+        self.db_connection.executemany('INSERT INTO \"activity_commits\" VALUES ('+placeholder_str+');', df[lookup_attributes].astype('object').values.tolist());
+        join_str = ' AND '.join(['t.\"'+attribute+'\" = k.\"'+attribute+'\"' for attribute in lookup_attributes]);
+        repo_commit_select_str = ', '.join(['t.\"'+attribute+'\"' for attribute in REPO_COMMIT_ID_ATTRIBUTES]);
+        db_cursor = self.db_connection.execute('SELECT DISTINCT '+repo_commit_select_str+' FROM \"activity_commits\" k JOIN main.\"'+self.collection+'\" t ON '+join_str+';');
+
+        return set([tuple(row) for row in db_cursor]);
+
+    # Add DataFrame of increments to activity cube (inserting rows it does not have yet).
+    def add_activity_cube_increments(self, increments_df):
+
+        attributes = ACTIVITY_CUBE_KEY_ATTRIBUTES + ACTIVITY_CUBE_SUM_ATTRIBUTES;
+        attribute_str = ', '.join(['\"'+attribute+'\"' for attribute in attributes]);
+        placeholder_str = ', '.join(['?'] * len(attributes));
+        key_attribute_str = ', '.join(['\"'+attribute+'\"' for attribute in ACTIVITY_CUBE_KEY_ATTRIBUTES]);
+        update_str = ', '.join(['\"'+attribute+'\" = \"'+attribute+'\" + excluded.\"'+attribute+'\"' for attribute in ACTIVITY_CUBE_SUM_ATTRIBUTES]);
+        self.db_connection.executemany('INSERT INTO \"'+self.activity_cube_table+'\" ('+attribute_str+') VALUES ('+placeholder_str+') ON CONFLICT ('+key_attribute_str+') DO UPDATE SET '+update_str+';', increments_df[attributes].astype('object').values.tolist());
+
+        return;
+
+    # Remove activity cube (so that it gets built anew, when next needed).
+    def drop_activity_cube(self):
+
+        self.db_connection.execute('DROP TABLE IF EXISTS \"'+self.activity_cube_table+'\";');
+        self.activity_cube_exists = False;
+
+        return;
+
+    def get_fingerprint(self):
+
+        file_stat = os.stat(self.uri);
+
+        return 'TABLE='+self.collection+';SIZE='+str(file_stat.st_size)+';MTIME='+repr(file_stat.st_mtime);
+
+    def get_snapshot_filename(self):
+
+        return self.uri+'.'+self.collection+'.arrow'; # (Next to SQLite file.)
+
+    def has_data_store_schema(self):
+
+        if (self.create_table_if_dne()):
+
+            db_cursor = self.db_connection.execute('PRAGMA table_info(\"'+self.collection+'\");');
+            declared_types_dict = dict([(row[1], row[2].upper()) for row in db_cursor]); # Declared column types (keyed by column name).
+            for attribute in data_store_attributes:
+                sqlite_storage_class_name = pandas_dtype_name_to_sqlite_storage_class_name(DATA_STORE_ATTRIBUTE_DTYPES[attribute]);
+                if (declared_types_dict.get(attribute) != sqlite_storage_class_name):
+                    return False;
+
+            return True;
+
+        return False;
+
+    def read_df_chunks(self, chunksize=DEFAULT_CHUNKSIZE, sort_by_key=False, filters_dict=None, attributes=None):
+
+        if (self.create_table_if_dne()):
+
+            filters_dict = filters_dict if filters_dict else get_filters_dict();
+            attributes = get_data_store_attributes(attributes);
+            query_attributes = attributes if ((not filters_dict['labels']) or ('labels' in attributes)) else get_data_store_attributes(attributes+['labels']); # (Labels filter gets checked exactly once loaded.)
+            attribute_str = ', '.join(['\"'+attribute+'\"' for attribute in query_attributes]);
+            (where_str, params) = self.get_where_clause(filters_dict);
+            order_str = ' ORDER BY '+', '.join(['\"'+attribute+'\"' for attribute in COMMIT_RECORD_KEY_ATTRIBUTES]) if sort_by_key else ''; # (SQLite sorts on disk if need be.)
+            order_str = order_str if (sort_by_key or (not where_str)) else ' ORDER BY rowid'; # (Keep storage order, even if filters get served by some index.)
+            table_dfs = pandas.read_sql_query('SELECT '+attribute_str+' FROM \"'+self.collection+'\"'+where_str+order_str+';', self.db_connection, params=params, chunksize=chunksize);
+            for df in table_dfs:
+                if (not is_data_store_df(df, query_attributes)):
+                    raise ValueError("Malformed commit records in table \'" + self.collection + "\'.");
+                if ('labels' in query_attributes):
+                    df['labels'] = get_converted_labels(df['labels'], ast.literal_eval); # Interpret cell values (strings) as tuples.
+                if (filters_dict['labels']): # (Substring matches may be inexact.)
+                    df = filter_data_store_df_labels(df, filters_dict['labels'], filters_dict['all_labels']);
+                yield df[attributes] if (query_attributes != attributes) else df;
+
+    def read_project_aggregates_df(self, project_id_attributes, sum_attributes, datetime_formats_dict, filters_dict=None, attributes=None, timezone_name=None):
+
+        if (not self.create_table_if_dne()):
+            return None;
+
+        filters_dict = filters_dict if filters_dict else get_filters_dict();
+        attributes = get_data_store_attributes(attributes);
+        (where_str, params) = self.get_where_clause(filters_dict);
+        if (filters_dict['labels']): # (Substring matches may be inexact, so labels get checked exactly as well.)
+            self.create_labels_filter_function(filters_dict);
+            where_str = where_str + ' AND labels_filter(\"labels\")';
+        self.create_key_index_if_dne(); # (Serves grouping by key attributes, which lead.)
+
+        get_attribute_str = lambda attributes: ', '.join(['\"'+attribute+'\"' for attribute in attributes]);
+        records_attribute_str = get_attribute_str(COMMIT_RECORD_KEY_ATTRIBUTES + [attribute for attribute in attributes if (attribute not in COMMIT_RECORD_KEY_ATTRIBUTES)]);
+        project_id_attribute_str = get_attribute_str(project_id_attributes);
+        records_table = 'temp.\"'+self.collection+'_aggregated_records\"'; # (Temporary table, only ever held by SQLite.)
+
+        # Deduplicated commit records (along with row of first occurrence).
+        self.db_connection.execute('DROP TABLE IF EXISTS '+records_table+';');
+        self.db_connection.execute('CREATE TEMP TABLE '+records_table+' AS SELECT '+records_attribute_str+', MIN(rowid) AS \"first_rowid\" FROM main.\"'+self.collection+'\"'+where_str+' GROUP BY '+records_attribute_str+';', params);
+
+        sum_str = ''.join([', SUM(\"'+attribute+'\") AS \"'+attribute+'\"' for attribute in sum_attributes]);
+        df = pandas.read_sql_query('SELECT '+project_id_attribute_str+', COUNT(DISTINCT \"commit_hash\") AS \"num_commit_hashes\"'+sum_str+' FROM '+records_table+' GROUP BY '+project_id_attribute_str+' ORDER BY MIN(\"first_rowid\");', self.db_connection);
+
+        paths_in_repo_dict = collections.OrderedDict([(tuple(project_id), list()) for project_id in df[project_id_attributes].itertuples(index=False)]);
+        db_cursor = self.db_connection.execute('SELECT '+project_id_attribute_str+', \"path_in_repo\" FROM '+records_table+' GROUP BY '+project_id_attribute_str+', \"path_in_repo\" ORDER BY MIN(\"first_rowid\");');
+        for row in db_cursor:
+            paths_in_repo_dict[tuple(row[:-1])].append(str(row[-1])); # (Cast to string to keep value from registering as unicode.)
+        df.insert(len(project_id_attributes), 'paths_in_repo', [tuple(paths_in_repo) for paths_in_repo in paths_in_repo_dict.values()]);
+
+        if (datetime_formats_dict):
+            datetime_names = datetime_formats_dict.keys();
+            self.create_local_unix_timestamp_function(timezone_name);
+            count_str = ''.join([', COUNT(DISTINCT strftime(?, \"local_unix_timestamp\", \'unixepoch\')) AS \"'+name+'\"' for name in datetime_names]);
+            timestamps_str = 'SELECT '+project_id_attribute_str+', local_unix_timestamp(\"author_unix_timestamp\") AS \"local_unix_timestamp\" FROM '+records_table+' UNION ALL SELECT '+project_id_attribute_str+', local_unix_timestamp(\"committer_unix_timestamp\") FROM '+records_table;
+            datetimes_df = pandas.read_sql_query('SELECT '+project_id_attribute_str+count_str+' FROM ('+timestamps_str+') GROUP BY '+project_id_attribute_str+';', self.db_connection, params=[datetime_formats_dict[name] for name in datetime_names]);
+            df = df.merge(datetimes_df, how='left', on=project_id_attributes); # (Keeps order of projects.)
+
+        self.db_connection.execute('DROP TABLE IF EXISTS '+records_table+';');
+
+        return df;
+
+    def read_activity_cube_df(self):
 
-    return (df, db_info_str);
+        if (    (not self.create_table_if_dne())
+                or (not self.has_activity_cube_table())   ):
+            return None;
 
+        attribute_str = ', '.join(['\"'+attribute+'\"' for attribute in ACTIVITY_CUBE_KEY_ATTRIBUTES+ACTIVITY_CUBE_SUM_ATTRIBUTES]);
+        df = pandas.read_sql_query('SELECT '+attribute_str+' FROM \"'+self.activity_cube_table+'\" ORDER BY rowid;', self.db_connection); # (Rows were inserted in order of appearance.)
+        if (df['num_commits'].sum() != self.count()): # Commit records got written without upserts (e.g., appended, or duplicated)...
+            return None;
+
+        return df;
+
+    # Insert rows (lists of native Python values) into data store table.
+    def insert_rows(self, rows):
+
+        attribute_str = ', '.join(['\"'+attribute+'\"' for attribute in data_store_attributes]);
+        placeholder_str = ', '.join(['?'] * len(data_store_attributes));
+        self.db_connection.executemany('INSERT INTO \"'+self.collection+'\" ('+attribute_str+') VALUES ('+placeholder_str+');', rows);
+
+        return;
+
+    def write_df(self, df):
+
+        try:
+
+            if (self.create_table_if_dne()):
+                self.drop_activity_cube(); # (Appended commit records do not get checked against stored ones, so activity cube gets built anew upon next upsert.)
+                df = df.copy(); # Use copy to avoid modifying original.
+                df['labels'] = get_converted_labels(df['labels'], lambda cell_val: str(tuple(cell_val))); # Interpret cell values as strings (because sqlite does not support tuple structures in cells).
+                self.insert_rows(get_data_store_df_rows(df));
+                self.db_connection.commit();
+                return True;
+
+            return False;
+
+        except sqlite3.Error as e:
+
+            self.db_connection.rollback();
+            print(get_warning_str("Could not write commit records to data store \'" + self.uri + "\' (" + get_error_str(e) + ")", action='rolling back'));
+            return False;
+
+        except: # (Other errors get raised, but not before rolling back, so that pooled connection holds no partial writes.)
+
+            self.db_connection.rollback();
+            raise;
+
+    def upsert_df(self, df):
+
+        try:
+
+            if (not self.create_table_if_dne()):
+                return False;
+            self.create_key_index_if_dne();
+            self.create_attribute_index_if_dne('committer_unix_timestamp'); # (Serves activity cube lookups.)
+            self.create_activity_cube_if_dne(); # (Built from commit records stored so far, if need be.)
+
+            df = merge_data_store_df_duplicate_keys(df);
+
+            stored_repo_commit_ids = self.get_stored_repo_commit_ids(df) if has_sqlite_activity_cube_support() else set();
+
+            # Find stored commit records sharing keys with those in DataFrame.
+            key_attribute_str = ', '.join(['\"'+attribute+'\"' for attribute in COMMIT_RECORD_KEY_ATTRIBUTES]);
+            self.db_connection.execute('CREATE TEMP TABLE IF NOT EXISTS \"upsert_keys\" ('+key_attribute_str+');');
+            self.db_connection.execute('DELETE FROM \"upsert_keys\";');
+            placeholder_str = ', '.join(['?'] * len(COMMIT_RECORD_KEY_ATTRIBUTES));
+            keys = df[COMMIT_RECORD_KEY_ATTRIBUTES].astype('object').values.tolist();
+            self.db_connection.executemany('INSERT INTO \"upsert_keys\" VALUES ('+placeholder_str+');', keys);
+            join_str = ' AND '.join(['t.\"'+attribute+'\" = k.\"'+attribute+'\"' for attribute in COMMIT_RECORD_KEY_ATTRIBUTES]);
+            key_select_str = ', '.join(['t.\"'+attribute+'\"' for attribute in COMMIT_RECORD_KEY_ATTRIBUTES]);
+            db_cursor = self.db_connection.execute('SELECT t.rowid, '+key_select_str+', t.\"labels\" FROM \"'+self.collection+'\" t JOIN \"upsert_keys\" k ON '+join_str+' ORDER BY t.rowid;');
+
+            stored_key_rowids_dict = collections.OrderedDict(); # Stored row IDs (keyed by commit record key).
+            stored_key_labels_dict = dict(); # Stored labels (keyed by commit record key).
+            for row in db_cursor:
+                key = tuple(row[1:-1]);
+                stored_key_rowids_dict.setdefault(key, list()).append(row[0]);
+                stored_key_labels_dict[key] = stored_key_labels_dict.get(key, tuple()) + ast.literal_eval(row[-1]);
+
+            # Merge labels into stored commit records, and insert the rest.
+            new_rows = list();
+            is_new = numpy.zeros(df.shape[0], dtype='bool');
+            for (i, key, labels, row) in zip(range(0, df.shape[0]), keys, df['labels'], get_data_store_df_rows(df)):
+                key = tuple([(value.decode('utf-8', 'replace') if isinstance(value, str) else value) for value in key]); # (Stored values come back as unicode.)
+                if (key in stored_key_rowids_dict):
+                    labels_str = str(tuple(setlist(stored_key_labels_dict[key] + tuple(labels))));
+                    rowids = stored_key_rowids_dict[key];
+                    self.db_connection.execute('UPDATE \"'+self.collection+'\" SET \"labels\" = ? WHERE rowid = ?;', (labels_str, rowids[0]));
+                    self.db_connection.executemany('DELETE FROM \"'+self.collection+'\" WHERE rowid = ?;', [(rowid,) for rowid in rowids[1:]]); # (Duplicates get merged into first stored record.)
+                else:
+                    row[data_store_attributes.index('labels')] = str(tuple(labels));
+                    new_rows.append(row);
+                    is_new[i] = True;
+            self.insert_rows(new_rows);
+
+            # Fold inserted commit records into activity cube (within same transaction).
+            new_df = df[is_new];
+            if (has_sqlite_activity_cube_support()):
+                self.add_activity_cube_increments(get_activity_cube_increments_df(new_df, get_repo_first_mask(new_df, stored_repo_commit_ids)));
+            elif (new_rows): # (Activity cube that a newer SQLite library built would no longer be up to date.)
+                self.drop_activity_cube();
+
+            self.db_connection.commit();
+            return True;
+
+        except sqlite3.Error as e:
+
+            self.db_connection.rollback();
+            print(get_warning_str("Could not upsert commit records into data store \'" + self.uri + "\' (" + get_error_str(e) + ")", action='rolling back'));
+            return False;
+
+        except: # (Other errors get raised, but not before rolling back, so that pooled connection holds no partial writes.)
+
+            self.db_connection.rollback();
+            raise;
+
+    def count(self):
+
+        if (self.create_table_if_dne()):
+            return self.db_connection.execute('SELECT COUNT(*) FROM \"'+self.collection+'\";').fetchone()[0];
+
+        return 0;
+
+    def clear(self):
+
+        self.db_connection.execute('DROP TABLE IF EXISTS \"'+self.collection+'\";');
+        self.drop_activity_cube();
+        self.db_connection.commit();
+        self.table_exists = False;
+        self.has_key_index = False;
+        self.indexed_attributes = set();
+
+        return;
+
+
+# MongoDB data store of commit records.
+class MongoDBDataStore(DataStore):
+
+    def __init__(self, data_store_source_dict):
+
+        DataStore.__init__(self, data_store_source_dict);
+        self.client = get_mongodb_client(self.uri);
+        self.db_collection = self.client[self.database][self.collection];
+        self.has_key_index = False;
+        self.indexed_attributes = set();
+        self.activity_cube_collection = self.client[self.database][self.collection+'_activity'];
+        self.activity_cube_exists = False;
+
+    def get_db_info_str(self):
+
+        return 'DATABASE=\''+self.database+'\', COLLECTION=\''+self.collection+'\'';
+
+    # Ensure commit record key index exists in collection.
+    def create_key_index_if_dne(self):
+
+        if (not self.has_key_index):
+            self.db_collection.create_index([(attribute, pymongo.ASCENDING) for attribute in COMMIT_RECORD_KEY_ATTRIBUTES]);
+            self.has_key_index = True;
+
+        return;
+
+    # Ensure index on attribute exists in collection. (Created on demand, as queries filtering by attribute need it.)
+    def create_attribute_index_if_dne(self, attribute):
+
+        if (attribute not in self.indexed_attributes):
+            self.db_collection.create_index([(attribute, pymongo.ASCENDING)]); # (Multikey index, for array attributes.)
+            self.indexed_attributes.add(attribute);
+
+        return;
+
+    # Get MongoDB query document for commit record filters.
+    def get_query_dict(self, filters_dict):
+
+        query_dict = dict();
+
+        for attribute in TIME_RANGE_FILTER_ATTRIBUTES:
+            range_dict = dict();
+            if (filters_dict['since'] is not None):
+                range_dict['$gte'] = filters_dict['since'];
+            if (filters_dict['until'] is not None):
+                range_dict['$lte'] = filters_dict['until'];
+            if (range_dict):
+                query_dict[attribute] = range_dict;
+                self.create_attribute_index_if_dne(attribute);
+
+        if (filters_dict['labels']):
+            query_dict['labels'] = {('$all' if filters_dict['all_labels'] else '$in'): list(filters_dict['labels'])}; # (Matches documents having all, or any, of the labels.)
+            self.create_attribute_index_if_dne('labels');
+
+        return query_dict;
+
+    def read_project_aggregates_df(self, project_id_attributes, sum_attributes, datetime_formats_dict, filters_dict=None, attributes=None, timezone_name=None):
+
+        filters_dict = filters_dict if filters_dict else get_filters_dict();
+        attributes = get_data_store_attributes(attributes);
+        timezone_name = timezone_name if timezone_name else get_local_timezone_name(); # (Server needs time zone by name.)
+        if (not timezone_name):
+            return None;
+
+        datetime_names = datetime_formats_dict.keys();
+        project_path_attributes = setlist(project_id_attributes + ['path_in_repo']);
+        get_datetime_dict = lambda attribute: {'$add': [datetime.datetime(1970, 1, 1), {'$multiply': ['$'+attribute, 1000]}]}; # (UNIX timestamp as date.)
+        get_project_id = lambda document: tuple([document['_id'][attribute] for attribute in project_id_attributes]);
+
+        # Per project: paths and line totals (over deduplicated commit records).
+        totals_pipeline = [# Commit records satisfying filters (served by indexes).
+                           {'$match': self.get_query_dict(filters_dict)},
+                           # Deduplicated commit records (along with ID of first occurrence).
+                           {'$group': {'_id': dict([(attribute, '$'+attribute) for attribute in attributes]),
+                                       'first_id': {'$min': '$_id'}}},
+                           # Per project path: line totals.
+                           {'$group': dict([('_id', dict([(attribute, '$_id.'+attribute) for attribute in project_path_attributes])),
+                                            ('first_id', {'$min': '$first_id'})]
+                                           + [(attribute, {'$sum': '$_id.'+attribute}) for attribute in sum_attributes])},
+                           {'$sort': {'first_id': pymongo.ASCENDING}}, # (So that paths get pushed in order of appearance.)
+                           # Per project: paths and line totals.
+                           {'$group': dict([('_id', dict([(attribute, '$_id.'+attribute) for attribute in project_id_attributes])),
+                                            ('first_id', {'$min': '$first_id'}),
+                                            ('paths_in_repo', {'$push': '$_id.path_in_repo'})]
+                                           + [(attribute, {'$sum': '$'+attribute}) for attribute in sum_attributes])},
+                           {'$sort': {'first_id': pymongo.ASCENDING}}]; # (Projects in order of appearance.)
+
+        # Per project: numbers of distinct commit hashes and author/committer local datetimes (as formatted).
+        # Distinct values get grouped on (project, value) first and counted afterwards, so that no document ever holds a project's set of values.
+        counts_pipeline = [{'$match': self.get_query_dict(filters_dict)},
+                           # Values of commit records (tagged by name of count they go towards).
+                           {'$project': dict([(attribute, True) for attribute in project_id_attributes]
+                                             + [('values', [{'name': 'num_commit_hashes', 'value': '$commit_hash'}]
+                                                           + [{'name': name, 'value': {'$dateToString': {'format': datetime_formats_dict[name], 'date': get_datetime_dict(attribute), 'timezone': timezone_name}}}
+                                                              for name in datetime_names for attribute in TIME_RANGE_FILTER_ATTRIBUTES])])},
+                           {'$unwind': '$values'},
+                           # Per project and distinct value.
+                           {'$group': {'_id': dict([(attribute, '$'+attribute) for attribute in project_id_attributes]
+                                                   + [('name', '$values.name'), ('value', '$values.value')])}},
+                           # Per project and count: number of distinct values.
+                           {'$group': {'_id': dict([(attribute, '$_id.'+attribute) for attribute in project_id_attributes]
+                                                   + [('name', '$_id.name')]),
+                                       'count': {'$sum': 1}}}];
+
+        counts_dict = dict();
+        for document in self.db_collection.aggregate(counts_pipeline, allowDiskUse=True): # (One document per project and count.)
+            counts_dict[(get_project_id(document), document['_id']['name'])] = document['count'];
+
+        columns = project_id_attributes + ['paths_in_repo', 'num_commit_hashes'] + sum_attributes + datetime_names;
+        rows = list();
+        for document in self.db_collection.aggregate(totals_pipeline, allowDiskUse=True): # (One document per project.)
+            project_id = get_project_id(document);
+            paths_in_repo = tuple([str(path_in_repo) for path_in_repo in document['paths_in_repo']]); # (Cast to string to keep value from registering as unicode.)
+            rows.append(list(project_id) + [paths_in_repo]
+                        + [counts_dict.get((project_id, 'num_commit_hashes'), 0)]
+                        + [document[attribute] for attribute in sum_attributes]
+                        + [counts_dict.get((project_id, name), 0) for name in datetime_names]);
+
+        return pandas.DataFrame(rows, columns=columns);
+
+    # Determine whether or not activity cube collection exists.
+    def has_activity_cube_collection(self):
+
+        return (self.activity_cube_collection.name in self.client[self.database].list_collection_names());
+
+    def create_activity_cube_if_dne(self):
+
+        if (    (not self.activity_cube_exists)
+                and (not self.has_activity_cube_collection())   ):
+
+            project_path_attributes = ACTIVITY_CUBE_KEY_ATTRIBUTES[:-1];
+            line_attributes = [attribute for attribute in ACTIVITY_CUBE_SUM_ATTRIBUTES if (attribute.startswith('num_lines_'))];
+            get_unix_hour_dict = lambda attribute: {'$floor': {'$divide': [{'$trunc': '$records.'+attribute}, SECONDS_PER_HOUR]}}; # (Floored, even before epoch.)
+            get_event_dict = lambda is_authored: dict([(attribute, '$records._id.'+attribute) for attribute in project_path_attributes]
+                                                      + [('unix_hour', get_unix_hour_dict('author_unix_timestamp' if is_authored else 'committer_unix_timestamp')),
+                                                         ('num_commits', {'$literal': 0 if is_authored else 1}),
+                                                         ('num_repo_commits', {'$literal': 0} if is_authored else {'$cond': [{'$eq': ['$records.first_id', '$first_id']}, 1, 0]})]
+                                                      + [(attribute, {'$literal': 0} if is_authored else '$records.'+attribute) for attribute in line_attributes]
+                                                      + [('num_authored_commits', {'$literal': 1 if is_authored else 0}),
+                                                         ('first_id', '$records.first_id'),
+                                                         ('is_authored', {'$literal': is_authored})]);
+
+            pipeline = [{'$sort': {'_id': pymongo.ASCENDING}}, # (So that first stored commit records come first.)
+                        # Deduplicated commit records (taking values of first stored one).
+                        {'$group': dict([('_id', dict([(attribute, '$'+attribute) for attribute in COMMIT_RECORD_KEY_ATTRIBUTES])),
+                                         ('first_id', {'$first': '$_id'})]
+                                        + [(attribute, {'$first': '$'+attribute}) for attribute in TIME_RANGE_FILTER_ATTRIBUTES+line_attributes])},
+                        # Commit records per commit within repo (first stored one of which counts towards repo commits).
+                        {'$group': {'_id': dict([(attribute, '$_id.'+attribute) for attribute in REPO_COMMIT_ID_ATTRIBUTES]),
+                                    'first_id': {'$min': '$first_id'},
+                                    'records': {'$push': '$$ROOT'}}},
+                        {'$unwind': '$records'},
+                        # Committer-hour and author-hour events of commit records.
+                        {'$project': {'_id': False,
+                                      'events': [get_event_dict(False), get_event_dict(True)]}},
+                        {'$unwind': '$events'},
+                        {'$sort': collections.OrderedDict([('events.first_id', pymongo.ASCENDING), ('events.is_authored', pymongo.ASCENDING)])}, # (Events as they appear.)
+                        # Per project path and hour: totals.
+                        {'$group': dict([('_id', dict([(attribute, '$events.'+attribute) for attribute in ACTIVITY_CUBE_KEY_ATTRIBUTES])),
+                                         ('first_id', {'$first': '$events.first_id'}),
+                                         ('is_authored', {'$first': '$events.is_authored'})]
+                                        + [(attribute, {'$sum': '$events.'+attribute}) for attribute in ACTIVITY_CUBE_SUM_ATTRIBUTES])},
+                        {'$sort': collections.OrderedDict([('first_id', pymongo.ASCENDING), ('is_authored', pymongo.ASCENDING)])}]; # (Rows in order of appearance.)
+
+            self.activity_cube_collection.create_index([(attribute, pymongo.ASCENDING) for attribute in ACTIVITY_CUBE_KEY_ATTRIBUTES], unique=True);
+            documents = (dict(document['_id'].items() + [(attribute, int(document[attribute])) for attribute in ACTIVITY_CUBE_SUM_ATTRIBUTES]) for document in self.db_collection.aggregate(pipeline, allowDiskUse=True));
+            documents = (dict(document, unix_hour=int(document['unix_hour'])) for document in documents); # (Floored hours come back as doubles.)
+            while True: # (Inserted in batches, in order, so that document IDs follow order of appearance.)
+                batch = list(itertools.islice(documents, DEFAULT_CHUNKSIZE));
+                if (not batch):
+                    break;
+                self.activity_cube_collection.insert_many(batch, ordered=True);
+
+        self.activity_cube_exists = True;
+
+        return;
+
+    # Get set of repo commit IDs of stored commit records sharing commits with those in DataFrame.
+    def get_stored_repo_commit_ids(self, df):
+
+        committer_unix_timestamps = list(set(df['committer_unix_timestamp'].astype('float64').tolist())); # (Commit records of same commit share committer timestamp, whose index serves lookup.)
+        projection_dict = dict([('_id', False)] + [(attribute, True) for attribute in REPO_COMMIT_ID_ATTRIBUTES]);
+        documents = self.db_collection.find({'committer_unix_timestamp': {'$in': committer_unix_timestamps}}, projection=projection_dict);
+
+        return set([tuple([document[attribute] for attribute in REPO_COMMIT_ID_ATTRIBUTES]) for document in documents]);
+
+    # Add DataFrame of increments to activity cube (inserting documents it does not have yet).
+    def add_activity_cube_increments(self, increments_df):
+
+        update_requests = list();
+        for row in increments_df[ACTIVITY_CUBE_KEY_ATTRIBUTES+ACTIVITY_CUBE_SUM_ATTRIBUTES].astype('object').values.tolist():
+            key_dict = dict(zip(ACTIVITY_CUBE_KEY_ATTRIBUTES, row[:len(ACTIVITY_CUBE_KEY_ATTRIBUTES)]));
+            update_requests.append(pymongo.UpdateOne(key_dict,
+                                                     {'$inc': dict(zip(ACTIVITY_CUBE_SUM_ATTRIBUTES, row[len(ACTIVITY_CUBE_KEY_ATTRIBUTES):])),
+                                                      '$setOnInsert': {'_id': bson.ObjectId()}}, # (Generated here, as for inserted documents, so that document IDs follow order of appearance.)
+                                                     upsert=True));
+        if (update_requests):
+            self.activity_cube_collection.bulk_write(update_requests, ordered=True);
+
+        return;
+
+    # Remove activity cube (so that it gets built anew, when next needed).
+    def drop_activity_cube(self):
+
+        self.activity_cube_collection.drop();
+        self.activity_cube_exists = False;
+
+        return;
+
+    def read_activity_cube_df(self):
+
+        if (not self.has_activity_cube_collection()):
+            return None;
+
+        attributes = ACTIVITY_CUBE_KEY_ATTRIBUTES + ACTIVITY_CUBE_SUM_ATTRIBUTES;
+        projection_dict = dict([('_id', False)] + [(attribute, True) for attribute in attributes]);
+        documents = self.activity_cube_collection.find(projection=projection_dict).sort('_id', pymongo.ASCENDING); # (Document IDs follow order of appearance.)
+        df = pandas.DataFrame([[document[attribute] for attribute in attributes] for document in documents], columns=attributes);
+        if (df['num_commits'].sum() != self.count()): # Commit records got written without upserts (e.g., appended), or not all increments got added...
+            return None;
+
+        return df;
+
+    def get_fingerprint(self):
+
+        documents = list(self.db_collection.find(projection={'_id': True}).sort('_id', pymongo.DESCENDING).limit(1)); # (Document IDs increase as documents get inserted.)
+        max_id_str = str(documents[0]['_id']) if documents else '';
+
+        size = self.client[self.database].command('collstats', self.collection).get('size', 0); # (Changes as labels get merged into existing documents.)
+
+        return 'URI='+self.uri+';COUNT='+str(self.count())+';MAX_ID='+max_id_str+';SIZE='+str(size);
+
+    def get_snapshot_filename(self):
+
+        return './'+TOOLSET_NAME+'-snapshot_'+self.database+'_'+self.collection+'.arrow'; # (In working directory.)
+
+    def has_data_store_schema(self):
+
+        SAMPLE_SIZE = 100; # Number of documents to inspect.
+
+        documents = self.db_collection.aggregate([{'$sample': {'size': SAMPLE_SIZE}},
+                                                  {'$project': {'_id': False}}]);
+        for document in documents:
+            if (not is_data_store_document(document)):
+                return False;
+
+        return True;
+
+    def read_df_chunks(self, chunksize=DEFAULT_CHUNKSIZE, sort_by_key=False, filters_dict=None, attributes=None):
+
+        filters_dict = filters_dict if filters_dict else get_filters_dict();
+        attributes = get_data_store_attributes(attributes);
+        projection_dict = dict([('_id', False)] + [(attribute, True) for attribute in attributes]);
+        cursor = self.db_collection.find(self.get_query_dict(filters_dict), projection=projection_dict, batch_size=chunksize);
+        if (sort_by_key):
+            self.create_key_index_if_dne(); # (So that server need not sort in memory.)
+            cursor = cursor.sort([(attribute, pymongo.ASCENDING) for attribute in COMMIT_RECORD_KEY_ATTRIBUTES]);
+        while True:
+
+            df = self.read_df_chunk(cursor, chunksize, attributes);
+            if (df is None):
+                break;
+
+            yield df;
+
+    # Get DataFrame of next chunk of commit records from cursor (or None, if cursor is exhausted).
+    # Document values get appended straight into typed per-column arrays, so that no list of documents (nor their copies) is ever held.
+    def read_df_chunk(self, cursor, chunksize, attributes):
+
+        columns_dict = collections.OrderedDict([(attribute, numpy.empty(chunksize, dtype=DATA_STORE_ATTRIBUTE_DTYPES[attribute])) for attribute in attributes]);
+        labels_column = columns_dict.get('labels');
+        value_attributes = [attribute for attribute in attributes if (attribute != 'labels')];
+
+        num_documents = 0;
+        for document in itertools.islice(cursor, chunksize):
+            if (not is_data_store_document(document, attributes)): # (Validated as it streams in, as column arrays cannot hold malformed values.)
+                raise ValueError("Malformed commit records in collection \'" + self.collection + "\'.");
+            for attribute in value_attributes:
+                columns_dict[attribute][num_documents] = document[attribute];
+            if (labels_column is not None):
+                labels_column[num_documents] = tuple(document['labels']); # Convert cell values (lists) to tuples.
+            num_documents = num_documents + 1;
+
+        if (not num_documents):
+            return None;
+
+        for attribute in attributes: # Trim column arrays to number of documents read.
+            columns_dict[attribute] = columns_dict[attribute][:num_documents];
+
+        return pandas.DataFrame(columns_dict, columns=attributes);
+
+    # Get list of documents from data store DataFrame.
+    def get_documents(self, df):
+
+        documents = [dict(zip(data_store_attributes, row)) for row in get_data_store_df_rows(df)];
+        for document in documents:
+            document['labels'] = list(document['labels']); # Convert cell values to list structure.
+
+        return documents;
+
+    def write_df(self, df):
+
+        try:
+
+            self.drop_activity_cube(); # (Appended commit records do not get checked against stored ones, so activity cube gets built anew upon next upsert.)
+            documents = self.get_documents(df);
+            if (documents):
+                self.db_collection.insert_many(documents, ordered=False);
+            return True;
+
+        except pymongo.errors.PyMongoError as e:
+
+            print(get_warning_str("Could not write commit records to data store \'" + self.uri + "\' (" + get_error_str(e) + ")"));
+            return False;
+
+    def upsert_df(self, df):
+
+        try:
+
+            self.create_key_index_if_dne();
+            self.create_attribute_index_if_dne('committer_unix_timestamp'); # (Serves activity cube lookups.)
+            self.create_activity_cube_if_dne(); # (Built from commit records stored so far, if need be.)
+
+            stored_repo_commit_ids = self.get_stored_repo_commit_ids(df);
+
+            update_requests = list();
+            for document in self.get_documents(df):
+                key_dict = dict([(attribute, document.pop(attribute)) for attribute in COMMIT_RECORD_KEY_ATTRIBUTES]);
+                labels = document.pop('labels');
+                update_requests.append(pymongo.UpdateOne(key_dict,
+                                                         {'$setOnInsert': document,
+                                                          '$addToSet': {'labels': {'$each': labels}}},
+                                                         upsert=True));
+            if (update_requests):
+                result = self.db_collection.bulk_write(update_requests, ordered=True); # (Ordered, so that labels get merged in order.)
+
+                # Fold inserted commit records into activity cube.
+                new_df = df.iloc[sorted(result.upserted_ids.keys())]; # (Keyed by index of request.)
+                self.add_activity_cube_increments(get_activity_cube_increments_df(new_df, get_repo_first_mask(new_df, stored_repo_commit_ids)));
+            return True;
+
+        except pymongo.errors.PyMongoError as e:
+
+            print(get_warning_str("Could not upsert commit records into data store \'" + self.uri + "\' (" + get_error_str(e) + ")"));
+            return False;
+
+    def count(self):
+
+        return self.db_collection.count_documents({});
+
+    def clear(self):
+
+        self.db_collection.drop();
+        self.drop_activity_cube();
+        self.has_key_index = False;
+        self.indexed_attributes = set();
+
+        return;
+
+
+# Get (persistent) data store object for data store source dict, detecting its backend only once.
+def get_data_store(data_store_source_dict, create=False):
+
+    uri = data_store_source_dict['uri'];
+    key = (uri, data_store_source_dict['database'], data_store_source_dict['collection']);
+    if (key not in data_stores_dict):
+        if (is_filenameish(uri)): # (Easier to check than MongoDB because SQLite file may not exist yet.)
+            if (    is_sqlite3(uri)
+                    or (create and (not os.path.exists(uri)))   ): # (SQLite file gets created on demand, if allowed.)
+                data_stores_dict[key] = SQLiteDataStore(data_store_source_dict);
+            else:
+                return None;
+        elif (is_mongodb(uri)):
+            data_stores_dict[key] = MongoDBDataStore(data_store_source_dict);
+        else:
+            return None;
 
+    return data_stores_dict[key];
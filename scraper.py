@@ -7,11 +7,9 @@ import itertools; # To count items in generator.
 import modules.shared as shared; # Custom, shared functionality.
 import os; # File system handling.
 import pandas; # DataFrame handling.
-import pymongo; # MongoDB support.
 import re; # Regular expressions.
 import subprocess; # Invoke git applications.
 import sys; # Script name, termination.
-import sqlite3; # Database processing.
 import urlparse; # URL parsing.
 
 
@@ -26,14 +24,14 @@ COMMIT_FIELD_LABELS = ['commit_hash',
                        'subject',
                        'patch_str'];
 
-db_info_str = ''; # String of info regarding database name and collection name.
-
 args = argparse.ArgumentParser(); # Script arguments object.
 
-data_store_df = pandas.DataFrame(); # Data store DataFrame.
+data_store = None; # Data store object.
 
 data_store_source_dict = dict(); # Data store source dict.
 
+record_stream = None; # Commit record stream (file) object.
+
 repo_local_path = ''; # Local environment path to repository.
 
 commitssince_timestamp_str = ''; # Commits-since timestamp string.
@@ -59,6 +57,7 @@ def init_args(argparser):
     argparser.add_argument('--since', help="process only commits applied after provided timestamp", type=str);
     argparser.add_argument('--until', help="process only commits applied before provided timestamp", type=str);
     argparser.add_argument('-o', '--output', help="destination data store for resultant commit records", type=str);
+    argparser.add_argument('--stream', help="file or named pipe to also stream resultant commit records into (as newline-delimited JSON), project by project, for analyzer to consume as they are produced", type=str);
     
     return argparser.parse_args();
 
@@ -141,23 +140,11 @@ def get_repo_local_path_sources(sources_str):
     return sources;
  
 
-# Determine whether or not URI has characteristics of a filename.
-def is_filenameish(uri):
-
-
-    path = urlparse.urlparse(uri).path;
-
-    if (path):
-        return True;
-    else:
-        return False;
-
-
 # Check script arguments.
 def check_args(args):
    
     global data_store_source_dict;
-    global data_store_df;
+    global data_store;
     
     print("Checking script arguments...");
     
@@ -188,30 +175,23 @@ def check_args(args):
     if (args.output):
         data_store_source_dict = shared.parse_data_store_source(args.output);
         uri = data_store_source_dict['uri'];
-        if (is_filenameish(uri)):
-            if (shared.is_writable_file(uri)): # If destination data store is cleared for writing...
-                if (os.path.isfile(uri)): # Because might not, in which case there's no need to retrieve DataFrame (if uri refers to SQLite3 source)...
-                    if (shared.is_sqlite3(uri)):
-                        collection = data_store_source_dict['collection'];
-                        df = shared.sqlite_data_store_to_df(uri, collection); # Get existing SQLite db collection as DataFrame.
-                        if (    (df.empty and df.columns.empty)
-                                or (   df.columns.size != len(shared.data_store_attributes)    )   ):
-                            sys.exit("Bad data store source \'" + args.output + "\'.");
-                        else:
-                            data_store_df = df;
-                    elif (shared.is_mongodb(uri)):
-                        pass;
-                    else:
-                        sys.exit("Could not connect to data store source \'" + args.output + "\'.");
-            else:
+        if (shared.is_filenameish(uri)):
+            if (not shared.is_writable_file(uri)): # If destination data store is not cleared for writing...
                 sys.exit("Not proceeding.");
-        elif (shared.is_mongodb(uri)):
-            pass;
-        else:
+        data_store = shared.get_data_store(data_store_source_dict, create=True);
+        if (not data_store):
             sys.exit("Could not connect to data store source \'" + args.output + "\'.");
+        if (not data_store.has_data_store_schema()): # (Checks schema metadata only, so existing commit records need not be loaded.)
+            sys.exit("Bad data store source \'" + args.output + "\'.");
     else:
         uri = './'+shared.TOOLSET_NAME+'-'+script_name+'_data-store_' + file_datetimenow_str + '.db'; # Default data store destination if none specified.
         data_store_source_dict = shared.parse_data_store_source(uri);
+        data_store = shared.get_data_store(data_store_source_dict, create=True);
+
+    # Commit record stream.
+    if (args.stream):
+        if (not shared.is_writable_file(args.stream)): # (Named pipes need no confirmation.)
+            sys.exit("Not proceeding.");
     
     return args;
     
@@ -227,6 +207,8 @@ def echo_args(args):
     print("all repositories: Until: " + args.until);
     print("all commit records: Anonymize: " + str(args.anonymize));
     print("all commit records: Labels: " + str_labels);
+    if (args.stream):
+        print("all commit records: Stream: \'" + args.stream + "\'");
 
 
 # Get repo remote origin URL.
@@ -402,8 +384,7 @@ def get_commit_records_df():
         (commit_groups, commit_groups_copy) = itertools.tee(commit_groups, 2); # Copy the commit groups iter so that we can use the copy to obtain the commits count.
         num_commits = sum(1 for cg in commit_groups_copy); # Obtain the commits count.
         
-        row_labels = [r for r in range(0, num_commits)];
-        df = pandas.DataFrame(index=row_labels, columns=shared.data_store_attributes);
+        commit_records = list(); # Commit records (as rows of values, in order of data store attributes).
         
         t1 = datetime.datetime.now();
         j = 0; # Number of records processed.
@@ -436,35 +417,33 @@ def get_commit_records_df():
             num_lines_changed = num_lines_inserted + num_lines_deleted + num_lines_modified;
         
             if (args.anonymize):
-                path            = shared.get_anonymized_str(path);
+                path            = shared.get_memoized_anonymized_str(path);
                 commit_hash     = shared.get_anonymized_str(commit_hash);
-                author_name     = shared.get_anonymized_str(author_name);
-                author_email    = shared.get_anonymized_str(author_email);
-                committer_name  = shared.get_anonymized_str(committer_name);
-                committer_email = shared.get_anonymized_str(committer_email);
+                author_name     = shared.get_memoized_anonymized_str(author_name);
+                author_email    = shared.get_memoized_anonymized_str(author_email);
+                committer_name  = shared.get_memoized_anonymized_str(committer_name);
+                committer_email = shared.get_memoized_anonymized_str(committer_email);
                 subject         = shared.get_anonymized_str(subject);
             
-            row = df.iloc[i];
-
-            row['repo_remote_hostname']     = repo_remote_hostname;
-            row['repo_owner']               = repo_owner;
-            row['repo_name']                = repo_name;
-            row['path_in_repo']             = path;
-            row['labels']                   = tuple(labels);
-            row['commit_hash']              = commit_hash;
-            row['author_name']              = author_name;
-            row['author_email']             = author_email;
-            row['author_unix_timestamp']    = author_unix_timestamp;
-            row['committer_name']           = committer_name;
-            row['committer_email']          = committer_email;
-            row['committer_unix_timestamp'] = committer_unix_timestamp;
-            row['subject']                  = subject;
-            row['len_subject']              = len_subject;
-            row['num_files_changed']        = len(filenames);
-            row['num_lines_changed']        = num_lines_changed;
-            row['num_lines_inserted']       = num_lines_inserted;
-            row['num_lines_deleted']        = num_lines_deleted;
-            row['num_lines_modified']       = num_lines_modified;
+            commit_records.append([repo_remote_hostname,     # repo_remote_hostname
+                                   repo_owner,               # repo_owner
+                                   repo_name,                # repo_name
+                                   path,                     # path_in_repo
+                                   tuple(labels),            # labels
+                                   commit_hash,              # commit_hash
+                                   author_name,              # author_name
+                                   author_email,             # author_email
+                                   author_unix_timestamp,    # author_unix_timestamp
+                                   committer_name,           # committer_name
+                                   committer_email,          # committer_email
+                                   committer_unix_timestamp, # committer_unix_timestamp
+                                   subject,                  # subject
+                                   len_subject,              # len_subject
+                                   len(filenames),           # num_files_changed
+                                   num_lines_changed,        # num_lines_changed
+                                   num_lines_inserted,       # num_lines_inserted
+                                   num_lines_deleted,        # num_lines_deleted
+                                   num_lines_modified]);     # num_lines_modified
             
             j = j + 1;
             k = float(j) / float(num_commits);
@@ -479,121 +458,41 @@ def get_commit_records_df():
 
         print('');
 
+        df = pandas.DataFrame(commit_records, columns=shared.data_store_attributes);
+        df = shared.get_compact_data_store_df(df); # (Data store writes convert columns back to data store dtypes.)
+
         return df;
     else:
         return pandas.DataFrame();
 
 
-# Update data store DataFrame with project commit records.
-def update_data_store_df(data_store_df, commit_records_df):
-
-    if (data_store_df.empty): # If destination already exists...
-        df = commit_records_df;
-    else:
-        df = pandas.concat([data_store_df, commit_records_df]); # Add project commit records to data store DataFrame.
-        groupby_attributes = list(shared.data_store_attributes); # Work with copy NOT original list.
-        groupby_attributes.remove('labels'); # Exclude attribute 'labels'.
-        df = df.groupby(groupby_attributes).sum(); # Sum 'labels' in grouped rows.
-        df = df.reset_index(); # Reset DataFrame rows indices.
-        df = pandas.DataFrame(df, columns=shared.data_store_attributes); # To enforce original column order.
-        df['labels'] = df['labels'].apply(lambda cell_val: tuple(shared.setlist(cell_val))); # Eliminate duplicate tuple elements in cell values.
-    
-    return df;
-
-
-# Prepare data store DataFrame for export.
-def data_store_df_to_sqlite(data_store_df, uri, table_name):
-
-    try:
-        
-        df = data_store_df.copy(); # Use copy to avoid modifying original.
-
-        df['labels'] = df['labels'].astype('str'); # Interpret cell values as strings (because sqlite does not support tuple structures in cells).
-
-        db_conn = sqlite3.connect(uri);
-        
-        df.to_sql(table_name, db_conn, if_exists='replace', index=False);
-        
-        db_conn.close();
-        
-        return True;
-    
-    except:
-        
-       return False;
-
-
-# Export data store DataFrame to MongoDB.
-def data_store_df_to_mongodb(data_store_df, uri, db_name, collection_name):
-
-    try:
-
-        df = data_store_df.copy(); # Use copy to avoid modifying original.
-        
-        df['labels'] = df['labels'].apply(lambda cell_val: list(cell_val)); # Convert cell values to list structure.
-
-        data_store_dicts_list = df.T.to_dict().values(); # Convert data store DataFrame structure to list of dicts.
-        
-        client = pymongo.MongoClient(uri);
-
-        db = client[db_name];
-
-        collection = db[collection_name];
-
-        collection.insert_many(data_store_dicts_list);
-
-        client.close();
-
-        return True;
-
-    except:
-
-        return False;
-
-
-# Export data store DataFrame to data store object.
-def export_records_to_data_store(data_store_df):
-
-    global db_info_str;
-    global produced_atleast_one_commit_record;
-
-    uri = data_store_source_dict['uri'];
-    collection = data_store_source_dict['collection'];
-    if (    is_filenameish(uri)
-            and (not shared.is_mongodb(uri))): # (SQLite is only other option...)
-        db_info_str = 'TABLE=\''+collection+'\'';
-        data_store_df_to_sqlite(data_store_df, uri, collection);
-    elif (shared.is_mongodb(uri)): # Easier to check if is MongoDB because SQLite file may not exists yet.
-        database = data_store_source_dict['database'];
-        db_info_str = 'DATABASE=\''+database+'\', COLLECTION=\''+collection+'\'';
-        data_store_df_to_mongodb(data_store_df, uri, database, collection);
-
-    produced_atleast_one_commit_record = True;
-
-    return;
-
-
 # Process info for single project.
 def process_project():
 
-    global data_store_df;
+    global produced_atleast_one_commit_record;
 
     commit_records_df = get_commit_records_df();
         
     if (commit_records_df.empty):
         print("No relevant commits found.");
     else:
-        data_store_df = update_data_store_df(data_store_df, commit_records_df);
         sys.stdout.write("\r");
         sys.stdout.write("Exporting commit records into data store...");
         sys.stdout.flush();
         t1 = datetime.datetime.now();
-        export_records_to_data_store(data_store_df);
+        is_exported = data_store.upsert_df(commit_records_df); # Add project commit records to data store (merging labels into those already stored).
+        if (is_exported):
+            produced_atleast_one_commit_record = True;
         t2 = datetime.datetime.now();
         t = t2 - t1;
         sys.stdout.write("\r");
-        sys.stdout.write("Exporting commit records into data store... done in " + str(t));
+        if (is_exported):
+            sys.stdout.write("Exporting commit records into data store... done in " + str(t));
+        else:
+            sys.stdout.write("Exporting commit records into data store... FAILED after " + str(t) + " (commit records of project not written)");
         print('');
+        if (record_stream is not None):
+            shared.write_record_stream_df(record_stream, commit_records_df);
 
 
 # Driver.
@@ -608,6 +507,7 @@ def main():
     global commitssince_timestamp_str;
     global commitsuntil_timestamp_str;
     global path_in_repo;
+    global record_stream;
 
     # Process script configurations ("arguments").
     args = init_args(args);
@@ -615,6 +515,9 @@ def main():
     print('');
     echo_args(args);
     print('');
+
+    if (args.stream):
+        record_stream = open(args.stream, 'w'); # (Named pipe blocks until reader opens it.)
     
     t1 = datetime.datetime.now();
     num_repos = len(args.sources);
@@ -631,9 +534,9 @@ def main():
         remote_origin_url = get_remote_origin_url(repo_local_path);
         repo_remote_hostname, repo_owner, repo_name = shared.get_repo_id(remote_origin_url);
         if (args.anonymize):
-            repo_remote_hostname = shared.get_anonymized_str(repo_remote_hostname);
-            repo_owner           = shared.get_anonymized_str(repo_owner);
-            repo_name            = shared.get_anonymized_str(repo_name);
+            repo_remote_hostname = shared.get_memoized_anonymized_str(repo_remote_hostname);
+            repo_owner           = shared.get_memoized_anonymized_str(repo_owner);
+            repo_name            = shared.get_memoized_anonymized_str(repo_name);
 
         paths = args.paths + source_dict['paths'];
         paths = shared.setlist(paths); # Eliminate duplicates.
@@ -660,9 +563,12 @@ def main():
         
         print('');
 
+    if (record_stream is not None): # (So that analyzer consuming it can finish up.)
+        shared.close_record_stream(record_stream);
+
     uri = data_store_source_dict['uri'];
     if (produced_atleast_one_commit_record):
-        print("Commit records written to \'"+uri+"\' ("+db_info_str+").");
+        print("Commit records written to \'"+uri+"\' ("+data_store.get_db_info_str()+").");
         print('');
     else:
         print("No commit records written.");
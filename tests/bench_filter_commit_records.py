@@ -0,0 +1,101 @@
+#!/usr/bin/python
+
+
+import argparse; # Script arguments.
+import datetime; # Datetime handling.
+import os; # File, directory handling.
+import sys; # Module search path.
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))); # (So that scripts and modules import from repository root.)
+
+import analyzer; # Analyzer functionality.
+import modules.shared as shared; # Custom, shared functionality.
+import synthetic; # Synthetic commit records.
+
+
+# Filter commit records the way analyzer did before filtering got vectorized (row by row, via iloc), as reference for vectorized filter.
+def legacy_filter_commit_records(commit_records_df, since_timestamp_str, until_timestamp_str, labels):
+
+    since = shared.utc_timestamp_str_to_unix_timestamp(since_timestamp_str);
+    until = shared.utc_timestamp_str_to_unix_timestamp(until_timestamp_str);
+
+    drop_indices = list(); # Keep track of which DataFrame rows (by indices) are not necessary in df.
+    init_num_records = commit_records_df.shape[0];
+    for i in range(0, init_num_records): # For each project commit record (row) in data store DataFrame...
+        
+        commit_record = commit_records_df.iloc[i];
+        
+        author_unix_timestamp = float(commit_record['author_unix_timestamp']);
+        committer_unix_timestamp = float(commit_record['committer_unix_timestamp']);
+        if (    author_unix_timestamp < since 
+                or author_unix_timestamp > until
+                or committer_unix_timestamp < since
+                or committer_unix_timestamp > until   ):
+            drop_indices.append(i);
+        elif (labels):
+            commit_record_labels_tuple = commit_record['labels'];
+            include_commit_record = False;
+            for label in labels: # For EACH user-supplied label...
+                if (label in commit_record_labels_tuple): # If commit record has label... 
+                    include_commit_record = True; # Indicate to include this commit record in resulting DataFrame.
+            if (not include_commit_record):
+                drop_indices.append(i);
+    
+    commit_records_df = commit_records_df.drop(drop_indices); # Drop DataFrame rows (given indices specifed).
+    commit_records_df = commit_records_df.reset_index(drop=True); # Reset DataFrame row indices.
+
+    return commit_records_df;
+
+
+# Filter commit records via analyzer's (vectorized) filter.
+def vectorized_filter_commit_records(commit_records_df, since_timestamp_str, until_timestamp_str, labels):
+
+    analyzer.args = argparse.Namespace(since=since_timestamp_str, until=until_timestamp_str, labels=labels, all_labels=False);
+
+    return analyzer.filter_commit_records(commit_records_df);
+
+
+# Initialize script arguments object.
+def init_args(argparser):
+
+    argparser.add_argument('-n', '--num-records', help="number of synthetic commit records to filter", type=int, default=100000);
+    argparser.add_argument('--since', help="consider only commits applied after provided timestamp", type=str, default='2015-01-01T00:00:00Z');
+    argparser.add_argument('--until', help="consider only commits applied before provided timestamp", type=str, default='2016-12-31T00:00:00Z');
+    argparser.add_argument('--labels', help="list of labels to consider", type=str, default='a;c');
+
+    return argparser.parse_args();
+
+
+# Time filter on commit records.
+def time_filter(filter_function, df, args):
+
+    t1 = datetime.datetime.now();
+    filtered_df = filter_function(df, args.since, args.until, args.labels);
+    t2 = datetime.datetime.now();
+
+    return (filtered_df, (t2 - t1).total_seconds());
+
+
+# Driver.
+def main():
+
+    args = init_args(argparse.ArgumentParser());
+    args.labels = shared.get_unique_items_from_str(args.labels, ';');
+
+    df = synthetic.get_synthetic_data_store_df(args.num_records);
+
+    (legacy_df, legacy_seconds) = time_filter(legacy_filter_commit_records, df, args);
+    (vectorized_df, vectorized_seconds) = time_filter(vectorized_filter_commit_records, df, args);
+
+    if (not legacy_df.equals(vectorized_df)):
+        sys.exit("Filters disagree!");
+
+    print("Commit records: " + str(args.num_records) + " (" + str(legacy_df.shape[0]) + " kept)");
+    print("Legacy filter: " + str(legacy_seconds) + " s");
+    print("Vectorized filter: " + str(vectorized_seconds) + " s (" + str(int(legacy_seconds / max(vectorized_seconds, 1e-6))) + "x faster)");
+
+    return;
+
+
+if (__name__ == '__main__'):
+    main();
@@ -0,0 +1,75 @@
+#!/usr/bin/python
+
+
+import distutils.spawn; # Executable lookup.
+import os; # File, directory handling.
+import socket; # Free port lookup.
+import subprocess; # Throwaway MongoDB server.
+import sys; # Module search path.
+import time; # Waiting on server.
+
+import pymongo; # MongoDB handling.
+import pytest; # Fixtures, skipping.
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))); # (So that scripts and modules import from repository root.)
+
+
+# Seconds to wait on throwaway MongoDB server to accept connections.
+MONGOD_STARTUP_SECONDS = 30;
+
+
+# Get free local TCP port (for throwaway MongoDB server to listen on).
+def get_free_port():
+
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM);
+    s.bind(('127.0.0.1', 0));
+    port = s.getsockname()[1];
+    s.close();
+
+    return port;
+
+
+# Determine whether or not MongoDB server at URI accepts connections.
+def is_mongodb_up(uri):
+
+    try:
+        pymongo.MongoClient(uri, serverSelectionTimeoutMS=500).server_info();
+        return True;
+    except pymongo.errors.PyMongoError:
+        return False;
+
+
+# Get URI of MongoDB server that MongoDB tests run against, for the whole session:
+# the one that GITRHIG_TEST_MONGODB_URI points to (failing if it is unreachable), or else a throwaway mongod (if on PATH) on a free port, in a temporary directory.
+# MongoDB tests only get skipped if neither is available.
+@pytest.fixture(scope='session')
+def mongodb_uri(tmpdir_factory):
+
+    uri = os.environ.get('GITRHIG_TEST_MONGODB_URI');
+    if (uri):
+        if (not is_mongodb_up(uri)):
+            pytest.fail("No MongoDB server at \'" + uri + "\' (GITRHIG_TEST_MONGODB_URI).");
+        yield uri;
+        return;
+
+    mongod = distutils.spawn.find_executable('mongod');
+    if (mongod is None):
+        pytest.skip("No MongoDB server to test against (set GITRHIG_TEST_MONGODB_URI, or put mongod on PATH).");
+
+    port = get_free_port();
+    uri = 'mongodb://127.0.0.1:' + str(port);
+    log = open(str(tmpdir_factory.getbasetemp().join('mongod.log')), 'w');
+    process = subprocess.Popen([mongod, '--dbpath', str(tmpdir_factory.mktemp('mongodb')), '--bind_ip', '127.0.0.1', '--port', str(port)], stdout=log, stderr=subprocess.STDOUT);
+    try:
+        t1 = time.time();
+        while (not is_mongodb_up(uri)):
+            if (    (process.poll() is not None)
+                    or (time.time() - t1 > MONGOD_STARTUP_SECONDS)   ):
+                pytest.fail("Could not start mongod (see \'" + log.name + "\').");
+        yield uri;
+    finally:
+        if (process.poll() is None):
+            process.terminate();
+            process.wait();
+        log.close();
@@ -0,0 +1,57 @@
+#!/usr/bin/python
+
+
+import collections; # Ordered dictionary.
+import numpy; # Array handling.
+import os; # File, directory handling.
+import pandas; # DataFrame handling.
+import sys; # Module search path.
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__)))); # (So that benchmarks run as scripts, too.)
+
+import modules.shared as shared; # Custom, shared functionality.
+
+
+# Labels that synthetic commit records draw from.
+SYNTHETIC_LABELS = ['a', 'b', 'c', 'd'];
+
+# UNIX timestamp range that synthetic commits fall within (2014 through 2017).
+SYNTHETIC_UNIX_TIMESTAMP_RANGE = (1388534400, 1514764800);
+
+
+# Get synthetic data store DataFrame of commit records (of some projects, having some paths), reproducible per seed.
+def get_synthetic_data_store_df(num_records, num_projects=10, seed=0):
+
+    random_state = numpy.random.RandomState(seed);
+
+    project_indices = random_state.randint(0, num_projects, size=num_records);
+    committer_unix_timestamps = random_state.randint(SYNTHETIC_UNIX_TIMESTAMP_RANGE[0], SYNTHETIC_UNIX_TIMESTAMP_RANGE[1], size=num_records).astype('float64');
+    num_lines_inserted = random_state.randint(0, 100, size=num_records);
+    num_lines_deleted = random_state.randint(0, 50, size=num_records);
+    num_lines_modified = random_state.randint(0, 10, size=num_records);
+    labels_codes = random_state.randint(0, 2 ** len(SYNTHETIC_LABELS), size=num_records);
+    all_labels = [tuple([SYNTHETIC_LABELS[i] for i in range(0, len(SYNTHETIC_LABELS)) if (code & (1 << i))]) for code in range(0, 2 ** len(SYNTHETIC_LABELS))]; # (Every subset of labels.)
+
+    df = pandas.DataFrame(collections.OrderedDict([('repo_remote_hostname', 'github.com'),
+                                                   ('repo_owner', ['o' + str(i % 3) for i in project_indices]),
+                                                   ('repo_name', ['r' + str(i) for i in project_indices]),
+                                                   ('path_in_repo', [('src' if (i % 2) else '.') for i in range(0, num_records)]),
+                                                   ('labels', [all_labels[code] for code in labels_codes]),
+                                                   ('commit_hash', ['h' + str(i) for i in range(0, num_records)]),
+                                                   ('author_name', 'author'),
+                                                   ('author_email', 'author@example.com'),
+                                                   ('author_unix_timestamp', committer_unix_timestamps - random_state.randint(0, 10 ** 6, size=num_records)),
+                                                   ('committer_name', 'committer'),
+                                                   ('committer_email', 'committer@example.com'),
+                                                   ('committer_unix_timestamp', committer_unix_timestamps),
+                                                   ('subject', 'subject'),
+                                                   ('len_subject', 7),
+                                                   ('num_files_changed', 1),
+                                                   ('num_lines_changed', num_lines_inserted + num_lines_deleted + num_lines_modified),
+                                                   ('num_lines_inserted', num_lines_inserted),
+                                                   ('num_lines_deleted', num_lines_deleted),
+                                                   ('num_lines_modified', num_lines_modified)]));
+    for attribute in shared.data_store_attributes:
+        df[attribute] = df[attribute].astype(shared.DATA_STORE_ATTRIBUTE_DTYPES[attribute]);
+
+    return df;
@@ -0,0 +1,81 @@
+#!/usr/bin/python
+
+
+import argparse; # Script arguments.
+import dateutil.tz; # Time zone handling.
+import os; # File, directory handling.
+
+import analyzer; # Analyzer functionality.
+import synthetic; # Synthetic commit records.
+
+
+# Get cached results as analyzer would cache them, computed from synthetic commit records.
+def get_results_dict(tmpdir, monkeypatch):
+
+    monkeypatch.setattr(analyzer, 'CACHE_DIRNAME', str(tmpdir.join('cache')));
+    analyzer.args = argparse.Namespace(paths_as_projects=False,
+                                       since='1970-01-01T00:00:00Z',
+                                       until='2100-01-01T00:00:00Z',
+                                       labels=[],
+                                       all_labels=False,
+                                       timezone='America/New_York',
+                                       cube=False,
+                                       cache_size=1);
+    analyzer.timezone = dateutil.tz.gettz('America/New_York');
+
+    df = analyzer.eliminate_data_store_df_duplicate_rows(synthetic.get_synthetic_data_store_df(500, seed=13));
+    commit_records_df = analyzer.filter_commit_records(df);
+
+    return {'commit_records_plot_df': analyzer.get_commit_records_plot_df(commit_records_df),
+            'project_feature_vectors_df': analyzer.get_project_feature_vectors_df(analyzer.FEATURE_TITLES_DICT.keys(), commit_records_df)};
+
+
+# Check that cached results come back as they were cached (tuples, dtypes and indices included), with missing results staying missing.
+def test_cached_results_round_trip(tmpdir, monkeypatch):
+
+    results_dict = get_results_dict(tmpdir, monkeypatch);
+    dirname = os.path.join(analyzer.CACHE_DIRNAME, 'results');
+    assert (analyzer.read_cached_results_dict(dirname) is None);
+
+    analyzer.write_cached_results_dict(results_dict, dirname);
+    cached_results_dict = analyzer.read_cached_results_dict(dirname);
+
+    for name in analyzer.CACHED_RESULTS_NAMES:
+        (df, cached_df) = (results_dict[name], cached_results_dict[name]);
+        assert (list(cached_df.dtypes) == list(df.dtypes));
+        assert cached_df.index.equals(df.index);
+        assert (cached_df.values.tolist() == df.values.tolist());
+
+    analyzer.write_cached_results_dict(dict(results_dict, commit_records_plot_df=None), dirname+'_without_plots');
+    assert (analyzer.read_cached_results_dict(dirname+'_without_plots')['commit_records_plot_df'] is None);
+
+
+# Check that unreadable cached results get ignored with a warning (rather than loaded, or silently taken for missing ones).
+def test_unreadable_cached_results(tmpdir, monkeypatch, capsys):
+
+    results_dict = get_results_dict(tmpdir, monkeypatch);
+    dirname = os.path.join(analyzer.CACHE_DIRNAME, 'results');
+    analyzer.write_cached_results_dict(results_dict, dirname);
+
+    with open(os.path.join(dirname, 'project_feature_vectors_df.arrow'), 'wb') as f:
+        f.write('not arrow');
+    capsys.readouterr();
+
+    assert (analyzer.read_cached_results_dict(dirname) is None);
+    assert ("Could not read cached results" in capsys.readouterr().out);
+
+
+# Check that least recently used cached results get evicted once cache size bound is exceeded.
+def test_cached_results_eviction(tmpdir, monkeypatch):
+
+    results_dict = get_results_dict(tmpdir, monkeypatch);
+    dirnames = [os.path.join(analyzer.CACHE_DIRNAME, 'results'+str(i)) for i in range(0, 3)];
+    analyzer.write_cached_results_dict(results_dict, dirnames[0]);
+    os.utime(dirnames[0], (0, 0)); # (Least recently used.)
+    entry_size = sum([os.path.getsize(os.path.join(dirnames[0], filename)) for filename in os.listdir(dirnames[0])]);
+
+    analyzer.args.cache_size = (2.5 * entry_size) / (1024 * 1024); # (Room for two cached results.)
+    analyzer.write_cached_results_dict(results_dict, dirnames[1]);
+    analyzer.write_cached_results_dict(results_dict, dirnames[2]);
+
+    assert ([os.path.isdir(dirname) for dirname in dirnames] == [False, True, True]);
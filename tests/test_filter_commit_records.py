@@ -0,0 +1,25 @@
+#!/usr/bin/python
+
+
+import pytest; # Test parametrization.
+
+import bench_filter_commit_records as bench; # Legacy and vectorized filters.
+import synthetic; # Synthetic commit records.
+
+
+# Check that vectorized filter keeps the same rows (in the same order) as legacy one, for time ranges and labels.
+@pytest.mark.parametrize('since,until,labels', [('1970-01-01T00:00:00Z', '2100-01-01T00:00:00Z', []),
+                                                ('2015-01-01T00:00:00Z', '2016-12-31T00:00:00Z', []),
+                                                ('1970-01-01T00:00:00Z', '2100-01-01T00:00:00Z', ['b']),
+                                                ('2015-06-01T00:00:00Z', '2017-06-01T00:00:00Z', ['a', 'd']),
+                                                ('2015-06-01T00:00:00Z', '2017-06-01T00:00:00Z', ['x']),
+                                                ('2020-01-01T00:00:00Z', '2021-01-01T00:00:00Z', ['a'])])
+def test_vectorized_filter_matches_legacy_filter(since, until, labels):
+
+    df = synthetic.get_synthetic_data_store_df(3000, seed=1);
+    df = df.sample(frac=1.0, random_state=2).reset_index(drop=True); # (Shuffled, so that rows are not in timestamp order; legacy filter drops by index, so it must stay 0..n-1.)
+
+    legacy_df = bench.legacy_filter_commit_records(df, since, until, labels);
+    vectorized_df = bench.vectorized_filter_commit_records(df, since, until, labels);
+
+    assert legacy_df.equals(vectorized_df);
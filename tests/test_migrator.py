@@ -0,0 +1,55 @@
+#!/usr/bin/python
+
+
+import argparse; # Script arguments.
+import pandas; # DataFrame handling.
+
+import migrator; # Migrator functionality.
+import modules.shared as shared; # Custom, shared functionality.
+import synthetic; # Synthetic commit records.
+
+
+# Get SQLite data store (in fresh file) holding commit records.
+def get_sqlite_data_store(tmpdir, filename, df):
+
+    data_store = shared.get_data_store(shared.parse_data_store_source(str(tmpdir.join(filename))), create=True);
+    if (df is not None):
+        assert data_store.write_df(df);
+
+    return data_store;
+
+
+# Check that merging scraping shards yields each commit record once (sorted by key), with labels of shards unioned (in order of shards).
+def test_merge_records_unions_labels(tmpdir):
+
+    df = synthetic.get_synthetic_data_store_df(600, seed=9);
+
+    shard_dfs = [df.iloc[:400], df.iloc[200:].copy(), df.iloc[::5].copy()]; # (Overlapping shards.)
+    shard_dfs[1]['labels'] = [('x',)] * shard_dfs[1].shape[0];
+    shard_dfs[2]['labels'] = [('a', 'y')] * shard_dfs[2].shape[0];
+
+    migrator.args = argparse.Namespace(sources=['shard'+str(i)+'.db' for i in range(0, len(shard_dfs))],
+                                       output='merged.db',
+                                       anonymize=False,
+                                       batch_size=64); # (Small, so that duplicates straddle batches.)
+    migrator.source_data_stores = [get_sqlite_data_store(tmpdir, migrator.args.sources[i], shard_dfs[i]) for i in range(0, len(shard_dfs))];
+    migrator.output_data_store = get_sqlite_data_store(tmpdir, migrator.args.output, None);
+
+    assert (migrator.merge_records() == df.shape[0]);
+
+    expected_df = shared.merge_data_store_df_duplicate_keys(pandas.concat(shard_dfs, ignore_index=True));
+    expected_df = expected_df.sort_values(shared.COMMIT_RECORD_KEY_ATTRIBUTES, kind='mergesort');
+
+    assert (migrator.output_data_store.read_df().values.tolist() == expected_df.values.tolist());
+
+
+# Check that remembered anonymized strings stay within bound, forgetting least recently used ones first (and hashing alike either way).
+def test_memoized_anonymized_strs_bounded(monkeypatch):
+
+    monkeypatch.setattr(shared, 'ANONYMIZED_STRS_CACHE_SIZE', 3);
+    monkeypatch.setattr(shared, 'anonymized_strs_dict', shared.collections.OrderedDict());
+
+    for in_str in ['a', 'b', 'c', 'a', 'd']: # ('b' is least recently used once 'd' comes along.)
+        assert (shared.get_memoized_anonymized_str(in_str) == shared.get_anonymized_str(in_str));
+
+    assert (list(shared.anonymized_strs_dict.keys()) == ['c', 'a', 'd']);
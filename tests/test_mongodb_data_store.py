@@ -0,0 +1,103 @@
+#!/usr/bin/python
+
+
+import argparse; # Script arguments.
+import dateutil.tz; # Time zone handling.
+import pandas; # DataFrame handling.
+import pytest; # Fixtures, test parametrization, skipping.
+import uuid; # Unique collection names.
+
+import analyzer; # Analyzer functionality.
+import modules.shared as shared; # Custom, shared functionality.
+import synthetic; # Synthetic commit records.
+
+
+# Get MongoDB data store in a fresh collection (dropped afterwards), on server that MongoDB tests run against.
+@pytest.fixture
+def mongodb_data_store(mongodb_uri):
+
+    data_store_source_dict = shared.parse_data_store_source(mongodb_uri);
+    data_store = shared.get_data_store(dict(data_store_source_dict, database='gitrhig_test', collection='commits_'+uuid.uuid4().hex));
+    assert (data_store is not None);
+    yield data_store;
+    data_store.clear();
+
+
+# Get synthetic commit records, some of them stored twice.
+def get_commit_records_df():
+
+    df = synthetic.get_synthetic_data_store_df(2000, seed=3);
+
+    return pandas.concat([df, df.iloc[::7]], ignore_index=True);
+
+
+# Set analyzer arguments (and time zone) that feature vectors get computed with.
+def set_analyzer_args(paths_as_projects, since, until, labels, all_labels, timezone_name):
+
+    analyzer.args = argparse.Namespace(paths_as_projects=paths_as_projects,
+                                       since=since,
+                                       until=until,
+                                       labels=labels,
+                                       all_labels=all_labels,
+                                       timezone=timezone_name,
+                                       source='mongodb',
+                                       out_of_core=False,
+                                       pushdown=True,
+                                       cube=False,
+                                       stream=False);
+    analyzer.timezone = dateutil.tz.gettz(timezone_name);
+
+
+# Check that project feature vectors computed within MongoDB match those computed via pandas (over time zones and label filters on array field).
+@pytest.mark.parametrize('paths_as_projects,since,until,labels,all_labels,timezone_name', [(False, '1970-01-01T00:00:00Z', '2100-01-01T00:00:00Z', [], False, 'UTC'),
+                                                                                         (False, '1970-01-01T00:00:00Z', '2100-01-01T00:00:00Z', [], False, 'America/New_York'),
+                                                                                         (False, '2015-01-01T00:00:00Z', '2016-06-01T00:00:00Z', ['a', 'b'], False, 'Asia/Kolkata'),
+                                                                                         (False, '1970-01-01T00:00:00Z', '2100-01-01T00:00:00Z', ['a', 'b'], True, 'Australia/Adelaide'),
+                                                                                         (True, '1970-01-01T00:00:00Z', '2100-01-01T00:00:00Z', ['c'], False, 'America/New_York')])
+def test_pushed_down_feature_vectors_match_pandas(mongodb_data_store, paths_as_projects, since, until, labels, all_labels, timezone_name):
+
+    df = get_commit_records_df();
+    assert mongodb_data_store.write_df(df);
+
+    set_analyzer_args(paths_as_projects, since, until, labels, all_labels, timezone_name);
+    features = analyzer.FEATURE_TITLES_DICT.keys();
+
+    analyzer.data_store = mongodb_data_store;
+    pushed_down_df = analyzer.get_pushed_down_project_feature_vectors_df(features);
+
+    df = analyzer.eliminate_data_store_df_duplicate_rows(df[analyzer.get_needed_data_store_attributes(features)]);
+    expected_df = analyzer.get_project_feature_vectors_df(features, analyzer.filter_commit_records(df));
+
+    assert (not expected_df.empty);
+    assert (pushed_down_df.values.tolist() == expected_df.values.tolist());
+
+
+# Get batches of synthetic commit records to upsert, including commits stored under a second path and commit records stored again with other labels.
+def get_commit_records_batches():
+
+    df = synthetic.get_synthetic_data_store_df(1500, seed=4);
+
+    other_path_df = df.iloc[::5].copy();
+    other_path_df['path_in_repo'] = 'lib'; # (Same commits, within same repos, under another path.)
+
+    relabeled_df = df.iloc[::3].copy();
+    relabeled_df['labels'] = [('e',)] * relabeled_df.shape[0]; # (Same keys, so nothing new to fold into activity cube.)
+
+    df = pandas.concat([df, other_path_df, relabeled_df], ignore_index=True);
+
+    return [df.iloc[i:i+400] for i in range(0, df.shape[0], 400)];
+
+
+# Check that activity cube maintained across upserts matches one built anew from the same stored commit records.
+def test_upserted_activity_cube_matches_rebuilt_activity_cube(mongodb_data_store):
+
+    for df in get_commit_records_batches():
+        assert mongodb_data_store.upsert_df(df);
+    upserted_cube_df = mongodb_data_store.read_activity_cube_df();
+    assert (upserted_cube_df is not None);
+
+    mongodb_data_store.drop_activity_cube();
+    mongodb_data_store.create_activity_cube_if_dne();
+    rebuilt_cube_df = mongodb_data_store.read_activity_cube_df();
+
+    assert (upserted_cube_df.values.tolist() == rebuilt_cube_df.values.tolist());
@@ -0,0 +1,72 @@
+#!/usr/bin/python
+
+
+import json; # Sketch (dict) serialization.
+import numpy; # Array handling.
+import pytest; # Test parametrization.
+
+import analyzer; # Analyzer functionality.
+
+
+# Get observations (heavy-tailed, with ties, like total line counts) for seed.
+def get_observations(num_observations, seed):
+
+    random_state = numpy.random.RandomState(seed);
+
+    return numpy.floor(random_state.lognormal(mean=5.0, sigma=2.0, size=num_observations));
+
+
+# Get largest difference between numbers of observations up to (and including) each distinct observation as estimated by sketch and actual ones.
+def get_max_rank_error(sketch, observations):
+
+    (sketch_observations, cumulative_counts) = sketch.get_cumulative_counts();
+
+    queries = numpy.unique(observations);
+    indices = numpy.searchsorted(sketch_observations, queries, side='right') - 1; # (Greatest retained observation not exceeding query.)
+    estimated_counts = numpy.where(indices >= 0, cumulative_counts[numpy.maximum(indices, 0)], 0.0);
+    actual_counts = numpy.searchsorted(numpy.sort(observations), queries, side='right');
+
+    return numpy.abs(estimated_counts - actual_counts).max();
+
+
+# Check that sketch accounts for every observation, keeps extremes exact, and estimates ranks within its error bound (while retaining far fewer observations).
+@pytest.mark.parametrize('error,seed', [(0.05, 0), (0.01, 1), (0.01, 2)])
+def test_sketch_error_bound(error, seed):
+
+    observations = get_observations(50000, seed);
+
+    sketch = analyzer.QuantileSketch(error, seed=seed);
+    for i in range(0, len(observations), 1000): # (In batches, as chunks get folded in.)
+        sketch.add(observations[i:i+1000]);
+
+    (sketch_observations, cumulative_counts) = sketch.get_cumulative_counts();
+    assert (cumulative_counts[-1] == len(observations));
+    assert ((sketch_observations[0], sketch_observations[-1]) == (observations.min(), observations.max()));
+    assert (sum([len(compactor) for compactor in sketch.compactors]) < len(observations) / 10);
+    assert (get_max_rank_error(sketch, observations) <= error * len(observations));
+
+
+# Check that sketches of disjoint observations merge (also once written to and read back from JSON) into sketch of all of them, within the looser error bound.
+def test_sketch_merge():
+
+    observations_list = [get_observations(20000, seed) for seed in range(3, 6)];
+    errors = [0.01, 0.02, 0.01];
+
+    sketches = list();
+    for (i, observations) in enumerate(observations_list):
+        sketch = analyzer.QuantileSketch(errors[i], seed=i);
+        sketch.add(observations);
+        sketches.append(analyzer.get_quantile_sketch(json.loads(json.dumps(sketch.get_dict()))));
+
+    merged_sketch = sketches[0];
+    for sketch in sketches[1:]:
+        merged_sketch.merge(sketch);
+    merged_sketch.merge(analyzer.QuantileSketch(0.5)); # (Empty sketches leave it be.)
+
+    observations = numpy.concatenate(observations_list);
+    (sketch_observations, cumulative_counts) = merged_sketch.get_cumulative_counts();
+    assert (merged_sketch.error == max(errors));
+    assert (merged_sketch.num_observations == len(observations));
+    assert (cumulative_counts[-1] == len(observations));
+    assert ((sketch_observations[0], sketch_observations[-1]) == (observations.min(), observations.max()));
+    assert (get_max_rank_error(merged_sketch, observations) <= max(errors) * len(observations));
@@ -0,0 +1,111 @@
+#!/usr/bin/python
+
+
+import argparse; # Script arguments.
+import dateutil.tz; # Time zone handling.
+import os; # File handling.
+import pandas; # DataFrame handling.
+import pytest; # Test parametrization.
+
+import analyzer; # Analyzer functionality.
+import modules.shared as shared; # Custom, shared functionality.
+import synthetic; # Synthetic commit records.
+
+
+# Get chunks of synthetic commit records as a scraper would produce them, including commit records produced again (under other labels) in later chunks.
+def get_commit_records_chunks():
+
+    df = synthetic.get_synthetic_data_store_df(1200, seed=5);
+
+    relabeled_df = df.iloc[::4].copy();
+    relabeled_df['labels'] = [('x',)] * relabeled_df.shape[0];
+
+    relabeled_again_df = df.iloc[::6].copy();
+    relabeled_again_df['labels'] = [('a', 'z')] * relabeled_again_df.shape[0];
+
+    df = pandas.concat([df, relabeled_df, relabeled_again_df], ignore_index=True);
+
+    return [df.iloc[i:i+250] for i in range(0, df.shape[0], 250)];
+
+
+# Write commit records chunks to record stream file.
+def write_record_stream_file(filename, dfs):
+
+    stream = open(filename, 'w');
+    for df in dfs:
+        shared.write_record_stream_df(stream, df);
+    shared.close_record_stream(stream);
+
+    return;
+
+
+# Set analyzer arguments (and time zone) that feature vectors get computed with.
+def set_analyzer_args(stream, labels, all_labels):
+
+    analyzer.args = argparse.Namespace(paths_as_projects=False,
+                                       since='2015-01-01T00:00:00Z',
+                                       until='2100-01-01T00:00:00Z',
+                                       labels=labels,
+                                       all_labels=all_labels,
+                                       timezone='UTC',
+                                       source='sqlite',
+                                       out_of_core=False,
+                                       pushdown=False,
+                                       cube=False,
+                                       stream=stream,
+                                       chunk_size=100);
+    analyzer.timezone = dateutil.tz.gettz('UTC');
+
+
+# Get project feature vectors (as lists) sorted by project, with paths sorted, too.
+# (Projects and their paths appear in stream once commit records of theirs satisfy filters, which labels streamed later on may let them do.)
+def get_sorted_feature_vectors(project_feature_vectors_df):
+
+    df = project_feature_vectors_df.assign(paths_in_repo=[tuple(sorted(paths_in_repo)) for paths_in_repo in project_feature_vectors_df['paths_in_repo']]);
+
+    return sorted(df.values.tolist());
+
+
+# Check that commit records come out of record stream as they went in.
+def test_record_stream_round_trip(tmpdir):
+
+    dfs = get_commit_records_chunks();
+    filename = str(tmpdir.join('records.ndjson'));
+    write_record_stream_file(filename, dfs);
+
+    fd = os.open(filename, os.O_RDONLY);
+    streamed_dfs = [df for df in shared.read_record_stream_df_chunks(fd, 100) if (df is not None)];
+    os.close(fd);
+
+    df = pandas.concat(dfs, ignore_index=True);
+    streamed_df = pandas.concat(streamed_dfs, ignore_index=True);
+    assert (streamed_df.shape[0] == df.shape[0]);
+    assert streamed_df.equals(df[shared.data_store_attributes]);
+
+
+# Check that analyzing record stream yields the same project feature vectors as analyzing data store that the same commit records got upserted into (duplicates merged by key, with labels unioned).
+@pytest.mark.parametrize('labels,all_labels', [([], False),
+                                               (['a'], False),
+                                               (['x'], False),
+                                               (['a', 'z'], True)])
+def test_streamed_feature_vectors_match_data_store(tmpdir, labels, all_labels):
+
+    dfs = get_commit_records_chunks();
+
+    data_store = shared.get_data_store(shared.parse_data_store_source(str(tmpdir.join('records.db'))), create=True);
+    for df in dfs:
+        assert data_store.upsert_df(df);
+
+    filename = str(tmpdir.join('records.ndjson'));
+    write_record_stream_file(filename, dfs);
+
+    set_analyzer_args(filename, labels, all_labels);
+    features = analyzer.FEATURE_TITLES_DICT.keys();
+
+    streamed_df = analyzer.get_accumulated_project_feature_vectors_df(features, analyzer.get_streamed_project_accumulators_dict(features));
+
+    df = analyzer.eliminate_data_store_df_duplicate_rows(data_store.read_df(attributes=analyzer.get_needed_data_store_attributes(features)));
+    expected_df = analyzer.get_project_feature_vectors_df(features, analyzer.filter_commit_records(df));
+
+    assert (not expected_df.empty);
+    assert (get_sorted_feature_vectors(streamed_df) == get_sorted_feature_vectors(expected_df));
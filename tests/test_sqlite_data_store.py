@@ -0,0 +1,150 @@
+#!/usr/bin/python
+
+
+import argparse; # Script arguments.
+import dateutil.tz; # Time zone handling.
+import os; # Environment variables.
+import pandas; # DataFrame handling.
+import pytest; # Test parametrization.
+import time; # Process time zone.
+
+import analyzer; # Analyzer functionality.
+import modules.shared as shared; # Custom, shared functionality.
+import synthetic; # Synthetic commit records.
+
+
+# Get SQLite data store in fresh file.
+def get_sqlite_data_store(tmpdir):
+
+    return shared.get_data_store(shared.parse_data_store_source(str(tmpdir.join('records.db'))), create=True);
+
+
+# Check that upserted commit records sharing keys with stored ones get merged into them (keeping stored values, with labels unioned), and that the rest get inserted.
+def test_upsert_df_merges_duplicate_keys(tmpdir):
+
+    data_store = get_sqlite_data_store(tmpdir);
+
+    df = synthetic.get_synthetic_data_store_df(300, seed=6);
+    assert data_store.upsert_df(df);
+
+    relabeled_df = df.iloc[::3].copy();
+    relabeled_df['labels'] = [('x',)] * relabeled_df.shape[0];
+    relabeled_df['subject'] = 'other subject';
+
+    new_df = synthetic.get_synthetic_data_store_df(50, seed=7);
+    new_df['commit_hash'] = ['n' + str(i) for i in range(0, new_df.shape[0])];
+
+    assert data_store.upsert_df(pandas.concat([relabeled_df, relabeled_df, new_df], ignore_index=True));
+    assert (data_store.count() == df.shape[0] + new_df.shape[0]);
+
+    expected_df = df.copy();
+    expected_df['labels'] = [(labels + ('x',)) if (i % 3 == 0) else labels for (i, labels) in enumerate(df['labels'])];
+    expected_df = pandas.concat([expected_df, new_df], ignore_index=True);
+
+    assert (data_store.read_df().values.tolist() == expected_df.values.tolist());
+
+
+# Check that chunks of stored commit records add up to all of them (in order, or sorted by key, if need be), with filters applied alike.
+def test_read_df_chunks(tmpdir):
+
+    data_store = get_sqlite_data_store(tmpdir);
+
+    df = synthetic.get_synthetic_data_store_df(1000, seed=8);
+    assert data_store.write_df(df);
+
+    dfs = list(data_store.read_df_chunks(128));
+    assert all([chunk_df.shape[0] <= 128 for chunk_df in dfs]);
+    assert (pandas.concat(dfs, ignore_index=True).values.tolist() == data_store.read_df().values.tolist());
+
+    keys = [key for chunk_df in data_store.read_df_chunks(128, sort_by_key=True) for key in chunk_df[shared.COMMIT_RECORD_KEY_ATTRIBUTES].values.tolist()];
+    assert (len(keys) == df.shape[0]);
+    assert (keys == sorted(keys));
+
+    filters_dict = shared.get_filters_dict(since=shared.utc_timestamp_str_to_unix_timestamp('2016-01-01T00:00:00Z'), labels=['b', 'c']);
+    attributes = ['repo_name', 'labels', 'commit_hash', 'committer_unix_timestamp'];
+    filtered_dfs = list(data_store.read_df_chunks(64, filters_dict=filters_dict, attributes=attributes));
+    filtered_df = data_store.read_df(filters_dict=filters_dict, attributes=attributes);
+    assert (0 < filtered_df.shape[0] < df.shape[0]);
+    assert (list(filtered_df.columns) == attributes);
+    assert (pandas.concat(filtered_dfs, ignore_index=True).values.tolist() == filtered_df.values.tolist());
+
+
+# Check that project feature vectors computed within SQLite match those computed via pandas (over time zones, including ones with half-hour shifts), leaving process time zone be.
+@pytest.mark.parametrize('paths_as_projects,labels,timezone_name', [(False, [], 'UTC'),
+                                                                    (False, ['a', 'b'], 'America/New_York'),
+                                                                    (True, [], 'Asia/Kolkata'),
+                                                                    (False, ['c'], 'Australia/Lord_Howe')])
+def test_pushed_down_feature_vectors_match_pandas(tmpdir, paths_as_projects, labels, timezone_name):
+
+    data_store = get_sqlite_data_store(tmpdir);
+
+    df = synthetic.get_synthetic_data_store_df(2000, seed=10);
+    df = pandas.concat([df, df.iloc[::7]], ignore_index=True);
+    assert data_store.write_df(df);
+
+    analyzer.args = argparse.Namespace(paths_as_projects=paths_as_projects,
+                                       since='1970-01-01T00:00:00Z',
+                                       until='2100-01-01T00:00:00Z',
+                                       labels=labels,
+                                       all_labels=False,
+                                       timezone=timezone_name,
+                                       source='sqlite',
+                                       out_of_core=False,
+                                       pushdown=True,
+                                       cube=False,
+                                       stream=False);
+    analyzer.timezone = dateutil.tz.gettz(timezone_name);
+    analyzer.data_store = data_store;
+    features = analyzer.FEATURE_TITLES_DICT.keys();
+
+    (process_timezone_name, process_tzname) = (os.environ.get('TZ'), time.tzname);
+    pushed_down_df = analyzer.get_pushed_down_project_feature_vectors_df(features);
+    assert ((os.environ.get('TZ'), time.tzname) == (process_timezone_name, process_tzname));
+
+    df = analyzer.eliminate_data_store_df_duplicate_rows(df[analyzer.get_needed_data_store_attributes(features)]);
+    expected_df = analyzer.get_project_feature_vectors_df(features, analyzer.filter_commit_records(df));
+
+    assert (not expected_df.empty);
+    assert (pushed_down_df.values.tolist() == expected_df.values.tolist());
+
+
+# Check that SQLite library too old for activity cube still gets commit records upserted (without activity cube, warning once).
+def test_upsert_df_without_activity_cube_support(tmpdir, monkeypatch, capsys):
+
+    monkeypatch.setattr(shared.sqlite3, 'sqlite_version_info', (3, 24, 0));
+    monkeypatch.setattr(shared, 'sqlite_activity_cube_support', None); # (So that library version gets checked anew.)
+
+    data_store = get_sqlite_data_store(tmpdir);
+
+    df = synthetic.get_synthetic_data_store_df(300, seed=11);
+    assert data_store.upsert_df(df.iloc[:200]);
+    assert data_store.upsert_df(df.iloc[100:]);
+
+    assert (data_store.count() == df.shape[0]);
+    assert (data_store.read_df().values.tolist() == df.values.tolist());
+    assert (not data_store.has_activity_cube_table());
+    assert (data_store.read_activity_cube_df() is None);
+    assert (capsys.readouterr().out.count("predates 3.25.0, which activity cube needs") == 1);
+
+
+# Check that upsert failing within SQLite leaves stored commit records as they were (rolled back), warning with the error that caused it.
+def test_upsert_df_failure_rolls_back(tmpdir, monkeypatch, capsys):
+
+    data_store = get_sqlite_data_store(tmpdir);
+
+    df = synthetic.get_synthetic_data_store_df(300, seed=12);
+    assert data_store.upsert_df(df.iloc[:200]);
+    capsys.readouterr();
+
+    insert_rows = data_store.insert_rows;
+    def failing_insert_rows(rows): # (Fails once some rows got inserted.)
+        insert_rows(rows[:10]);
+        raise shared.sqlite3.OperationalError('disk I/O error');
+    monkeypatch.setattr(data_store, 'insert_rows', failing_insert_rows);
+
+    assert (not data_store.upsert_df(df.iloc[100:]));
+    assert ("OperationalError: disk I/O error" in capsys.readouterr().out);
+
+    monkeypatch.undo();
+    assert (data_store.count() == 200);
+    assert (data_store.read_df().values.tolist() == df.iloc[:200].values.tolist());